@@ -37,13 +37,8 @@ class DashboardManager:
     def get_room_data(self) -> List[Dict]:
         """방 데이터 가져오기"""
         try:
-            rooms = self.room_manager.get_active_rooms()
-            for room in rooms:
-                if room.get('settings_json'):
-                    room['settings'] = json.loads(room['settings_json'])
-                else:
-                    room['settings'] = {}
-            return rooms
+            # settings 는 RoomManager 캐시에서 이미 파싱된 dict 로 제공된다
+            return self.room_manager.get_active_rooms()
         except Exception as e:
             self.logger.error(f"방 데이터 조회 실패: {e}")
             return []
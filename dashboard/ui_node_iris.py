@@ -58,6 +58,7 @@ BROADCAST_DB = APP_BASE / "data" / "broadcast-queue.json"
 LOGS_DIR = APP_BASE / "data" / "logs"
 BOT_LOG = APP_BASE / "bot.log"
 BOT_LOG_NEW = APP_BASE / "bot_new.log"
+LOG_API = os.environ.get("LOG_API_URL", "http://127.0.0.1:8510")
 
 
 # -----------------------------
@@ -360,6 +361,25 @@ def calc_messages_per_sec(window_sec: int = 60) -> float:
     return round(count / max(window_sec, 1), 2)
 
 
+def fetch_bot_logs(limit: int = 200, level: str = "", contains: str = "") -> Optional[List[Dict[str, Any]]]:
+    """Python 봇 메모리 링 버퍼의 최근 로그 (log API 경유).
+
+    봇의 메트릭 서버(METRICS_PORT)가 꺼져 있거나 닿지 않으면 None.
+    """
+    params = {"limit": limit}
+    if level:
+        params["level"] = level
+    if contains:
+        params["contains"] = contains
+    try:
+        r = requests.get(f"{LOG_API}/bot/logs", params=params, timeout=1.5)
+        if r.ok:
+            return r.json()
+    except Exception:
+        pass
+    return None
+
+
 def count_errors_24h() -> int:
     total = 0
     for p in [BOT_LOG, BOT_LOG_NEW]:
@@ -537,6 +557,7 @@ def page_templates():
         import uuid
         name = f"template_{uuid.uuid4().hex[:6]}"
         (base / f"{name}.json").write_text(json.dumps({"title": name, "content": ""}, ensure_ascii=False, indent=2), encoding="utf-8")
+        (base / ".reload").touch()
         st.success(f"생성됨: {name}.json")
         st.rerun()
     items = [p for p in files if (query.lower() in p.stem.lower())]
@@ -583,6 +604,8 @@ def page_templates():
                 try:
                     json.loads(edited)
                     path.write_text(edited, encoding="utf-8")
+                    # 실행 중인 봇의 템플릿 레지스트리에 재로딩 신호
+                    (base / ".reload").touch()
                     st.success("저장되었습니다")
                 except Exception as e:
                     st.error(f"유효하지 않은 JSON: {e}")
@@ -620,6 +643,20 @@ def page_logs():
         if p.exists():
             content += f"\n==== {p.name} ====\n" + p.read_text(encoding="utf-8", errors="ignore")[-5000:]
     st.text(content or "봇 로그 없음")
+
+    st.caption("Python 봇 로그 (메모리 버퍼)")
+    colL, colK = st.columns([1, 3])
+    with colL:
+        bot_level = st.selectbox("최소 레벨", ["INFO", "WARNING", "ERROR", "DEBUG"], index=0)
+    with colK:
+        bot_kw = st.text_input("메시지 검색", value="")
+    records = fetch_bot_logs(limit=200, level=bot_level, contains=bot_kw.strip())
+    if records is None:
+        st.text("Python 봇 메트릭 서버에 연결할 수 없습니다 (METRICS_PORT 설정 필요)")
+    else:
+        st.text("\n".join(
+            f"{r.get('timestamp')} {r.get('level'):<8} {r.get('logger')} - {r.get('message')}" for r in records
+        ) or "로그 없음")
     # (no global rerun here; smooth/auto handled above)
 
 
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+명령어 지표 기록 오버헤드 측정 스크립트
+
+CommandRouter.dispatch 가 호출마다 더하는 일(카운터 증가, perf_counter 두 번,
+LatencyHistogram.record)을 핸들러 직접 호출과 비교해 호출당 차이를 출력한다.
+결과는 실행 환경(CPU, Python 버전)에 따라 달라진다.
+
+    python scripts/bench_command_metrics.py --iterations 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 상위 디렉터리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.services.command_metrics import CommandMetrics
+
+
+def _handler(context, args):
+    return "pong"
+
+
+def bare(iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        _handler(None, [])
+    return time.perf_counter() - started
+
+
+def instrumented(iterations: int) -> float:
+    stats = CommandMetrics().stats_for("ping")
+    perf_counter = time.perf_counter
+    started = perf_counter()
+    for _ in range(iterations):
+        # CommandRouter.dispatch 의 계측 부분과 같은 순서
+        stats.calls += 1
+        call_started = perf_counter()
+        try:
+            _handler(None, [])
+        finally:
+            stats.latency.record(perf_counter() - call_started)
+    return perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="명령어 지표 기록 오버헤드 측정")
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 후 최솟값 사용")
+    args = parser.parse_args()
+
+    base = min(bare(args.iterations) for _ in range(args.repeat))
+    measured = min(instrumented(args.iterations) for _ in range(args.repeat))
+    per_call_us = (measured - base) / args.iterations * 1_000_000
+    print(f"iterations={args.iterations} repeat={args.repeat}")
+    print(f"bare         {base / args.iterations * 1_000_000:.3f} µs/call")
+    print(f"instrumented {measured / args.iterations * 1_000_000:.3f} µs/call")
+    print(f"overhead     {per_call_us:.3f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
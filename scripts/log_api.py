@@ -2,13 +2,22 @@
 import json
 import os
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.error import URLError
 from urllib.parse import urlparse, parse_qs
+from urllib.request import urlopen
 from pathlib import Path
 from datetime import datetime, timezone
 
 ROOT = Path(__file__).resolve().parents[1]
 APP_BASE = ROOT / "node-iris-app"
 LOGS_DIR = APP_BASE / "data" / "logs"
+# Python 봇의 메트릭 서버 (--metrics-port / METRICS_PORT, 기본 비활성) - /bot/logs 는
+# 그 메모리 링 버퍼를 전달한다. 둘 다 없으면 /bot/* 는 503 을 돌려준다.
+_METRICS_PORT = os.environ.get("METRICS_PORT", "0")
+BOT_METRICS_URL = os.environ.get("BOT_METRICS_URL") or (
+    f"http://127.0.0.1:{_METRICS_PORT}" if _METRICS_PORT not in ("", "0") else ""
+)
+BOT_ROUTES = {'/bot/logs': '/logs', '/bot/logs/counts': '/logs/counts'}
 
 def parse_line(line: str):
     try:
@@ -111,8 +120,27 @@ class Handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
 
+    def _proxy_bot(self, route: str, query: str):
+        if not BOT_METRICS_URL:
+            self._set_headers(503)
+            self.wfile.write(b'{"error":"bot_metrics_disabled"}')
+            return
+        url = BOT_METRICS_URL.rstrip('/') + route + (f'?{query}' if query else '')
+        try:
+            with urlopen(url, timeout=2) as resp:
+                body = resp.read()
+            self._set_headers(200)
+            self.wfile.write(body)
+        except (URLError, OSError) as e:
+            self._set_headers(502)
+            self.wfile.write(json.dumps({"error": "bot_unreachable", "detail": str(e)}, ensure_ascii=False).encode('utf-8'))
+
     def do_GET(self):
         parsed = urlparse(self.path)
+        bot_route = BOT_ROUTES.get(parsed.path.rstrip('/'))
+        if bot_route:
+            self._proxy_bot(bot_route, parsed.query)
+            return
         if parsed.path not in ('/logs', '/logs/'): 
             self._set_headers(404)
             self.wfile.write(b'{"error":"not_found"}')
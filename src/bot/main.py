@@ -5,21 +5,37 @@ import asyncio
 import contextlib
 import json
 import logging
+import math
 import os
 import signal
+import socket
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
 from iris import Bot, ChatContext
 
-from src.services.broadcast_scheduler import BroadcastScheduler, BroadcastTask
-from src.services.command_router import CommandRouter
+from src.services.automation.nickname_watcher import NicknameWatcher, NicknameWatcherConfig
+from src.services.broadcast_dispatcher import BroadcastDispatcher
+from src.services.broadcast_scheduler import BroadcastScheduler
+from src.services.command_router import CommandNotice, CommandRouter
 from src.services.message_store import MessageStore
+from src.services.outbound_dispatcher import OutboundDispatcher
+from src.services.rate_limiter import RateLimit
 from src.services.room_manager import RoomManager
 from src.services.welcome_handler import WelcomeHandler
-from src.utils.logger import ServiceLogger, get_service_logger, log_execution_time, setup_global_logging
+from src.utils.logger import (
+    ServiceLogger,
+    get_ring_buffer,
+    get_service_logger,
+    log_execution_time,
+    log_policy,
+    setup_global_logging,
+    timings,
+)
+from src.utils.metrics import MetricsServer
+from src.utils.profiler import MAX_PROFILE_SECONDS, EventLoopLagMonitor, SamplingProfiler
 
 
 class IRISConnectionManager:
@@ -79,6 +95,16 @@ class BotContext:
     logger: ServiceLogger
     broadcast_interval: float
     broadcast_max_attempts: int
+    broadcast_lease_seconds: float = 60.0
+    broadcast_concurrency: int = 8
+    broadcast_room_interval: float = 1.0
+    broadcast_retention_days: float = 30.0
+    outbound: OutboundDispatcher = field(default_factory=OutboundDispatcher)
+    profiler: SamplingProfiler = field(default_factory=lambda: SamplingProfiler(Path("logs/profiles")))
+    profile_seconds: float = 30.0
+    loop_monitor: EventLoopLagMonitor = field(default_factory=EventLoopLagMonitor)
+    nickname_watcher: Optional[NicknameWatcher] = None
+    broadcast_worker_id: str = field(default_factory=lambda: f"{socket.gethostname()}:{os.getpid()}")
 
 
 def register_default_commands(ctx: BotContext) -> None:
@@ -106,9 +132,35 @@ def register_default_commands(ctx: BotContext) -> None:
             preview.append(f"...외 {len(rooms) - 10}개")
         return "\n".join(preview)
 
+    def stats(_: ChatContext, __: list[str]) -> str:
+        return ctx.command_router.metrics.render_summary()
+
+    def profile(_: ChatContext, args: list[str]) -> str:
+        usage = f"사용법: !profile [초] (0 초과 {MAX_PROFILE_SECONDS:g} 이하, 기본 {ctx.profile_seconds:g})"
+        try:
+            seconds = float(args[0]) if args else ctx.profile_seconds
+        except ValueError:
+            return usage
+        if not math.isfinite(seconds) or seconds <= 0:
+            return usage
+        seconds = min(seconds, MAX_PROFILE_SECONDS)
+        path = ctx.profiler.start(seconds)
+        if path is None:
+            return "이미 프로파일링 중입니다."
+        return f"{seconds:g}초 동안 프로파일링합니다: {path}"
+
     ctx.command_router.register("ping", ping, description="봇 상태 확인")
-    ctx.command_router.register("help", help_command, description="명령어 목록")
-    ctx.command_router.register("rooms", rooms, description="등록된 방 목록 조회", roles=None, throttle=5.0)
+    ctx.command_router.register("help", help_command, description="명령어 목록", cache_ttl=60.0)
+    ctx.command_router.register(
+        "rooms",
+        rooms,
+        description="등록된 방 목록 조회",
+        roles=None,
+        throttle=5.0,
+        cache_ttl=5.0,
+    )
+    ctx.command_router.register("stats", stats, description="명령어 실행 통계", roles=["admin"])
+    ctx.command_router.register("profile", profile, description="샘플링 프로파일 기록 (초)", roles=["admin"], throttle=10.0)
 
 
 def configure_bot_handlers(bot: Bot, ctx: BotContext) -> None:
@@ -123,30 +175,43 @@ def configure_bot_handlers(bot: Bot, ctx: BotContext) -> None:
             "attachment": getattr(chat.message, "attachment", {}),
         }
         ctx.message_store.record(chat, payload)
-        ctx.room_manager.auto_register_room(int(chat.room.id), getattr(chat.room, "name", "unknown"))
+        room_id = int(chat.room.id)
+        ctx.room_manager.auto_register_room(room_id, getattr(chat.room, "name", "unknown"))
+        if ctx.room_manager.settings.feature(room_id, "commands_enabled", True) is False:
+            return
 
         user_roles: Optional[Iterable[str]] = getattr(chat.sender, "roles", None)
-        result = ctx.command_router.dispatch(text, context=chat, user_roles=user_roles)
-        if result is None:
-            return
-        if isinstance(result, (dict, list)):
-            reply_text = json.dumps(result, ensure_ascii=False, indent=2)
-        else:
-            reply_text = str(result)
-        chat.reply(reply_text)
+        ctx.command_router.submit(
+            text,
+            context=chat,
+            user_roles=user_roles,
+            reply=lambda result: ctx.outbound.submit(
+                str(chat.room.id),
+                _format_reply(result),
+                chat.reply,
+                priority="command",
+                # 자리표시 안내는 결과와 한 메시지로 묶이지 않게 따로 보낸다.
+                coalesce=not isinstance(result, CommandNotice),
+            ),
+        )
 
     @bot.on_event("new_member")
     def on_new_member(chat: ChatContext) -> None:
         ctx.room_manager.auto_register_room(int(chat.room.id), getattr(chat.room, "name", "unknown"))
-        payload = ctx.welcome_handler.prepare_welcome_payload(chat)
+        payload = ctx.welcome_handler.handle_join(
+            chat,
+            send=lambda text: ctx.outbound.submit(str(chat.room.id), text, chat.reply, priority="welcome"),
+        )
         ctx.message_store.record(chat, {"type": "join", **payload})
-        if payload.get("auto_reply"):
-            chat.reply(payload["auto_reply"])
+        if ctx.nickname_watcher is not None:
+            # 입장 직후에는 닉네임 변경이 잦으므로 다음 조회를 앞당긴다.
+            ctx.nickname_watcher.poke()
         ctx.logger.log_event(
             "member_joined",
             room_id=str(chat.room.id),
             user_id=str(chat.sender.id),
-            auto_reply_sent=bool(payload.get("auto_reply")),
+            auto_reply_sent=payload.get("welcome") == "sent",
+            welcome=payload.get("welcome"),
         )
 
     @bot.on_event("del_member")
@@ -168,68 +233,92 @@ def configure_bot_handlers(bot: Bot, ctx: BotContext) -> None:
         )
 
 
+def _format_reply(result: Any) -> str:
+    if isinstance(result, (dict, list)):
+        return json.dumps(result, ensure_ascii=False, indent=2)
+    return str(result)
+
+
 async def broadcast_worker(bot: Bot, ctx: BotContext) -> None:
-    """브로드캐스트 큐를 polling 하여 메시지를 전송한다."""
+    """브로드캐스트 큐를 비우고, 비어 있으면 enqueue 신호(또는 fallback 주기)까지 대기한다."""
     send_func = _resolve_send_function(bot)
-    while True:
-        try:
-            tasks = ctx.broadcast_scheduler.fetch_pending()
-            if not tasks:
-                await asyncio.sleep(ctx.broadcast_interval)
-                continue
-            if send_func is None:
-                ctx.logger.warning("IRIS 전송 함수가 없어 방송을 처리할 수 없습니다.")
+    dispatcher = (
+        BroadcastDispatcher(
+            ctx.broadcast_scheduler,
+            send_func,
+            worker_id=ctx.broadcast_worker_id,
+            concurrency=ctx.broadcast_concurrency,
+            room_interval=ctx.broadcast_room_interval,
+            lease_seconds=ctx.broadcast_lease_seconds,
+            max_attempts=ctx.broadcast_max_attempts,
+            logger=ctx.logger,
+            outbound=ctx.outbound,
+        )
+        if send_func is not None
+        else None
+    )
+    try:
+        while True:
+            try:
+                # 한 번에 하나만 점유한다. 여러 개를 잡으면 뒤에 기다리는 작업의 점유가
+                # 갱신되지 않아 만료되고, 다른 워커가 다시 잡아 중복 전송된다.
+                tasks = ctx.broadcast_scheduler.claim(
+                    ctx.broadcast_worker_id,
+                    limit=1,
+                    lease_seconds=ctx.broadcast_lease_seconds,
+                    max_attempts=ctx.broadcast_max_attempts,
+                )
+                if not tasks:
+                    # 다음 예약 시각까지만 대기하고, 그 사이 enqueue 신호가 오면 즉시 깬다.
+                    due_in = ctx.broadcast_scheduler.seconds_until_next_due()
+                    timeout = ctx.broadcast_interval if due_in is None else min(ctx.broadcast_interval, due_in)
+                    await ctx.broadcast_scheduler.wait_for_work(max(0.05, timeout))
+                    continue
+                if dispatcher is None:
+                    ctx.logger.warning("IRIS 전송 함수가 없어 방송을 처리할 수 없습니다.")
+                    for task in tasks:
+                        ctx.broadcast_scheduler.mark_retry(
+                            task.id,
+                            "NO_SEND_FUNCTION",
+                            ctx.broadcast_max_attempts,
+                            worker_id=ctx.broadcast_worker_id,
+                        )
+                    await asyncio.sleep(ctx.broadcast_interval)
+                    continue
                 for task in tasks:
-                    ctx.broadcast_scheduler.mark_retry(task.id, "NO_SEND_FUNCTION", ctx.broadcast_max_attempts)
+                    await dispatcher.dispatch(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pylint: disable=broad-except
+                ctx.logger.log_error_with_context(
+                    error=exc,
+                    context={"stage": "broadcast_worker", "note": "retry-after-error"},
+                )
                 await asyncio.sleep(ctx.broadcast_interval)
-                continue
-            for task in tasks:
-                await _dispatch_broadcast_task(send_func, task, ctx)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:  # pylint: disable=broad-except
-            ctx.logger.log_error_with_context(
-                error=exc,
-                context={"stage": "broadcast_worker", "note": "retry-after-error"},
-            )
-            await asyncio.sleep(ctx.broadcast_interval)
+    finally:
+        if dispatcher is not None:
+            dispatcher.close()
 
 
-async def _dispatch_broadcast_task(
-    send_func: Any,
-    task: BroadcastTask,
-    ctx: BotContext,
-) -> None:
-    """SQLite 큐 작업을 하나씩 전송하고 결과를 기록한다."""
-    success_channels: list[str] = []
-    for channel in task.channels:
+async def broadcast_retention_worker(ctx: BotContext, interval: float = 3600.0) -> None:
+    """보관 기간이 지난 DONE/FAILED 방송을 주기적으로 archive 테이블로 옮긴다."""
+    if ctx.broadcast_retention_days <= 0:
+        return
+    while True:
         try:
-            result = send_func(channel, task.payload)
-            success_channels.append(channel)
-            ctx.logger.log_event(
-                "broadcast_sent",
-                room_id=channel,
-                task_id=str(task.id),
-                payload=json.dumps(task.payload, ensure_ascii=False)[:200],
-                result=str(result)[:120] if result is not None else "ok",
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                ctx.broadcast_scheduler.archive_completed,
+                ctx.broadcast_retention_days,
             )
+        except asyncio.CancelledError:
+            raise
         except Exception as exc:  # pylint: disable=broad-except
-            ctx.broadcast_scheduler.mark_retry(task.id, repr(exc), ctx.broadcast_max_attempts)
             ctx.logger.log_error_with_context(
                 error=exc,
-                context={
-                    "task_id": task.id,
-                    "room_id": channel,
-                    "operation": "broadcast_send",
-                },
+                context={"stage": "broadcast_retention"},
             )
-            return
-    ctx.broadcast_scheduler.mark_success(task.id)
-    ctx.logger.info(
-        "브로드캐스트 완료",
-        task_id=task.id,
-        success_channels=",".join(success_channels),
-    )
+        await asyncio.sleep(interval)
 
 
 def _resolve_send_function(bot: Bot) -> Optional[Any]:
@@ -247,15 +336,30 @@ def create_context(
     broadcast_db: Path,
     broadcast_interval: float,
     broadcast_max_attempts: int,
+    broadcast_concurrency: int = 8,
+    broadcast_room_interval: float = 1.0,
+    broadcast_retention_days: float = 30.0,
+    outbound_global_limit: Optional[RateLimit] = None,
+    outbound_room_limit: Optional[RateLimit] = None,
+    welcome_coalesce_window: float = 10.0,
+    profile_seconds: float = 30.0,
+    loop_lag_warn: float = 0.25,
 ) -> BotContext:
     message_store = MessageStore(log_dir)
-    welcome_handler = WelcomeHandler(template_dir=Path("config/templates/welcome"))
     room_manager = RoomManager()
+    welcome_handler = WelcomeHandler(
+        template_dir=Path("config/templates/welcome"),
+        settings_provider=room_manager.get_room_settings,
+        coalesce_window=welcome_coalesce_window,
+    )
+    welcome_handler.templates.start()
     imported = room_manager.import_rooms_from_config("config/rooms.json")
+    room_manager.start()
 
     command_router = CommandRouter(prefix=command_prefix)
     broadcast_scheduler = BroadcastScheduler(broadcast_db)
     logger = get_service_logger("iris_bot")
+    outbound = OutboundDispatcher(global_limit=outbound_global_limit, room_limit=outbound_room_limit)
 
     ctx = BotContext(
         message_store=message_store,
@@ -266,12 +370,82 @@ def create_context(
         logger=logger,
         broadcast_interval=broadcast_interval,
         broadcast_max_attempts=int(broadcast_max_attempts),
+        broadcast_concurrency=max(1, int(broadcast_concurrency)),
+        broadcast_room_interval=max(0.0, broadcast_room_interval),
+        broadcast_retention_days=max(0.0, broadcast_retention_days),
+        outbound=outbound,
+        profiler=SamplingProfiler(log_dir / "profiles"),
+        profile_seconds=profile_seconds,
+        loop_monitor=EventLoopLagMonitor(warn_threshold=loop_lag_warn),
     )
     register_default_commands(ctx)
     logger.info("방 설정 로드 완료", imported_rooms=imported)
     return ctx
 
 
+def _query_param(params: dict, name: str, default: Any = None) -> Any:
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def recent_logs(params: dict) -> Any:
+    """``/logs`` - 메모리 링 버퍼의 최근 로그 (level/logger/contains/since/limit 필터)"""
+    ring = get_ring_buffer()
+    if ring is None:
+        return []
+    since = _query_param(params, "since")
+    return ring.query(
+        level=_query_param(params, "level"),
+        logger=_query_param(params, "logger"),
+        contains=_query_param(params, "contains"),
+        since=float(since) if since else None,
+        limit=min(int(_query_param(params, "limit", 100)), 1000),
+    )
+
+
+def log_counts(params: dict) -> Any:
+    """``/logs/counts`` - 레벨별 로그 건수 (``window`` 초, 기본 24시간)"""
+    ring = get_ring_buffer()
+    if ring is None:
+        return {}
+    window = float(_query_param(params, "window", 86400))
+    return {"window": window, "counts": ring.counts(window), "buffer": ring.stats()}
+
+
+def build_nickname_watcher(iris_url: str, ctx: BotContext, rooms: str = "", interval: float = 3.0) -> NicknameWatcher:
+    """IRIS HTTP API 로 닉네임 변경을 감시하는 watcher (봇 이벤트 루프에서 실행)"""
+    base_url = iris_url if "://" in iris_url else f"http://{iris_url}"
+    config = NicknameWatcherConfig(
+        base_url=base_url,
+        rooms=[room.strip() for room in rooms.split(",") if room.strip()] or None,
+        interval=interval,
+        api_token=os.getenv("IRIS_TOKEN") or None,
+    )
+    return NicknameWatcher(config, outbound=ctx.outbound)
+
+
+def start_metrics_server(ctx: BotContext, port: int) -> MetricsServer:
+    """명령어 지표(``/metrics``)와 최근 로그(``/logs``)를 노출하는 HTTP 서버를 시작한다."""
+    server = MetricsServer(
+        {
+            "/metrics": lambda _: (
+                ctx.command_router.metrics_text() + ctx.outbound.render_text() + ctx.loop_monitor.render_text()
+            ),
+            "/metrics/commands": lambda _: ctx.command_router.metrics.snapshot(),
+            "/metrics/outbound": lambda _: ctx.outbound.snapshot(),
+            "/metrics/timings": lambda _: timings.snapshot(),
+            "/metrics/loop": lambda _: ctx.loop_monitor.snapshot(),
+            "/logs": recent_logs,
+            "/logs/counts": log_counts,
+        },
+        host=os.getenv("METRICS_HOST", "127.0.0.1"),
+        port=port,
+    )
+    bound_port = server.start()
+    ctx.logger.info("메트릭 서버 시작", port=bound_port)
+    return server
+
+
 def run_dry_run(ctx: BotContext, iris_url: str) -> None:
     bot = Bot(iris_url)
     configure_bot_handlers(bot, ctx)
@@ -282,6 +456,7 @@ def run_dry_run(ctx: BotContext, iris_url: str) -> None:
     )
     for handler in bot.handlers.get("message", []):
         handler(dummy_chat)
+    ctx.room_manager.stop()
     ctx.logger.info("Dry-run 완료")
 
 
@@ -293,6 +468,7 @@ async def run_bot_with_connection_manager(iris_url: str, ctx: BotContext) -> Non
 
     loop = asyncio.get_running_loop()
     stop_event = asyncio.Event()
+    ctx.command_router.attach_loop(loop)
 
     def _signal_handler(sig: int, __: Any) -> None:
         ctx.logger.info("종료 신호 수신", signal=sig)
@@ -301,6 +477,14 @@ async def run_bot_with_connection_manager(iris_url: str, ctx: BotContext) -> Non
 
     signal.signal(signal.SIGINT, _signal_handler)
     signal.signal(signal.SIGTERM, _signal_handler)
+    if hasattr(signal, "SIGUSR1"):
+        # kill -USR1 <pid> 로 프로파일링 (시그널 핸들러 안에서는 예약만 한다)
+        signal.signal(
+            signal.SIGUSR1,
+            lambda *_: loop.call_soon_threadsafe(ctx.profiler.start, ctx.profile_seconds),
+        )
+    ctx.loop_monitor.start()
+    watcher_task = asyncio.create_task(ctx.nickname_watcher.run_async()) if ctx.nickname_watcher else None
 
     ctx.logger.info("IRIS 봇 실행 시작", iris_url=iris_url)
 
@@ -316,6 +500,7 @@ async def run_bot_with_connection_manager(iris_url: str, ctx: BotContext) -> Non
 
         configure_bot_handlers(bot, ctx)
         worker_task = asyncio.create_task(broadcast_worker(bot, ctx))
+        retention_task = asyncio.create_task(broadcast_retention_worker(ctx))
 
         try:
             await loop.run_in_executor(None, bot.run)
@@ -325,14 +510,24 @@ async def run_bot_with_connection_manager(iris_url: str, ctx: BotContext) -> Non
                 context={"stage": "bot.run"},
             )
         finally:
-            worker_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await worker_task
+            for task in (worker_task, retention_task):
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
 
         if stop_event.is_set():
             break
         await asyncio.sleep(base_delay)
 
+    if watcher_task is not None:
+        ctx.nickname_watcher.stop()
+        await watcher_task
+    await ctx.loop_monitor.stop()
+    ctx.command_router.shutdown()
+    ctx.welcome_handler.flush()
+    ctx.welcome_handler.templates.stop()
+    ctx.room_manager.stop()
+    ctx.outbound.shutdown()
     ctx.logger.info("IRIS 봇 실행 종료")
 
 
@@ -342,10 +537,26 @@ def build_argument_parser() -> argparse.ArgumentParser:
     parser.add_argument("--dry-run", action="store_true", help="IRIS 연결 없이 로컬 핸들러만 실행")
     parser.add_argument("--log-dir", default=os.getenv("IRIS_LOG_DIR", "logs"), help="로그 저장 경로")
     parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO"), help="전역 로그 레벨")
+    parser.add_argument("--async-logging", action="store_true", default=os.getenv("LOG_ASYNC", "").lower() in ("1", "true", "yes"), help="큐 기반 비동기 로깅 사용 (포맷팅/디스크 쓰기를 별도 스레드에서 처리)")
+    parser.add_argument("--no-log-location", action="store_true", default=os.getenv("LOG_INCLUDE_LOCATION", "1") == "0", help="JSON 로그에서 module/function/line 필드와 호출 위치 탐색 생략")
+    parser.add_argument("--timing-summary-interval", type=float, default=float(os.getenv("LOG_TIMING_INTERVAL", "60")), help="연산별 실행 시간 요약 로그 주기(초, 0이면 비활성)")
+    parser.add_argument("--profile-seconds", type=float, default=float(os.getenv("PROFILE_SECONDS", "30")), help="SIGUSR1 / !profile 로 시작하는 샘플링 프로파일 길이(초)")
+    parser.add_argument("--loop-lag-warn", type=float, default=float(os.getenv("LOOP_LAG_WARN", "0.25")), help="이벤트 루프 지연 경고 기준(초)")
+    parser.add_argument("--nickname-watch", action="store_true", default=os.getenv("NICKWATCH_ENABLED", "").lower() in ("1", "true", "yes"), help="닉네임 변경 감시를 봇 이벤트 루프에서 실행")
+    parser.add_argument("--nickname-watch-rooms", default=os.getenv("NICKWATCH_ROOMS", ""), help="닉네임 감시 대상 방 ID (콤마, 비우면 전체)")
+    parser.add_argument("--nickname-watch-interval", type=float, default=float(os.getenv("NICKWATCH_INTERVAL", "3.0")), help="닉네임 감시 기본 폴링 주기(초, 변화가 없으면 늘어난다)")
+    parser.add_argument("--runtime-config", default=os.getenv("IRIS_RUNTIME_CONFIG", "config/runtime.json"), help="런타임 설정 파일 (logging 섹션은 재시작 없이 반영)")
     parser.add_argument("--command-prefix", default=os.getenv("COMMAND_PREFIX", "!"), help="명령어 접두사")
     parser.add_argument("--broadcast-db", default=os.getenv("BROADCAST_DB", "data/broadcast_queue.sqlite"), help="브로드캐스트 큐 SQLite 경로")
-    parser.add_argument("--broadcast-interval", type=float, default=float(os.getenv("BROADCAST_INTERVAL", "1.0")), help="브로드캐스트 폴링 주기(초)")
+    parser.add_argument("--broadcast-interval", type=float, default=float(os.getenv("BROADCAST_INTERVAL", "1.0")), help="enqueue 신호가 없을 때의 브로드캐스트 fallback 폴링 주기(초)")
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "0")), help="/metrics HTTP 포트 (0이면 비활성)")
     parser.add_argument("--broadcast-max-attempts", type=int, default=int(os.getenv("BROADCAST_MAX_ATTEMPTS", "3")), help="브로드캐스트 재시도 최대 횟수")
+    parser.add_argument("--broadcast-concurrency", type=int, default=int(os.getenv("BROADCAST_CONCURRENCY", "8")), help="브로드캐스트 동시 전송 수")
+    parser.add_argument("--broadcast-room-interval", type=float, default=float(os.getenv("BROADCAST_ROOM_INTERVAL", "1.0")), help="같은 방으로의 최소 전송 간격(초)")
+    parser.add_argument("--outbound-global-limit", default=os.getenv("OUTBOUND_GLOBAL_LIMIT", "20/10"), help="전체 발신 한도 (건수/초, 예: 20/10)")
+    parser.add_argument("--outbound-room-limit", default=os.getenv("OUTBOUND_ROOM_LIMIT", "5/5"), help="방별 발신 한도 (건수/초, 예: 5/5)")
+    parser.add_argument("--welcome-coalesce-window", type=float, default=float(os.getenv("WELCOME_COALESCE_WINDOW", "10")), help="입장 환영 메시지를 묶는 기본 창(초, 방 설정 welcome_coalesce_seconds 가 우선, 0이면 즉시 전송)")
+    parser.add_argument("--broadcast-retention-days", type=float, default=float(os.getenv("BROADCAST_RETENTION_DAYS", "30")), help="완료/실패 방송을 archive 로 옮기기까지의 보관 일수 (0이면 비활성)")
     return parser
 
 
@@ -357,13 +568,27 @@ def main() -> None:
         raise SystemExit("IRIS URL을 지정하거나 --dry-run 옵션을 사용하세요.")
 
     log_dir = Path(args.log_dir)
-    setup_global_logging(args.log_level, str(log_dir))
+    setup_global_logging(
+        args.log_level,
+        str(log_dir),
+        async_mode=args.async_logging,
+        include_location=not args.no_log_location,
+    )
+    log_policy.watch(Path(args.runtime_config))
     ctx = create_context(
         log_dir=log_dir,
         command_prefix=args.command_prefix,
         broadcast_db=Path(args.broadcast_db),
         broadcast_interval=max(0.5, args.broadcast_interval),
         broadcast_max_attempts=max(1, args.broadcast_max_attempts),
+        broadcast_concurrency=args.broadcast_concurrency,
+        broadcast_room_interval=args.broadcast_room_interval,
+        broadcast_retention_days=args.broadcast_retention_days,
+        outbound_global_limit=RateLimit.parse(args.outbound_global_limit, scope="global"),
+        outbound_room_limit=RateLimit.parse(args.outbound_room_limit, scope="room"),
+        welcome_coalesce_window=max(0.0, args.welcome_coalesce_window),
+        profile_seconds=args.profile_seconds,
+        loop_lag_warn=args.loop_lag_warn,
     )
 
     if args.dry_run:
@@ -371,6 +596,13 @@ def main() -> None:
         run_dry_run(ctx, iris_url)
         return
 
+    if args.nickname_watch:
+        ctx.nickname_watcher = build_nickname_watcher(
+            args.iris_url, ctx, args.nickname_watch_rooms, args.nickname_watch_interval
+        )
+    metrics_server = start_metrics_server(ctx, args.metrics_port) if args.metrics_port > 0 else None
+    timings.start(args.timing_summary_interval, get_service_logger("timing"))
+
     try:
         asyncio.run(run_bot_with_connection_manager(args.iris_url, ctx))
     except KeyboardInterrupt:
@@ -381,6 +613,10 @@ def main() -> None:
             context={"stage": "main"},
         )
         sys.exit(1)
+    finally:
+        timings.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,22 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
+import os
+import random
+import re
+import threading
 import time
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
 
+from src.services.outbound_dispatcher import OutboundDispatcher
 from src.utils.logger import get_service_logger, ServiceLogger
 
 
@@ -16,6 +25,87 @@ _DEFAULT_QUERY = {
     "bind": []
 }
 
+_STATE_VERSION = 2
+
+# 변경 로그와 스냅샷 파일의 형식: room_id -> {user_id: nickname}
+MemberDelta = Dict[str, Dict[str, str]]
+# room_id -> [user_id, ...]
+RemovedMembers = Dict[str, List[str]]
+
+# 이미 정렬/개수 제한이 있는 쿼리는 조건을 덧붙일 수 없어 서브쿼리로 감싼다.
+_TRAILING_CLAUSE = re.compile(r"\b(order\s+by|group\s+by|limit)\b", re.IGNORECASE)
+_WHERE = re.compile(r"\bwhere\b", re.IGNORECASE)
+
+
+def _user_id(value: Any) -> Optional[int]:
+    """카카오 user_id 는 정수다; 비어 있거나 숫자가 아니면 None."""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _watermark_value(value: Any) -> Any:
+    """IRIS 는 숫자 컬럼도 문자열로 줄 수 있어 정수로 비교한다."""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class _RoomMembers:
+    """한 방의 멤버를 열 형식으로 저장한다.
+
+    user_id 는 정렬된 ``array('q')`` 에, 닉네임은 같은 순서의 리스트에 두고
+    이진 탐색으로 찾는다. 멤버마다 dict 항목과 user_id 문자열을 두지 않는다.
+    """
+
+    __slots__ = ("ids", "nicknames")
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.nicknames: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, user_id: int) -> int:
+        index = bisect_left(self.ids, user_id)
+        if index < len(self.ids) and self.ids[index] == user_id:
+            return index
+        return -1
+
+    def get(self, user_id: int) -> Optional[str]:
+        index = self.find(user_id)
+        return self.nicknames[index] if index >= 0 else None
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        return zip(self.ids, self.nicknames)
+
+    def update(self, members: Dict[int, str]) -> None:
+        """닉네임을 바꾸고, 새 멤버는 한 번에 병합해 정렬을 유지한다."""
+        added: Dict[int, str] = {}
+        for user_id, nickname in members.items():
+            index = self.find(user_id)
+            if index >= 0:
+                self.nicknames[index] = nickname
+            else:
+                added[user_id] = nickname
+        if added:
+            self._rebuild(sorted([*self.items(), *added.items()], key=itemgetter(0)))
+
+    def remove(self, user_ids: Iterable[int]) -> None:
+        drop = set(user_ids)
+        self._rebuild([(user_id, nickname) for user_id, nickname in self.items() if user_id not in drop])
+
+    def _rebuild(self, pairs: List[Tuple[int, str]]) -> None:
+        self.ids = array("q", map(itemgetter(0), pairs))
+        self.nicknames = list(map(itemgetter(1), pairs))
+
 
 @dataclass
 class NicknameWatcherConfig:
@@ -29,6 +119,19 @@ class NicknameWatcherConfig:
     message_template: str = "닉네임이 변경되었어요!\n{old} -> {new}"
     state_file: Path = Path("data/automation/nickname_watcher_state.json")
     query_payload: Dict[str, object] = field(default_factory=lambda: dict(_DEFAULT_QUERY))
+    # 설정하면 ``column > 마지막 값`` 인 행만 가져온다 (닉네임 변경 시 증가하는 컬럼이어야 한다).
+    watermark_column: Optional[str] = None
+    full_sync_interval: float = 300.0
+    compact_after: int = 1000
+    snapshot_interval: float = 300.0
+    # run_async 전용: 변화가 없으면 interval 에서 max_interval 까지 backoff_factor 배씩
+    # 늘리고, 변경/입장 이벤트(poke) 뒤에는 min_interval 로 당긴다.
+    min_interval: float = 1.0
+    max_interval: float = 30.0
+    backoff_factor: float = 1.5
+    max_concurrent_notifications: int = 4
+    notify_retries: int = 2
+    retry_base_delay: float = 1.0
 
     def __post_init__(self) -> None:
         if not self.base_url:
@@ -50,19 +153,51 @@ class NicknameChange:
 
 
 class NicknameWatcher:
-    """Detects and reports nickname changes using IRIS HTTP endpoints."""
+    """Detects and reports nickname changes using IRIS HTTP endpoints.
+
+    When ``outbound`` is given, notifications are queued on the shared
+    :class:`OutboundDispatcher` (``notification`` priority) instead of being
+    posted immediately.
+
+    Members are kept per ``(user_id, involved_chat_id)`` pair, partitioned by
+    room, since open chat profiles and nicknames are per room. Each room is
+    stored column-wise (sorted user ids in an ``array('q')`` plus a parallel
+    nickname list) rather than as a dict of strings. When ``rooms`` is
+    configured the filter is bound into the SQL query, so only those rooms'
+    rows are transferred and kept.
+    Polls that change nothing write nothing; otherwise the delta is appended
+    as one line to ``<state>.changes.jsonl`` and the compact snapshot
+    (``state_file``) is rewritten only after ``compact_after`` logged entries
+    or ``snapshot_interval`` seconds. With ``watermark_column`` set, polls
+    fetch only rows past the last seen value, with a full sync every
+    ``full_sync_interval`` seconds to pick up members who left.
+
+    :meth:`start` is the original blocking loop with a fixed interval;
+    :meth:`run_async` runs inside an existing event loop with adaptive
+    polling and concurrent notifications.
+    """
 
     def __init__(
         self,
         config: NicknameWatcherConfig,
         session: Optional[requests.Session] = None,
         logger: Optional[ServiceLogger] = None,
+        outbound: Optional[OutboundDispatcher] = None,
     ) -> None:
         self.config = config
+        self.outbound = outbound
         self.session = session or requests.Session()
         self.logger = logger or get_service_logger("nickname_watcher")
-        self._state: Dict[str, Dict[str, str]] = {}
+        self._rooms = set(config.rooms) if config.rooms is not None else None
+        self._state: Dict[str, _RoomMembers] = {}
+        self._watermark: Any = None
+        self._pending_log = 0
+        self._last_snapshot = time.monotonic()
+        self._last_full_sync = 0.0
         self._running = False
+        self._poll_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
         self._load_state()
 
     # ------------------------------------------------------------------
@@ -79,16 +214,145 @@ class NicknameWatcher:
                 self.run_once()
                 time.sleep(self.config.interval)
         finally:
+            if self._pending_log:
+                self._save_state()
             self.logger.info("닉네임 감시 종료")
 
     def stop(self) -> None:
-        """Signal the watcher loop to stop."""
+        """Signal the watcher loop (sync or async) to stop."""
         self._running = False
+        self.poke()
+
+    def poke(self) -> None:
+        """Poll soon at the fastest interval (e.g. on a member join); thread-safe."""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wake.set()
+        else:
+            loop.call_soon_threadsafe(wake.set)
+
+    async def run_async(self) -> None:
+        """Adaptive polling loop for an existing event loop (until :meth:`stop`).
+
+        Fetching and diffing run in the default executor so the loop is not
+        blocked; notifications are sent concurrently (bounded by
+        ``max_concurrent_notifications``). IRIS errors are retried with
+        jittered exponential backoff.
+        """
+        if self._running:
+            return
+        config = self.config
+        self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        semaphore = asyncio.Semaphore(max(1, config.max_concurrent_notifications))
+        interval = config.interval
+        failures = 0
+        pending: set = set()
+        self.logger.info("닉네임 감시 시작", mode="async")
+        try:
+            while self._running:
+                try:
+                    changes = await self._loop.run_in_executor(None, self._poll)
+                except Exception as exc:  # noqa: BLE001
+                    failures += 1
+                    delay = self._jitter(min(config.max_interval, config.retry_base_delay * 2 ** (failures - 1)))
+                    self.logger.warning("닉네임 조회 실패, 재시도 대기", error=str(exc), failures=failures, delay=round(delay, 2))
+                    await self._sleep(delay)
+                    continue
+                failures = 0
+                for change in changes:
+                    if not self._should_notify(change.room_id):
+                        continue
+                    task = asyncio.create_task(self._notify_async(change, semaphore))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                if changes:
+                    interval = config.min_interval
+                else:
+                    interval = min(config.max_interval, max(interval, config.min_interval) * config.backoff_factor)
+                if await self._sleep(interval):
+                    interval = config.min_interval
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if self._pending_log:
+                await asyncio.get_running_loop().run_in_executor(None, self._save_state)
+            self._running = False
+            self._loop = self._wake = None
+            self.logger.info("닉네임 감시 종료", mode="async")
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``; True if woken early by :meth:`poke`."""
+        wake = self._wake
+        assert wake is not None
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return False
+        wake.clear()
+        return True
+
+    @staticmethod
+    def _jitter(delay: float) -> float:
+        return delay * random.uniform(0.5, 1.5)
+
+    async def _notify_async(self, change: NicknameChange, semaphore: asyncio.Semaphore) -> None:
+        message = self._format_message(change)
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            for attempt in range(self.config.notify_retries + 1):
+                try:
+                    if self.outbound is not None:
+                        # 재시도도 outbound 큐에 다시 넣어 속도 제한을 거치게 한다.
+                        future = self.outbound.submit(
+                            change.room_id,
+                            message,
+                            lambda text: self._post_reply(change.room_id, text),
+                            priority="notification",
+                        )
+                        await asyncio.wrap_future(future)
+                    else:
+                        await loop.run_in_executor(None, self._post_reply, change.room_id, message)
+                except Exception as exc:  # noqa: BLE001
+                    if attempt >= self.config.notify_retries:
+                        self._log_notification(change, exc)
+                        return
+                    await asyncio.sleep(self._jitter(self.config.retry_base_delay * 2 ** attempt))
+                    continue
+                self._log_notification(change, None)
+                return
+
+    @property
+    def log_file(self) -> Path:
+        return self.config.state_file.with_suffix(".changes.jsonl")
+
+    def nickname(self, user_id: str, room_id: Optional[str] = None) -> Optional[str]:
+        """Nickname of ``user_id`` in ``room_id`` (any room when omitted)."""
+        key = _user_id(user_id)
+        if key is None:
+            return None
+        if room_id is not None:
+            members = self._state.get(str(room_id))
+            return members.get(key) if members is not None else None
+        for members in self._state.values():
+            nickname = members.get(key)
+            if nickname is not None:
+                return nickname
+        return None
+
+    def member_count(self) -> int:
+        return sum(len(members) for members in self._state.values())
 
     def run_once(self) -> List[NicknameChange]:
         """Fetch members, detect changes, notify, and persist state."""
-        members = self._fetch_members()
-        changes = self._detect_changes(members)
+        changes = self._poll()
         for change in changes:
             if not self._should_notify(change.room_id):
                 self.logger.debug(
@@ -98,8 +362,15 @@ class NicknameWatcher:
                 )
                 continue
             self._send_notification(change)
-        self._state = members
-        self._save_state()
+        return changes
+
+    def _poll(self) -> List[NicknameChange]:
+        """Fetch, diff and persist; returns the detected changes."""
+        with self._poll_lock:
+            full = self._full_sync_due()
+            rows = self._fetch_members(full)
+            changes, updated, removed = self._apply(rows, full)
+            self._persist(updated, removed)
         return changes
 
     # ------------------------------------------------------------------
@@ -111,71 +382,169 @@ class NicknameWatcher:
             headers["Authorization"] = f"Bearer {self.config.api_token}"
         return headers
 
-    def _fetch_members(self) -> Dict[str, Dict[str, str]]:
+    def _full_sync_due(self) -> bool:
+        if not self.config.watermark_column or self._watermark is None:
+            return True
+        return time.monotonic() - self._last_full_sync >= self.config.full_sync_interval
+
+    def _build_query(self, full: bool) -> Dict[str, object]:
+        payload = dict(self.config.query_payload)
+        query = str(payload["query"]).strip().rstrip(";")
+        bind = list(payload.get("bind") or [])
+        conditions: List[str] = []
+        rooms = self.config.rooms
+        if rooms is not None:
+            # 방 필터는 IRIS 쪽 SQL 에서 적용해 필요한 행만 받는다.
+            conditions.append(f"involved_chat_id in ({','.join('?' * len(rooms))})" if rooms else "0")
+            bind.extend(rooms)
+        column = self.config.watermark_column
+        if column and not full:
+            conditions.append(f"{column} > ?")
+            bind.append(self._watermark)
+        if conditions:
+            if _TRAILING_CLAUSE.search(query):
+                query = f"select * from ({query})"
+            joiner = " and " if _WHERE.search(query) else " where "
+            query += joiner + " and ".join(conditions)
+        if column and not full:
+            query += f" order by {column}"
+        payload["query"] = query
+        payload["bind"] = bind
+        return payload
+
+    def _fetch_members(self, full: bool = True) -> List[Dict[str, Any]]:
         url = f"{self.config.base_url}/query"
         response = self.session.post(
             url,
             headers=self._headers(),
-            json=self.config.query_payload,
+            json=self._build_query(full),
             timeout=self.config.timeout,
         )
         response.raise_for_status()
         payload = response.json()
-        data = payload.get("data", [])
-        members: Dict[str, Dict[str, str]] = {}
-        for item in data:
-            user_id = str(item.get("user_id", ""))
-            nickname = str(item.get("nickname", ""))
-            room_id = str(item.get("involved_chat_id", ""))
-            if user_id:
-                members[user_id] = {"nickname": nickname, "room_id": room_id}
-        return members
+        if full:
+            self._last_full_sync = time.monotonic()
+        return payload.get("data", [])
+
+    def _apply(
+        self, rows: List[Dict[str, Any]], full: bool
+    ) -> Tuple[List[NicknameChange], MemberDelta, RemovedMembers]:
+        """Diff fetched rows against the snapshot in place.
 
-    def _detect_changes(self, members: Dict[str, Dict[str, str]]) -> List[NicknameChange]:
+        Returns nickname changes, the ``(room, user)`` entries that were added
+        or changed, and (on full syncs) the pairs that disappeared.
+        """
+        state = self._state
+        column = self.config.watermark_column
+        watermark = self._watermark
         changes: List[NicknameChange] = []
-        for user_id, info in members.items():
-            previous = self._state.get(user_id)
-            if not previous:
+        updated: MemberDelta = {}
+        added: Dict[str, Dict[int, str]] = {}
+        # 전체 동기화에서 본 멤버를 배열 위치별 1바이트로 표시한다.
+        seen: Dict[str, bytearray] = {}
+        for item in rows:
+            user_id = _user_id(item.get("user_id"))
+            if user_id is None:
+                continue
+            nickname = str(item.get("nickname", ""))
+            room_id = str(item.get("involved_chat_id", ""))
+            if column:
+                value = _watermark_value(item.get(column))
+                if value is not None and (watermark is None or value > watermark):
+                    watermark = value
+            members = state.get(room_id)
+            index = members.find(user_id) if members is not None else -1
+            if index >= 0:
+                if full:
+                    room_seen = seen.get(room_id)
+                    if room_seen is None:
+                        room_seen = seen[room_id] = bytearray(len(members))
+                    room_seen[index] = 1
+                previous: Optional[str] = members.nicknames[index]
+            else:
+                previous = added.get(room_id, {}).get(user_id)
+            if previous == nickname:
                 continue
-            if previous.get("nickname") != info.get("nickname"):
+            if previous is not None:
                 changes.append(
                     NicknameChange(
-                        user_id=user_id,
-                        room_id=info.get("room_id", ""),
-                        old_nickname=previous.get("nickname", ""),
-                        new_nickname=info.get("nickname", ""),
+                        user_id=str(user_id),
+                        room_id=room_id,
+                        old_nickname=previous,
+                        new_nickname=nickname,
                     )
                 )
-        return changes
+            if index >= 0:
+                members.nicknames[index] = nickname
+            else:
+                added.setdefault(room_id, {})[user_id] = nickname
+            updated.setdefault(room_id, {})[str(user_id)] = nickname
+        removed: RemovedMembers = {}
+        if full:
+            for room_id, members in list(state.items()):
+                room_seen = seen.get(room_id) or bytearray(len(members))
+                gone = [user_id for user_id, flag in zip(members.ids, room_seen) if not flag]
+                if not gone:
+                    continue
+                removed[room_id] = [str(user_id) for user_id in gone]
+                members.remove(gone)
+                if not members:
+                    del state[room_id]
+        for room_id, new_members in added.items():
+            state.setdefault(room_id, _RoomMembers()).update(new_members)
+        self._watermark = watermark
+        return changes, updated, removed
 
     def _should_notify(self, room_id: str) -> bool:
         if not room_id:
             return False
-        if self.config.rooms is None:
+        if self._rooms is None:
             return True
-        return room_id in self.config.rooms
+        return room_id in self._rooms
 
-    def _send_notification(self, change: NicknameChange) -> None:
-        message = self.config.message_template.format(
+    def _format_message(self, change: NicknameChange) -> str:
+        return self.config.message_template.format(
             old=change.old_nickname,
             new=change.new_nickname,
             user_id=change.user_id,
             room_id=change.room_id,
         )
+
+    def _send_notification(self, change: NicknameChange) -> None:
+        message = self._format_message(change)
+        if self.outbound is not None:
+            future = self.outbound.submit(
+                change.room_id,
+                message,
+                lambda text: self._post_reply(change.room_id, text),
+                priority="notification",
+            )
+            future.add_done_callback(lambda done: self._log_notification(change, done.exception()))
+            return
+        try:
+            self._post_reply(change.room_id, message)
+        except Exception as exc:  # noqa: BLE001
+            self._log_notification(change, exc)
+            return
+        self._log_notification(change, None)
+
+    def _post_reply(self, room_id: str, message: str) -> None:
         payload = {
             "type": "text",
-            "room": change.room_id,
+            "room": room_id,
             "data": message,
         }
         url = f"{self.config.base_url}/reply"
-        try:
-            response = self.session.post(
-                url,
-                headers=self._headers(),
-                json=payload,
-                timeout=self.config.timeout,
-            )
-            response.raise_for_status()
+        response = self.session.post(
+            url,
+            headers=self._headers(),
+            json=payload,
+            timeout=self.config.timeout,
+        )
+        response.raise_for_status()
+
+    def _log_notification(self, change: NicknameChange, error: Optional[BaseException]) -> None:
+        if error is None:
             self.logger.info(
                 "닉네임 변경 알림 전송",
                 user_id=change.user_id,
@@ -183,36 +552,122 @@ class NicknameWatcher:
                 old_nickname=change.old_nickname,
                 new_nickname=change.new_nickname,
             )
-        except Exception as exc:  # noqa: BLE001
+        else:
             self.logger.error(
                 "알림 전송 실패",
                 user_id=change.user_id,
                 room_id=change.room_id,
-                error=str(exc),
+                error=str(error),
             )
 
     # ------------------------------------------------------------------
     # State persistence helpers
     # ------------------------------------------------------------------
     def _load_state(self) -> None:
+        """Load the compact snapshot, then replay the change log on top of it."""
+        self._state = {}
         path = self.config.state_file
-        if not path.exists():
-            self._state = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text("utf-8"))
+            except json.JSONDecodeError:
+                self.logger.warning("상태 파일을 읽을 수 없습니다. 새로 생성합니다.", path=str(path))
+                data = {}
+            if data.get("version") == _STATE_VERSION:
+                self._watermark = _watermark_value(data.get("watermark"))
+                self._merge(data.get("rooms", {}))
+            else:
+                # 이전 형식: {"user_id": {"nickname": ..., "room_id": ...}}
+                rooms: MemberDelta = {}
+                for user_id, entry in data.items():
+                    if isinstance(entry, dict):
+                        room_id = str(entry.get("room_id", ""))
+                        rooms.setdefault(room_id, {})[user_id] = str(entry.get("nickname", ""))
+                self._merge(rooms)
+        if not self.log_file.exists():
             return
-        try:
-            self._state = json.loads(path.read_text("utf-8"))
-        except json.JSONDecodeError:
-            self.logger.warning("상태 파일을 읽을 수 없습니다. 새로 생성합니다.", path=str(path))
-            self._state = {}
+        with self.log_file.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    batch = json.loads(line)
+                except json.JSONDecodeError:
+                    # 쓰다 만 마지막 줄 - 그 앞까지만 반영한다.
+                    break
+                self._replay(batch)
+                self._pending_log += 1
+
+    def _merge(self, rooms: MemberDelta) -> None:
+        for room_id, members in rooms.items():
+            parsed = {}
+            for user_id, nickname in members.items():
+                key = _user_id(user_id)
+                if key is not None:
+                    parsed[key] = str(nickname)
+            if parsed:
+                self._state.setdefault(room_id, _RoomMembers()).update(parsed)
+
+    def _replay(self, batch: Dict[str, Any]) -> None:
+        self._merge(batch.get("set", {}))
+        for room_id, users in batch.get("del", {}).items():
+            members = self._state.get(room_id)
+            if members is None:
+                continue
+            members.remove(key for key in map(_user_id, users) if key is not None)
+            if not members:
+                del self._state[room_id]
+        if "w" in batch:
+            self._watermark = _watermark_value(batch["w"])
+
+    def _persist(self, updated: MemberDelta, removed: RemovedMembers) -> None:
+        changed = sum(map(len, updated.values())) + sum(map(len, removed.values()))
+        if changed and self._pending_log + changed >= self.config.compact_after:
+            # 첫 스냅샷처럼 큰 변경은 로그를 거치지 않고 바로 압축 저장한다.
+            self._save_state()
+            return
+        if changed:
+            batch: Dict[str, Any] = {"set": updated}
+            if removed:
+                batch["del"] = removed
+            if self.config.watermark_column:
+                batch["w"] = self._watermark
+            self._append_log(batch)
+            self._pending_log += changed
+        if not self._pending_log:
+            return
+        if (
+            self._pending_log >= self.config.compact_after
+            or time.monotonic() - self._last_snapshot >= self.config.snapshot_interval
+        ):
+            self._save_state()
+
+    def _append_log(self, batch: Dict[str, Any]) -> None:
+        path = self.log_file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(batch, ensure_ascii=False, separators=(",", ":")) + "\n")
 
     def _save_state(self) -> None:
+        """Write the compact snapshot atomically and truncate the change log."""
         path = self.config.state_file
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(self._state, ensure_ascii=False, indent=2), encoding="utf-8")
+        data = {
+            "version": _STATE_VERSION,
+            "watermark": self._watermark,
+            "rooms": {
+                room_id: {str(user_id): nickname for user_id, nickname in members.items()}
+                for room_id, members in self._state.items()
+            },
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+        self.log_file.unlink(missing_ok=True)
+        self._pending_log = 0
+        self._last_snapshot = time.monotonic()
 
 
 __all__ = [
     "NicknameWatcherConfig",
     "NicknameWatcher",
     "NicknameChange",
-]
+]
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.services.broadcast_scheduler import BroadcastScheduler, BroadcastTask
+from src.services.outbound_dispatcher import OutboundDispatcher
+from src.utils.logger import get_service_logger, ServiceLogger
+
+SendFunc = Callable[[str, Dict[str, Any]], Any]
+
+
+class RoomPacer:
+    """Enforces a minimum interval between sends to the same room."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = max(0.0, interval)
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, room: str) -> None:
+        if self.interval <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot.get(room, 0.0))
+        self._next_slot[room] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        if len(self._next_slot) > 4096:
+            self._next_slot = {key: value for key, value in self._next_slot.items() if value > now}
+
+
+class BroadcastDispatcher:
+    """Fans a broadcast task out to its channels in parallel.
+
+    Delivery outcomes are stored per ``(task, channel)`` as each send
+    finishes, so a retry, a crash or a lost lease only re-sends to channels
+    that were not delivered. Sends run on a dedicated thread pool
+    (IRIS sends are blocking HTTP), bounded by ``concurrency`` and paced per
+    room by :class:`RoomPacer`. The task lease is renewed in the background
+    while the fan-out is in progress. When an :class:`OutboundDispatcher` is
+    given, sends go through it at ``broadcast`` priority so they share the
+    global/per-room budget with command replies and welcome messages.
+    """
+
+    def __init__(
+        self,
+        scheduler: BroadcastScheduler,
+        send_func: SendFunc,
+        worker_id: str,
+        concurrency: int = 8,
+        room_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        logger: Optional[ServiceLogger] = None,
+        outbound: Optional[OutboundDispatcher] = None,
+    ) -> None:
+        self.scheduler = scheduler
+        self.send_func = send_func
+        self.worker_id = worker_id
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.pacer = RoomPacer(room_interval)
+        self.outbound = outbound
+        self.logger = logger or get_service_logger("broadcast_dispatcher")
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="broadcast",
+        )
+
+    async def dispatch(self, task: BroadcastTask) -> bool:
+        """Send ``task`` to its undelivered channels; returns ``True`` when fully delivered."""
+        channels = self.scheduler.pending_channels(task)
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        payload_preview = json.dumps(task.payload, ensure_ascii=False)[:200]
+
+        def record(channel: str, error: Optional[str], result: Any = None) -> None:
+            # 채널마다 바로 저장해야 점유를 잃거나 죽어도 보낸 채널을 다시 보내지 않는다.
+            self.scheduler.record_deliveries(task.id, [(channel, error)])
+            if error is None:
+                self.logger.log_event(
+                    "broadcast_sent",
+                    room_id=channel,
+                    task_id=str(task.id),
+                    payload=payload_preview,
+                    result=str(result)[:120] if result is not None else "ok",
+                )
+
+        def record_late(channel: str, future: concurrent.futures.Future) -> None:
+            # 취소 시점에 이미 전송 중이던 건은 끝난 뒤 결과를 남긴다.
+            error = future.exception()
+            if error is None:
+                record(channel, None, future.result())
+            else:
+                record(channel, repr(error))
+
+        async def send_one(channel: str) -> Tuple[str, Optional[str]]:
+            async with semaphore:
+                await self.pacer.wait(channel)
+                if self.outbound is not None:
+                    future = self.outbound.submit(
+                        channel,
+                        payload_preview,
+                        lambda _: self.send_func(channel, task.payload),
+                        priority="broadcast",
+                        coalesce=False,
+                    )
+                else:
+                    future = self._executor.submit(self.send_func, channel, task.payload)
+                try:
+                    result = await asyncio.wrap_future(future)
+                except asyncio.CancelledError:
+                    # 아직 대기열에 있으면 취소되고, 이미 보내는 중이면 결과만 기록한다.
+                    if not future.cancel():
+                        future.add_done_callback(lambda done: record_late(channel, done))
+                    raise
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.logger.log_error_with_context(
+                        error=exc,
+                        context={"task_id": task.id, "room_id": channel, "operation": "broadcast_send"},
+                    )
+                    record(channel, repr(exc))
+                    return channel, repr(exc)
+                record(channel, None, result)
+                return channel, None
+
+        renewer = asyncio.create_task(self._renew_lease_periodically(task.id))
+        fan_out = asyncio.ensure_future(asyncio.gather(*(send_one(channel) for channel in channels)))
+        try:
+            done, _ = await asyncio.wait({fan_out, renewer}, return_when=asyncio.FIRST_COMPLETED)
+            if fan_out not in done:
+                # 점유를 잃었으면 다른 워커가 이어받으므로 남은 전송을 취소한다.
+                # 이미 끝난 채널은 send_one 에서 저장했다.
+                fan_out.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await fan_out
+                self.logger.warning("방송 점유가 만료되어 전송을 중단합니다.", task_id=task.id)
+                return False
+            results: List[Tuple[str, Optional[str]]] = fan_out.result()
+        finally:
+            renewer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await renewer
+
+        failed = [(channel, error) for channel, error in results if error is not None]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if failed:
+            summary = "; ".join(f"{channel}: {error}" for channel, error in failed[:5])
+            self.scheduler.mark_retry(task.id, summary, self.max_attempts, worker_id=self.worker_id)
+            self.logger.warning(
+                "브로드캐스트 일부 실패",
+                task_id=task.id,
+                failed_channels=",".join(channel for channel, _ in failed),
+                sent=len(results) - len(failed),
+                duration_ms=round(elapsed_ms, 1),
+            )
+            return False
+        if not self.scheduler.mark_success(task.id, worker_id=self.worker_id):
+            return False
+        self.logger.info(
+            "브로드캐스트 완료",
+            task_id=task.id,
+            channels=len(results),
+            duration_ms=round(elapsed_ms, 1),
+        )
+        return True
+
+    async def _renew_lease_periodically(self, task_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 2)
+            if not self.scheduler.renew_lease(task_id, self.worker_id, self.lease_seconds):
+                return
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["BroadcastDispatcher", "RoomPacer"]
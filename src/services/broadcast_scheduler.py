@@ -3,13 +3,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import sqlite3
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from src.utils.cron import CronExpression
 from src.utils.logger import get_service_logger, ServiceLogger
 
 
@@ -23,26 +28,98 @@ class BroadcastTask:
     last_error: Optional[str]
     scheduled_at: datetime
     completed_at: Optional[datetime]
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    priority: int = 0
+    recurrence: Optional[str] = None
 
     @property
     def is_pending(self) -> bool:
         return self.status == "PENDING"
 
 
+_TASK_COLUMNS = (
+    "id, channels, payload, attempts, status, last_error, scheduled_at, completed_at,"
+    " lease_owner, lease_expires_at, priority, recurrence"
+)
+
+
+def _to_utc_naive(moment: datetime) -> datetime:
+    """Stored timestamps are naive UTC ISO strings; aware inputs are converted."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _row_to_task(row: Any) -> BroadcastTask:
+    return BroadcastTask(
+        id=row[0],
+        channels=json.loads(row[1]),
+        payload=json.loads(row[2]),
+        attempts=row[3],
+        status=row[4],
+        last_error=row[5],
+        scheduled_at=datetime.fromisoformat(row[6]),
+        completed_at=datetime.fromisoformat(row[7]) if row[7] else None,
+        lease_owner=row[8],
+        lease_expires_at=datetime.fromisoformat(row[9]) if row[9] else None,
+        priority=row[10],
+        recurrence=row[11],
+    )
+
+
 class BroadcastScheduler:
-    """SQLite-backed broadcast queue."""
+    """SQLite-backed broadcast queue.
+
+    ``enqueue`` wakes waiters in this process through per-loop asyncio
+    events and touches a ``<db>.signal`` file so workers in other
+    processes (e.g. the dashboard enqueuing) notice via a cheap ``stat``.
 
-    def __init__(self, db_path: Path, logger: Optional[ServiceLogger] = None) -> None:
+    Workers take tasks with :meth:`claim`, which atomically moves rows to
+    ``RUNNING`` under a time-limited lease owned by the worker. Leases are
+    renewed while sending and expired leases are claimable again, so any
+    number of workers can drain the same queue without double sends.
+
+    Tasks become claimable at ``scheduled_at`` (highest ``priority`` first).
+    Failed attempts are pushed back with exponential backoff, and tasks with
+    a cron ``recurrence`` enqueue their next occurrence when they complete.
+    :meth:`seconds_until_next_due` reads the ``(status, scheduled_at)``
+    index so the worker can sleep exactly until the next due task.
+
+    Per-status row counts are maintained by triggers so :meth:`summary` is
+    O(1), and :meth:`archive_completed` moves old DONE/FAILED rows into
+    ``broadcasts_archive`` so the live table only holds recent history.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        logger: Optional[ServiceLogger] = None,
+        retry_backoff: float = 5.0,
+        retry_backoff_max: float = 600.0,
+        cron_timezone: Optional[tzinfo] = None,
+    ) -> None:
         self.db_path = Path(db_path)
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.cron_timezone = cron_timezone
+        self.signal_path = self.db_path.with_name(self.db_path.name + ".signal")
         self.logger = logger or get_service_logger("broadcast_scheduler")
+        self._waiters: Dict[asyncio.AbstractEventLoop, asyncio.Event] = {}
+        self._waiters_lock = threading.Lock()
+        self._signal_state = self._read_signal_state()
         self._ensure_schema()
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        return sqlite3.connect(self.db_path, timeout=30.0)
 
     def _ensure_schema(self) -> None:
         conn = self._connect()
         try:
+            # 여러 워커/프로세스가 동시에 읽고 쓸 수 있도록 WAL 모드를 사용한다.
+            conn.execute("PRAGMA journal_mode=WAL")
+            # 스키마 확인과 마이그레이션을 한 쓰기 트랜잭션으로 묶어 프로세스 간 경합을 막는다.
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS broadcasts (
@@ -53,91 +130,561 @@ class BroadcastScheduler:
                     status TEXT NOT NULL DEFAULT 'PENDING',
                     last_error TEXT,
                     scheduled_at TEXT NOT NULL,
-                    completed_at TEXT
+                    completed_at TEXT,
+                    lease_owner TEXT,
+                    lease_expires_at TEXT
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS broadcast_deliveries (
+                    task_id INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'PENDING',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    sent_at TEXT,
+                    PRIMARY KEY (task_id, channel)
                 )
                 """
             )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(broadcasts)")}
+            for column, ddl in (
+                ("lease_owner", "TEXT"),
+                ("lease_expires_at", "TEXT"),
+                ("priority", "INTEGER NOT NULL DEFAULT 0"),
+                ("recurrence", "TEXT"),
+                ("due_at", "TEXT"),
+            ):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE broadcasts ADD COLUMN {column} {ddl}")
+            if "due_at" not in columns:
+                conn.execute("UPDATE broadcasts SET due_at = scheduled_at WHERE due_at IS NULL")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_broadcasts_status_scheduled ON broadcasts (status, scheduled_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_broadcasts_status_lease ON broadcasts (status, lease_expires_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_broadcasts_status_completed ON broadcasts (status, completed_at)"
+            )
+            self._ensure_archive_schema(conn)
+            self._ensure_status_counters(conn)
             conn.commit()
         finally:
             conn.close()
 
-    def enqueue(self, channels: Iterable[str], payload: Dict[str, Any]) -> int:
-        now = datetime.utcnow().isoformat()
+    @staticmethod
+    def _ensure_archive_schema(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS broadcasts_archive AS SELECT *, NULL AS archived_at FROM broadcasts WHERE 0"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS broadcast_deliveries_archive AS SELECT * FROM broadcast_deliveries WHERE 0"
+        )
+        archive_columns = {row[1] for row in conn.execute("PRAGMA table_info(broadcasts_archive)")}
+        for row in conn.execute("PRAGMA table_info(broadcasts)").fetchall():
+            if row[1] not in archive_columns:
+                conn.execute(f"ALTER TABLE broadcasts_archive ADD COLUMN {row[1]} {row[2]}")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_broadcasts_archive_completed ON broadcasts_archive (completed_at)"
+        )
+
+    @staticmethod
+    def _ensure_status_counters(conn: sqlite3.Connection) -> None:
+        """Create the status counter table and triggers; runs inside the schema transaction."""
+        seeded = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'broadcast_status_counts'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS broadcast_status_counts (
+                status TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        if not seeded:
+            # 트리거보다 먼저 채워야 기존 행이 두 번 세어지지 않는다.
+            conn.execute(
+                "INSERT INTO broadcast_status_counts (status, count)"
+                " SELECT status, COUNT(1) FROM broadcasts GROUP BY status"
+            )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_broadcasts_count_insert AFTER INSERT ON broadcasts
+            BEGIN
+                INSERT INTO broadcast_status_counts (status, count) VALUES (NEW.status, 1)
+                    ON CONFLICT(status) DO UPDATE SET count = count + 1;
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_broadcasts_count_delete AFTER DELETE ON broadcasts
+            BEGIN
+                UPDATE broadcast_status_counts SET count = count - 1 WHERE status = OLD.status;
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_broadcasts_count_update AFTER UPDATE OF status ON broadcasts
+            WHEN OLD.status <> NEW.status
+            BEGIN
+                UPDATE broadcast_status_counts SET count = count - 1 WHERE status = OLD.status;
+                INSERT INTO broadcast_status_counts (status, count) VALUES (NEW.status, 1)
+                    ON CONFLICT(status) DO UPDATE SET count = count + 1;
+            END
+            """
+        )
+
+    def enqueue(
+        self,
+        channels: Iterable[str],
+        payload: Dict[str, Any],
+        scheduled_at: Optional[datetime] = None,
+        priority: int = 0,
+        recurrence: Optional[str] = None,
+    ) -> int:
+        """Queue a broadcast.
+
+        ``scheduled_at`` (naive values are UTC) defaults to now, or to the
+        next cron occurrence when ``recurrence`` is given.
+        """
+        if recurrence is not None:
+            CronExpression(recurrence)  # 잘못된 표현식은 등록 시점에 거부한다.
+        if scheduled_at is None:
+            scheduled_at = self._next_occurrence(recurrence) if recurrence else datetime.utcnow()
+        channel_list = [str(channel) for channel in channels]
         conn = self._connect()
         try:
-            cur = conn.execute(
-                "INSERT INTO broadcasts (channels, payload, scheduled_at) VALUES (?, ?, ?)",
-                (json.dumps(list(channels)), json.dumps(payload, ensure_ascii=False), now),
+            task_id = self._insert_task(
+                conn,
+                channel_list,
+                json.dumps(payload, ensure_ascii=False),
+                _to_utc_naive(scheduled_at).isoformat(),
+                priority,
+                recurrence,
             )
             conn.commit()
-            task_id = cur.lastrowid
-            self.logger.info("방송 큐 등록", task_id=task_id)
-            return int(task_id)
+            self.logger.info("방송 큐 등록", task_id=task_id, scheduled_at=scheduled_at.isoformat(), priority=priority)
         finally:
             conn.close()
+        self.notify()
+        return int(task_id)
+
+    @staticmethod
+    def _insert_task(
+        conn: sqlite3.Connection,
+        channels: List[str],
+        payload_json: str,
+        scheduled_at: str,
+        priority: int,
+        recurrence: Optional[str],
+    ) -> int:
+        cur = conn.execute(
+            "INSERT INTO broadcasts (channels, payload, scheduled_at, due_at, priority, recurrence)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (json.dumps(channels), payload_json, scheduled_at, scheduled_at, priority, recurrence),
+        )
+        task_id = int(cur.lastrowid)
+        conn.executemany(
+            "INSERT OR IGNORE INTO broadcast_deliveries (task_id, channel) VALUES (?, ?)",
+            [(task_id, channel) for channel in channels],
+        )
+        return task_id
+
+    def _schedule_next_occurrence(self, conn: sqlite3.Connection, task_id: int) -> Optional[int]:
+        """Insert the next run of a recurring task (after DONE or a final FAILED)."""
+        row = conn.execute(
+            "SELECT channels, payload, due_at, priority, recurrence FROM broadcasts WHERE id = ?",
+            (task_id,),
+        ).fetchone()
+        if not row or not row[4]:
+            return None
+        # 재시도로 미뤄지는 scheduled_at 이 아니라 원래 예정 시각(due_at) 기준으로 계산한다.
+        # 재시도 중에 다음 회차 시각도 지났으면 그 회차는 건너뛴다.
+        now = datetime.utcnow()
+        next_at = self._next_occurrence(row[4], datetime.fromisoformat(row[2]))
+        if next_at <= now:
+            next_at = self._next_occurrence(row[4], now)
+        return self._insert_task(conn, json.loads(row[0]), row[1], next_at.isoformat(), row[3], row[4])
+
+    def _next_occurrence(self, recurrence: str, after: Optional[datetime] = None) -> datetime:
+        reference = (after or datetime.utcnow()).replace(tzinfo=timezone.utc)
+        return _to_utc_naive(CronExpression(recurrence).next_after(reference, self.cron_timezone))
+
+    def notify(self) -> None:
+        """Wake workers waiting in :meth:`wait_for_work` (in- and cross-process)."""
+        with self._waiters_lock:
+            waiters = list(self._waiters.items())
+        for loop, event in waiters:
+            if loop.is_closed():
+                with self._waiters_lock:
+                    self._waiters.pop(loop, None)
+                continue
+            loop.call_soon_threadsafe(event.set)
+        try:
+            self.signal_path.parent.mkdir(parents=True, exist_ok=True)
+            # mtime 해상도가 거친 파일시스템에서도 바뀐 것을 알 수 있도록 매번 다른 토큰을 쓴다.
+            self.signal_path.write_text(f"{os.getpid()}:{time.time_ns()}", encoding="ascii")
+        except OSError as exc:
+            self.logger.warning("방송 신호 파일 갱신 실패", path=str(self.signal_path), error=str(exc))
+
+    async def wait_for_work(self, timeout: float, check_interval: float = 0.5) -> bool:
+        """Sleep until an enqueue is signalled or ``timeout`` elapses.
+
+        Returns ``True`` when woken by a signal and ``False`` on timeout, in
+        which case the caller falls back to a regular poll.
+        """
+        loop = asyncio.get_running_loop()
+        with self._waiters_lock:
+            event = self._waiters.get(loop)
+            if event is None:
+                event = self._waiters[loop] = asyncio.Event()
+        deadline = loop.time() + timeout
+        while True:
+            if event.is_set():
+                event.clear()
+                self._signal_state = self._read_signal_state()
+                return True
+            state = self._read_signal_state()
+            if state != self._signal_state:
+                self._signal_state = state
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(event.wait(), min(check_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    def _read_signal_state(self) -> Tuple[int, int, str]:
+        """신호 파일의 (mtime_ns, 크기, 내용); mtime 만으로는 같은 틱 안의 갱신을 놓칠 수 있다."""
+        try:
+            stat = self.signal_path.stat()
+            token = self.signal_path.read_text(encoding="ascii", errors="replace")
+        except OSError:
+            return (0, 0, "")
+        return (stat.st_mtime_ns, stat.st_size, token)
 
     def fetch_pending(self, limit: int = 10) -> List[BroadcastTask]:
         conn = self._connect()
         try:
             rows = conn.execute(
-                "SELECT id, channels, payload, attempts, status, last_error, scheduled_at, completed_at"
-                " FROM broadcasts WHERE status = 'PENDING' ORDER BY scheduled_at ASC LIMIT ?",
+                f"SELECT {_TASK_COLUMNS}"
+                " FROM broadcasts WHERE status = 'PENDING' ORDER BY priority DESC, scheduled_at ASC LIMIT ?",
                 (limit,),
             ).fetchall()
         finally:
             conn.close()
-        tasks: List[BroadcastTask] = []
-        for row in rows:
-            tasks.append(
-                BroadcastTask(
-                    id=row[0],
-                    channels=json.loads(row[1]),
-                    payload=json.loads(row[2]),
-                    attempts=row[3],
-                    status=row[4],
-                    last_error=row[5],
-                    scheduled_at=datetime.fromisoformat(row[6]),
-                    completed_at=datetime.fromisoformat(row[7]) if row[7] else None,
-                )
-            )
+        return [_row_to_task(row) for row in rows]
+
+    def claim(
+        self, worker_id: str, limit: int = 10, lease_seconds: float = 60.0, max_attempts: int = 3
+    ) -> List[BroadcastTask]:
+        """Atomically lease up to ``limit`` pending (or lease-expired) tasks to ``worker_id``.
+
+        Taking over an expired lease counts as a failed attempt (the previous
+        worker died mid-send); tasks that reach ``max_attempts`` that way are
+        marked ``FAILED`` instead of being leased again, as in :meth:`mark_retry`.
+        """
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        expires = (now + timedelta(seconds=lease_seconds)).isoformat()
+        conn = self._connect()
+        try:
+            exhausted = self._fail_exhausted_leases(conn, now_iso, max_attempts)
+            rows = conn.execute(
+                "UPDATE broadcasts SET status = 'RUNNING', lease_owner = ?, lease_expires_at = ?,"
+                " attempts = attempts + (CASE WHEN status = 'RUNNING' THEN 1 ELSE 0 END)"
+                " WHERE id IN ("
+                "   SELECT id FROM broadcasts"
+                "   WHERE (status = 'PENDING' AND scheduled_at <= ?)"
+                "      OR (status = 'RUNNING' AND lease_expires_at < ?)"
+                "   ORDER BY priority DESC, scheduled_at ASC LIMIT ?"
+                f" ) RETURNING {_TASK_COLUMNS}",
+                (worker_id, expires, now_iso, now_iso, limit),
+            ).fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+        self._log_exhausted(exhausted)
+        tasks = sorted(
+            (_row_to_task(row) for row in rows),
+            key=lambda task: (-task.priority, task.scheduled_at, task.id),
+        )
+        if tasks:
+            self.logger.debug("방송 작업 점유", worker_id=worker_id, task_ids=[task.id for task in tasks])
         return tasks
 
-    def mark_success(self, task_id: int) -> None:
+    def renew_lease(self, task_id: int, worker_id: str, lease_seconds: float = 60.0) -> bool:
+        """Extend a lease still held by ``worker_id``; ``False`` means the lease was lost."""
+        expires = (datetime.utcnow() + timedelta(seconds=lease_seconds)).isoformat()
         conn = self._connect()
         try:
-            conn.execute(
-                "UPDATE broadcasts SET status = 'DONE', completed_at = ?, last_error = NULL WHERE id = ?",
-                (datetime.utcnow().isoformat(), task_id),
+            cur = conn.execute(
+                "UPDATE broadcasts SET lease_expires_at = ?"
+                " WHERE id = ? AND status = 'RUNNING' AND lease_owner = ?",
+                (expires, task_id, worker_id),
             )
             conn.commit()
-            self.logger.info("방송 완료", task_id=task_id)
+            return cur.rowcount == 1
         finally:
             conn.close()
 
-    def mark_retry(self, task_id: int, error: str, max_attempts: int = 3) -> None:
+    def reclaim_expired(self, max_attempts: int = 3) -> int:
+        """Return tasks whose lease expired (crashed worker) to ``PENDING``.
+
+        Like :meth:`claim`, each reclaim counts as an attempt and exhausted
+        tasks become ``FAILED``.
+        """
+        now_iso = datetime.utcnow().isoformat()
         conn = self._connect()
         try:
-            row = conn.execute("SELECT attempts FROM broadcasts WHERE id = ?", (task_id,)).fetchone()
+            exhausted = self._fail_exhausted_leases(conn, now_iso, max_attempts)
+            cur = conn.execute(
+                "UPDATE broadcasts SET status = 'PENDING', attempts = attempts + 1,"
+                " lease_owner = NULL, lease_expires_at = NULL"
+                " WHERE status = 'RUNNING' AND lease_expires_at < ?",
+                (now_iso,),
+            )
+            conn.commit()
+            reclaimed = cur.rowcount
+        finally:
+            conn.close()
+        self._log_exhausted(exhausted)
+        if reclaimed:
+            self.logger.warning("만료된 방송 점유 회수", count=reclaimed)
+            self.notify()
+        return reclaimed
+
+    def _owner_clause(self, worker_id: Optional[str]) -> tuple[str, tuple]:
+        if worker_id is None:
+            return "", ()
+        return " AND status = 'RUNNING' AND lease_owner = ?", (worker_id,)
+
+    def mark_success(self, task_id: int, worker_id: Optional[str] = None) -> bool:
+        clause, params = self._owner_clause(worker_id)
+        next_task_id: Optional[int] = None
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                "UPDATE broadcasts SET status = 'DONE', completed_at = ?, last_error = NULL,"
+                " lease_owner = NULL, lease_expires_at = NULL WHERE id = ?" + clause,
+                (datetime.utcnow().isoformat(), task_id, *params),
+            )
+            if cur.rowcount == 1:
+                next_task_id = self._schedule_next_occurrence(conn, task_id)
+            conn.commit()
+        finally:
+            conn.close()
+        if cur.rowcount != 1:
+            self.logger.warning("방송 점유를 잃어 완료 처리하지 못했습니다", task_id=task_id, worker_id=worker_id)
+            return False
+        self.logger.info("방송 완료", task_id=task_id, next_task_id=next_task_id)
+        if next_task_id is not None:
+            self.notify()
+        return True
+
+    def mark_retry(self, task_id: int, error: str, max_attempts: int = 3, worker_id: Optional[str] = None) -> bool:
+        clause, params = self._owner_clause(worker_id)
+        next_task_id: Optional[int] = None
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT attempts FROM broadcasts WHERE id = ?" + clause, (task_id, *params)).fetchone()
             if not row:
-                return
+                return False
             attempts = row[0] + 1
             status = "FAILED" if attempts >= max_attempts else "PENDING"
-            conn.execute(
-                "UPDATE broadcasts SET attempts = ?, status = ?, last_error = ? WHERE id = ?",
-                (attempts, status, error, task_id),
+            delay = min(self.retry_backoff_max, self.retry_backoff * (2 ** (attempts - 1)))
+            now = datetime.utcnow()
+            retry_at = (now + timedelta(seconds=delay)).isoformat()
+            completed_at = now.isoformat() if status == "FAILED" else None
+            cur = conn.execute(
+                "UPDATE broadcasts SET attempts = ?, status = ?, last_error = ?, scheduled_at = ?, completed_at = ?,"
+                " lease_owner = NULL, lease_expires_at = NULL WHERE id = ?" + clause,
+                (attempts, status, error, retry_at, completed_at, task_id, *params),
             )
+            if cur.rowcount == 1 and status == "FAILED":
+                # 한 회차가 최종 실패해도 반복 일정은 이어간다.
+                next_task_id = self._schedule_next_occurrence(conn, task_id)
             conn.commit()
-            self.logger.warning("방송 재시도", task_id=task_id, attempts=attempts, status=status)
+            if cur.rowcount != 1:
+                return False
+        finally:
+            conn.close()
+        self.logger.warning("방송 재시도", task_id=task_id, attempts=attempts, status=status, next_task_id=next_task_id)
+        if next_task_id is not None:
+            self.notify()
+        return True
+
+    def _fail_exhausted_leases(
+        self, conn: sqlite3.Connection, now_iso: str, max_attempts: int
+    ) -> List[Tuple[int, Optional[int]]]:
+        """Mark expired leases whose next attempt would reach ``max_attempts`` as ``FAILED``.
+
+        Returns ``(task_id, next_task_id)`` pairs; the caller commits.
+        """
+        rows = conn.execute(
+            "UPDATE broadcasts SET status = 'FAILED', attempts = attempts + 1, last_error = 'LEASE_EXPIRED',"
+            " completed_at = ?, lease_owner = NULL, lease_expires_at = NULL"
+            " WHERE status = 'RUNNING' AND lease_expires_at < ? AND attempts + 1 >= ?"
+            " RETURNING id",
+            (now_iso, now_iso, max_attempts),
+        ).fetchall()
+        # 최종 실패한 회차도 반복 일정은 이어간다 (mark_retry 와 동일).
+        return [(task_id, self._schedule_next_occurrence(conn, task_id)) for (task_id,) in rows]
+
+    def _log_exhausted(self, exhausted: List[Tuple[int, Optional[int]]]) -> None:
+        for task_id, next_task_id in exhausted:
+            self.logger.warning("방송 점유 만료로 최종 실패", task_id=task_id, next_task_id=next_task_id)
+        if any(next_task_id is not None for _, next_task_id in exhausted):
+            self.notify()
+
+    def next_due_at(self) -> Optional[datetime]:
+        """Earliest time a task becomes claimable (pending due time or lease expiry)."""
+        conn = self._connect()
+        try:
+            pending = conn.execute(
+                "SELECT MIN(scheduled_at) FROM broadcasts WHERE status = 'PENDING'"
+            ).fetchone()[0]
+            lease = conn.execute(
+                "SELECT MIN(lease_expires_at) FROM broadcasts WHERE status = 'RUNNING'"
+            ).fetchone()[0]
         finally:
             conn.close()
+        candidates = [datetime.fromisoformat(value) for value in (pending, lease) if value]
+        return min(candidates) if candidates else None
+
+    def seconds_until_next_due(self) -> Optional[float]:
+        due = self.next_due_at()
+        if due is None:
+            return None
+        return max(0.0, (due - datetime.utcnow()).total_seconds())
+
+    def pending_channels(self, task: BroadcastTask) -> List[str]:
+        """Channels of ``task`` not yet delivered (rows are created lazily for legacy tasks)."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT channel, status FROM broadcast_deliveries WHERE task_id = ?",
+                (task.id,),
+            ).fetchall()
+            if not rows and task.channels:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO broadcast_deliveries (task_id, channel) VALUES (?, ?)",
+                    [(task.id, str(channel)) for channel in task.channels],
+                )
+                conn.commit()
+                return [str(channel) for channel in task.channels]
+        finally:
+            conn.close()
+        delivered = {channel for channel, status in rows if status == "SENT"}
+        return [str(channel) for channel in task.channels if str(channel) not in delivered]
+
+    def record_deliveries(self, task_id: int, results: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Persist per-channel outcomes; ``error`` of ``None`` marks the channel as sent."""
+        now = datetime.utcnow().isoformat()
+        sent: List[Tuple[str, int, str]] = []
+        failed: List[Tuple[str, int, str]] = []
+        for channel, error in results:
+            if error is None:
+                sent.append((now, task_id, channel))
+            else:
+                failed.append((error, task_id, channel))
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "UPDATE broadcast_deliveries SET status = 'SENT', attempts = attempts + 1, last_error = NULL,"
+                " sent_at = ? WHERE task_id = ? AND channel = ?",
+                sent,
+            )
+            conn.executemany(
+                "UPDATE broadcast_deliveries SET status = 'FAILED', attempts = attempts + 1, last_error = ?"
+                " WHERE task_id = ? AND channel = ?",
+                failed,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delivery_status(self, task_id: int) -> Dict[str, Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT channel, status, attempts, last_error, sent_at FROM broadcast_deliveries WHERE task_id = ?",
+                (task_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {
+            channel: {"status": status, "attempts": attempts, "last_error": last_error, "sent_at": sent_at}
+            for channel, status, attempts, last_error, sent_at in rows
+        }
 
     def summary(self) -> Dict[str, int]:
         conn = self._connect()
         try:
-            rows = conn.execute("SELECT status, COUNT(1) FROM broadcasts GROUP BY status").fetchall()
+            rows = conn.execute("SELECT status, count FROM broadcast_status_counts WHERE count > 0").fetchall()
         finally:
             conn.close()
         return {status: count for status, count in rows}
 
+    def archive_completed(self, older_than_days: float = 30.0, batch_size: int = 10_000) -> int:
+        """Move DONE/FAILED rows completed more than ``older_than_days`` ago into the archive tables.
+
+        Work is done in ``batch_size`` transactions so the bot's writers are
+        never blocked for long. Returns the number of archived tasks.
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).isoformat()
+        archived_at = datetime.utcnow().isoformat()
+        columns = None
+        total = 0
+        while True:
+            conn = self._connect()
+            try:
+                if columns is None:
+                    columns = ", ".join(row[1] for row in conn.execute("PRAGMA table_info(broadcasts)"))
+                ids = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT id FROM broadcasts WHERE status = 'DONE' AND completed_at < ?"
+                        " UNION ALL "
+                        "SELECT id FROM broadcasts WHERE status = 'FAILED' AND completed_at < ?"
+                        " LIMIT ?",
+                        (cutoff, cutoff, batch_size),
+                    )
+                ]
+                if not ids:
+                    break
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM archive_batch")
+                conn.executemany("INSERT INTO archive_batch (id) VALUES (?)", ((task_id,) for task_id in ids))
+                conn.execute(
+                    f"INSERT INTO broadcasts_archive ({columns}, archived_at)"
+                    f" SELECT {columns}, ? FROM broadcasts WHERE id IN (SELECT id FROM archive_batch)",
+                    (archived_at,),
+                )
+                conn.execute(
+                    "INSERT INTO broadcast_deliveries_archive SELECT * FROM broadcast_deliveries"
+                    " WHERE task_id IN (SELECT id FROM archive_batch)"
+                )
+                conn.execute("DELETE FROM broadcast_deliveries WHERE task_id IN (SELECT id FROM archive_batch)")
+                conn.execute("DELETE FROM broadcasts WHERE id IN (SELECT id FROM archive_batch)")
+                conn.commit()
+                total += len(ids)
+            finally:
+                conn.close()
+            if len(ids) < batch_size:
+                break
+        if total:
+            self.logger.info("완료된 방송 보관 처리", archived=total, cutoff=cutoff)
+        return total
+
 
-__all__ = ["BroadcastScheduler", "BroadcastTask"]
+__all__ = ["BroadcastScheduler", "BroadcastTask"]
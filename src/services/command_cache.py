@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+HIT = "hit"
+LEADER = "leader"
+WAIT = "wait"
+
+
+class CommandCache:
+    """TTL + LRU result cache with single-flight coalescing.
+
+    Keys are tuples whose first element is the command name, which is used
+    to keep per-command hit/miss counters. :meth:`claim` tells the caller
+    whether it got a cached value, must compute the value (leader), or
+    should wait on the leader's future.
+    """
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def claim(self, key: Tuple[Any, ...]) -> Tuple[str, Any]:
+        command = key[0]
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits[command] = self.hits.get(command, 0) + 1
+                    return HIT, entry[1]
+                del self._entries[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced[command] = self.coalesced.get(command, 0) + 1
+                return WAIT, future
+            future = concurrent.futures.Future()
+            self._inflight[key] = future
+            self.misses[command] = self.misses.get(command, 0) + 1
+            return LEADER, future
+
+    def complete(self, key: Tuple[Any, ...], future: concurrent.futures.Future, value: Any, ttl: float) -> None:
+        """Store the leader's value (``None`` is not cached) and wake waiters."""
+        with self._lock:
+            self._inflight.pop(key, None)
+            if value is not None and ttl > 0:
+                self._entries[key] = (self._clock() + ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evicted += 1
+        if not future.done():
+            future.set_result(value)
+
+    def fail(self, key: Tuple[Any, ...], future: concurrent.futures.Future, error: BaseException) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if not future.done():
+            future.set_exception(error)
+
+    def invalidate(self, command: Optional[str] = None) -> int:
+        with self._lock:
+            if command is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [key for key in self._entries if key[0] == command]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        commands = set(self.hits) | set(self.misses) | set(self.coalesced)
+        per_command = {}
+        for command in sorted(commands):
+            hits = self.hits.get(command, 0)
+            coalesced = self.coalesced.get(command, 0)
+            misses = self.misses.get(command, 0)
+            total = hits + coalesced + misses
+            per_command[command] = {
+                "hits": hits,
+                "coalesced": coalesced,
+                "misses": misses,
+                "hit_ratio": (hits + coalesced) / total if total else 0.0,
+            }
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evicted": self.evicted,
+            "commands": per_command,
+        }
+
+
+__all__ = ["CommandCache"]
@@ -1,13 +1,20 @@
 ﻿from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import inspect
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
+from src.services.command_cache import HIT, WAIT, CommandCache
+from src.services.command_metrics import CommandMetrics
+from src.services.rate_limiter import RateLimit, RateLimiter
 from src.utils.logger import get_service_logger, ServiceLogger
 
 CommandFunc = Callable[[Any, List[str]], Any]
+ReplyFunc = Callable[[Any], Any]
 
 
 @dataclass
@@ -16,18 +23,96 @@ class CommandMeta:
     description: str = ""
     roles: Optional[Iterable[str]] = None
     throttle: Optional[float] = None  # seconds
-    last_called: Dict[str, float] = field(default_factory=dict)
+    aliases: Optional[Iterable[str]] = None
+    rate_limits: Optional[Iterable[RateLimit]] = None
+    timeout: Optional[float] = None  # seconds
+    max_concurrency: Optional[int] = None
+    placeholder: bool = False
+    cache_ttl: Optional[float] = None  # seconds
+    cache_per_room: bool = False
+
+    def effective_limits(self) -> List[RateLimit]:
+        limits = list(self.rate_limits or ())
+        if self.throttle is not None:
+            limits.append(RateLimit.from_throttle(self.throttle))
+        return limits
+
+
+class CommandNotice(str):
+    """Router-generated status text (placeholder, busy, timeout) passed to ``reply``.
+
+    Reply callbacks should send it as a standalone message so it is never
+    merged with the command result.
+    """
+
+
+class _ConcurrencyLimitExceeded(Exception):
+    """Raised internally when a concurrency slot is not available."""
+
+
+class _CommandNode:
+    """Token trie node; ``name`` is set when a command ends at this node."""
+
+    __slots__ = ("children", "name")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _CommandNode] = {}
+        self.name: Optional[str] = None
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
 
 
 class CommandRouter:
-    """Minimal command router that dispatches prefixed messages."""
+    """Minimal command router that dispatches prefixed messages.
+
+    Command names and aliases are compiled into a token trie so that
+    multi-word commands (``!텍스트 추가``) resolve by longest-prefix match.
 
-    def __init__(self, prefix: str = "!", logger: Optional[ServiceLogger] = None) -> None:
+    :meth:`dispatch` runs handlers inline. :meth:`dispatch_async` (and
+    :meth:`submit` from non-loop threads such as the IRIS event thread) awaits
+    coroutine handlers and offloads sync handlers to a bounded executor, with
+    per-command timeout, concurrency limit and a delayed placeholder reply.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "!",
+        logger: Optional[ServiceLogger] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[CommandCache] = None,
+        max_workers: int = 8,
+        max_in_flight: int = 32,
+        default_timeout: Optional[float] = 30.0,
+        placeholder_delay: float = 2.0,
+        placeholder_text: str = "처리 중입니다...",
+        busy_text: str = "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        timeout_text: str = "처리 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.",
+    ) -> None:
         self.prefix = prefix
         self.commands: Dict[str, CommandMeta] = {}
         self.handlers: Dict[str, CommandFunc] = {}
+        self.aliases: Dict[str, str] = {}
         self.logger = logger or get_service_logger("command_router")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cache = cache or CommandCache()
+        self._limits: Dict[str, List[RateLimit]] = {}
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = default_timeout
+        self.placeholder_delay = placeholder_delay
+        self.placeholder_text = placeholder_text
+        self.busy_text = busy_text
+        self.timeout_text = timeout_text
+        self.metrics = CommandMetrics()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = threading.BoundedSemaphore(max(1, max_in_flight))
+        self._command_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._pending: Set[concurrent.futures.Future] = set()
         self._lock = threading.Lock()
+        self._prefix_len = len(prefix)
+        self._trie = _CommandNode()
 
     def register(
         self,
@@ -36,25 +121,96 @@ class CommandRouter:
         description: str = "",
         roles: Optional[Iterable[str]] = None,
         throttle: Optional[float] = None,
+        aliases: Optional[Iterable[str]] = None,
+        rate_limits: Optional[Iterable[RateLimit]] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        placeholder: bool = False,
+        cache_ttl: Optional[float] = None,
+        cache_per_room: bool = False,
     ) -> None:
-        name = name.lower()
+        name = _normalize_name(name)
+        if not name:
+            raise ValueError("command name must not be empty")
+        alias_names = [_normalize_name(alias) for alias in aliases or ()]
         with self._lock:
+            previous = self.commands.get(name)
+            if previous and previous.aliases:
+                for alias in previous.aliases:
+                    self.aliases.pop(alias, None)
             self.commands[name] = CommandMeta(
                 name=name,
                 description=description,
                 roles=list(roles) if roles else None,
                 throttle=throttle,
+                aliases=[alias for alias in alias_names if alias and alias != name] or None,
+                rate_limits=list(rate_limits) if rate_limits else None,
+                timeout=timeout,
+                max_concurrency=max_concurrency,
+                placeholder=placeholder,
+                cache_ttl=cache_ttl,
+                cache_per_room=cache_per_room,
             )
             self.handlers[name] = handler
-        self.logger.info("명령어 등록", command=name, description=description)
+            self._limits[name] = self.commands[name].effective_limits()
+            self.metrics.stats_for(name)
+            if max_concurrency:
+                self._command_slots[name] = threading.BoundedSemaphore(max_concurrency)
+            else:
+                self._command_slots.pop(name, None)
+            for alias in self.commands[name].aliases or ():
+                self.aliases[alias] = name
+            self._trie = self._compile()
+        self.cache.invalidate()
+        self.logger.info("명령어 등록", command=name, description=description, aliases=alias_names)
 
-    def dispatch(self, raw_text: str, context: Any = None, user_roles: Optional[Iterable[str]] = None) -> Optional[Any]:
+    def _compile(self) -> _CommandNode:
+        """Build a fresh trie; dispatch reads the swapped reference without locking."""
+        root = _CommandNode()
+        entries = list(self.aliases.items())
+        entries.extend((name, name) for name in self.commands)
+        for key, target in entries:
+            node = root
+            for token in key.split(" "):
+                node = node.children.setdefault(token, _CommandNode())
+            node.name = target
+        return root
+
+    def match(self, raw_text: str) -> Optional[Tuple[str, List[str]]]:
+        """Resolve ``raw_text`` to ``(command, args)`` using longest-prefix match.
+
+        Text without the prefix is rejected before any allocation.
+        """
         if not raw_text.startswith(self.prefix):
             return None
-        parts = raw_text[len(self.prefix):].strip().split()
-        if not parts:
+        node = self._trie
+        tokens = raw_text[self._prefix_len:].split()
+        matched: Optional[str] = None
+        depth = 0
+        for index, token in enumerate(tokens):
+            node = node.children.get(token) or node.children.get(token.lower())
+            if node is None:
+                break
+            if node.name is not None:
+                matched, depth = node.name, index + 1
+        if matched is None:
+            return None
+        return matched, tokens[depth:]
+
+    def _resolve(
+        self,
+        raw_text: str,
+        context: Any,
+        user_roles: Optional[Iterable[str]],
+    ) -> Optional[Tuple[CommandMeta, CommandFunc, List[str]]]:
+        resolved = self.match(raw_text)
+        if resolved is None:
+            parts = raw_text[self._prefix_len:].split(None, 1)
+            if parts:
+                self.metrics.unknown += 1
+                self.logger.warning("등록되지 않은 명령어", command=parts[0].lower())
             return None
-        name, args = parts[0].lower(), parts[1:]
+        name, args = resolved
         meta = self.commands.get(name)
         handler = self.handlers.get(name)
         if not meta or not handler:
@@ -63,13 +219,236 @@ class CommandRouter:
         if user_roles is None and hasattr(context, "roles"):
             user_roles = getattr(context, "roles")
         if not self._check_roles(meta, user_roles):
+            self.metrics.stats_for(name).denied += 1
             self.logger.warning("권한 부족", command=name)
             return None
         if not self._check_throttle(meta, context):
+            self.metrics.stats_for(name).throttled += 1
             self.logger.warning("명령어 스로틀링", command=name)
             return None
         self.logger.info("명령어 실행", command=name, args=args)
-        return handler(context, args)
+        return meta, handler, args
+
+    def dispatch(self, raw_text: str, context: Any = None, user_roles: Optional[Iterable[str]] = None) -> Optional[Any]:
+        if not raw_text.startswith(self.prefix):
+            return None
+        resolved = self._resolve(raw_text, context, user_roles)
+        if resolved is None:
+            return None
+        meta, handler, args = resolved
+        stats = self.metrics.stats_for(meta.name)
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            if not meta.cache_ttl:
+                return handler(context, args)
+            key = self._cache_key(meta, context, args)
+            state, value = self.cache.claim(key)
+            if state == HIT:
+                return value
+            if state == WAIT:
+                if value.done():
+                    return value.result()
+                # Blocking on another caller's in-flight run could stall the event loop.
+                return handler(context, args)
+            try:
+                result = handler(context, args)
+            except BaseException as exc:
+                self.cache.fail(key, value, exc)
+                raise
+            self.cache.complete(key, value, result, meta.cache_ttl)
+            return result
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latency.record(time.perf_counter() - started)
+
+    async def dispatch_async(
+        self,
+        raw_text: str,
+        context: Any = None,
+        user_roles: Optional[Iterable[str]] = None,
+        reply: Optional[ReplyFunc] = None,
+    ) -> Optional[Any]:
+        """Run the matched handler without blocking the event loop.
+
+        When ``reply`` is given it receives the handler result (and, as a
+        :class:`CommandNotice` delivered before the result, the placeholder text
+        if the handler is slower than ``placeholder_delay``); it is called on
+        the executor because IRIS replies are blocking HTTP. A rejected
+        (concurrency limit) or timed-out command replies with ``busy_text`` /
+        ``timeout_text`` instead and returns ``None``.
+        """
+        if not raw_text.startswith(self.prefix):
+            return None
+        resolved = self._resolve(raw_text, context, user_roles)
+        if resolved is None:
+            return None
+        meta, handler, args = resolved
+        stats = self.metrics.stats_for(meta.name)
+        stats.calls += 1
+
+        loop = asyncio.get_running_loop()
+        placeholder: Optional[asyncio.TimerHandle] = None
+        notices: List[asyncio.Future] = []
+        if meta.placeholder and reply is not None:
+            placeholder = loop.call_later(
+                self.placeholder_delay,
+                lambda: notices.append(
+                    loop.run_in_executor(self._get_executor(), reply, CommandNotice(self.placeholder_text))
+                ),
+            )
+        started = time.perf_counter()
+        result: Any = None
+        try:
+            if meta.cache_ttl:
+                result = await self._run_cached(meta, handler, context, args)
+            else:
+                result = await self._run_guarded(meta, handler, context, args)
+        except _ConcurrencyLimitExceeded as exc:
+            stats.busy += 1
+            self.logger.warning("명령어 동시 실행 한도 초과", command=meta.name, scope=str(exc))
+            result = CommandNotice(self.busy_text)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            self.logger.warning("명령어 시간 초과", command=meta.name, timeout=self._timeout_for(meta))
+            result = CommandNotice(self.timeout_text)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latency.record(time.perf_counter() - started)
+            if placeholder is not None:
+                placeholder.cancel()
+
+        if result is not None and reply is not None:
+            await self._await_notices(notices)
+            await loop.run_in_executor(self._get_executor(), reply, result)
+        # Busy/timeout notices are only for the user; callers still see ``None``.
+        return None if isinstance(result, CommandNotice) else result
+
+    async def _await_notices(self, notices: List[asyncio.Future]) -> None:
+        """Let an already started placeholder reply finish before the result is sent."""
+        for outcome in await asyncio.gather(*notices, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                self.logger.log_error_with_context(error=outcome, context={"operation": "command_notice"})
+
+    async def _run_cached(self, meta: CommandMeta, handler: CommandFunc, context: Any, args: List[str]) -> Any:
+        key = self._cache_key(meta, context, args)
+        state, value = self.cache.claim(key)
+        if state == HIT:
+            return value
+        if state == WAIT:
+            # Shield so a cancelled/timed-out waiter does not cancel the shared future.
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(value)), self._timeout_for(meta))
+        try:
+            result = await self._run_guarded(meta, handler, context, args)
+        except BaseException as exc:
+            self.cache.fail(key, value, exc)
+            raise
+        self.cache.complete(key, value, result, meta.cache_ttl)
+        return result
+
+    async def _run_guarded(self, meta: CommandMeta, handler: CommandFunc, context: Any, args: List[str]) -> Any:
+        """Apply concurrency slots and timeout around a single handler call."""
+        slot = self._command_slots.get(meta.name)
+        if not self._in_flight.acquire(blocking=False):
+            raise _ConcurrencyLimitExceeded("global")
+        if slot is not None and not slot.acquire(blocking=False):
+            self._in_flight.release()
+            raise _ConcurrencyLimitExceeded("command")
+
+        def release(_: Any = None) -> None:
+            if slot is not None:
+                slot.release()
+            self._in_flight.release()
+
+        if inspect.iscoroutinefunction(handler):
+            # wait_for cancels the coroutine on timeout, so it is finished here.
+            try:
+                return await asyncio.wait_for(handler(context, args), self._timeout_for(meta))
+            finally:
+                release()
+        # A timed-out executor call keeps running; hold the slots until it returns.
+        try:
+            future = self._get_executor().submit(handler, context, args)
+        except BaseException:
+            release()
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wait_for(asyncio.wrap_future(future), self._timeout_for(meta))
+
+    def _timeout_for(self, meta: CommandMeta) -> Optional[float]:
+        return meta.timeout if meta.timeout is not None else self.default_timeout
+
+    def _cache_key(self, meta: CommandMeta, context: Any, args: List[str]) -> Tuple[Any, ...]:
+        if meta.cache_per_room:
+            return (meta.name, tuple(args), _room_key(context))
+        return (meta.name, tuple(args))
+
+    def attach_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Bind the event loop used by :meth:`submit`; ``None`` detaches it."""
+        self._loop = loop
+
+    def submit(
+        self,
+        raw_text: str,
+        context: Any = None,
+        user_roles: Optional[Iterable[str]] = None,
+        reply: Optional[ReplyFunc] = None,
+    ) -> Optional[concurrent.futures.Future]:
+        """Schedule :meth:`dispatch_async` on the attached loop from another thread.
+
+        Non-command text returns ``None`` without touching the loop.
+        """
+        if not raw_text.startswith(self.prefix):
+            return None
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            result = self.dispatch(raw_text, context, user_roles)
+            if result is not None and reply is not None:
+                reply(result)
+            return None
+        future = asyncio.run_coroutine_threadsafe(
+            self.dispatch_async(raw_text, context, user_roles, reply),
+            loop,
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._on_submitted_done)
+        return future
+
+    def _on_submitted_done(self, future: concurrent.futures.Future) -> None:
+        self._pending.discard(future)
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.logger.log_error_with_context(error=exc, context={"operation": "command_dispatch"})
+
+    def cancel_pending(self) -> int:
+        """Cancel commands submitted via :meth:`submit` that have not finished."""
+        pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        return len(pending)
+
+    def shutdown(self) -> None:
+        self.cancel_pending()
+        self._loop = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="command",
+                    )
+        return self._executor
 
     def _check_roles(self, meta: CommandMeta, user_roles: Optional[Iterable[str]]) -> bool:
         if not meta.roles:
@@ -81,30 +460,75 @@ class CommandRouter:
         return not required.isdisjoint(user_set)
 
     def _check_throttle(self, meta: CommandMeta, context: Any) -> bool:
-        if meta.throttle is None:
+        limits = self._limits.get(meta.name)
+        if not limits and self.rate_limiter.global_limit is None:
             return True
-        key = str(getattr(context, "sender", getattr(context, "user_id", "global")))
-        now = time.monotonic()
-        last = meta.last_called.get(key, 0)
-        if now - last < meta.throttle:
-            return False
-        meta.last_called[key] = now
-        return True
+        return self.rate_limiter.check(meta.name, limits or (), _user_key(context), _room_key(context)) is None
 
     def available_commands(self) -> List[CommandMeta]:
         return list(self.commands.values())
 
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        return self.rate_limiter.stats()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.latency.snapshot() for name, stats in self.metrics.commands.items()}
+
+    def metrics_text(self) -> str:
+        """Prometheus text exposition of per-command counters and latency."""
+        return self.metrics.render_text()
+
+
+def _user_key(context: Any) -> str:
+    sender = getattr(context, "sender", None)
+    if sender is not None:
+        return str(getattr(sender, "id", sender))
+    return str(getattr(context, "user_id", "global"))
+
+
+def _room_key(context: Any) -> str:
+    room = getattr(context, "room", None)
+    if room is not None:
+        return str(getattr(room, "id", room))
+    return str(getattr(context, "room_id", "global"))
+
 
 def command(
     name: str,
     description: str = "",
     roles: Optional[Iterable[str]] = None,
     throttle: Optional[float] = None,
+    aliases: Optional[Iterable[str]] = None,
+    rate_limits: Optional[Iterable[RateLimit]] = None,
+    timeout: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+    placeholder: bool = False,
+    cache_ttl: Optional[float] = None,
+    cache_per_room: bool = False,
 ):
     """Decorator that annotates a function with command metadata."""
 
     def decorator(func: CommandFunc) -> CommandFunc:
-        setattr(func, "__command_meta__", CommandMeta(name=name, description=description, roles=roles, throttle=throttle))
+        setattr(
+            func,
+            "__command_meta__",
+            CommandMeta(
+                name=name,
+                description=description,
+                roles=roles,
+                throttle=throttle,
+                aliases=aliases,
+                rate_limits=rate_limits,
+                timeout=timeout,
+                max_concurrency=max_concurrency,
+                placeholder=placeholder,
+                cache_ttl=cache_ttl,
+                cache_per_room=cache_per_room,
+            ),
+        )
         return func
 
     return decorator
@@ -118,12 +542,29 @@ def attach_commands(router: CommandRouter, target: Any) -> None:
         if meta is None and hasattr(handler, "__func__"):
             meta = getattr(handler.__func__, "__command_meta__", None)
         if meta:
-            router.register(meta.name, handler, meta.description, meta.roles, meta.throttle)
+            router.register(
+                meta.name,
+                handler,
+                meta.description,
+                meta.roles,
+                meta.throttle,
+                meta.aliases,
+                meta.rate_limits,
+                meta.timeout,
+                meta.max_concurrency,
+                meta.placeholder,
+                meta.cache_ttl,
+                meta.cache_per_room,
+            )
 
 
 __all__ = [
     "CommandRouter",
+    "CommandNotice",
     "command",
     "attach_commands",
     "CommandMeta",
-]
+    "CommandCache",
+    "RateLimit",
+    "RateLimiter",
+]
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.services.rate_limiter import RateLimit, TokenBucketStore
+from src.utils.logger import ServiceLogger, get_service_logger
+from src.utils.metrics import LatencyHistogram
+
+# 숫자가 작을수록 먼저 보낸다. 묶어 보내기는 같은 수준 안에서만 하므로
+# 종류마다 수준이 달라야 서로 다른 종류의 메시지가 한 메시지로 합쳐지지 않는다.
+PRIORITIES: Dict[str, int] = {
+    "command": 0,
+    "welcome": 1,
+    "notification": 2,
+    "broadcast": 3,
+}
+
+SendCallable = Callable[[str], Any]
+
+
+class OutboundQueueFull(RuntimeError):
+    """Raised (through the returned future) when the outbound queue is at capacity."""
+
+
+@dataclass
+class OutboundMessage:
+    room: str
+    text: str
+    send: SendCallable
+    priority: str
+    coalesce: bool
+    enqueued_at: float
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+
+
+class OutboundStats:
+    """Counters and queue-wait histogram for one priority class.
+
+    ``sent``/``failed``/``cancelled`` count messages; ``batches`` counts
+    ``send`` calls (one per coalesced group).
+    """
+
+    __slots__ = ("submitted", "sent", "batches", "coalesced", "failed", "dropped", "cancelled", "wait")
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.sent = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.wait = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "queue_wait": self.wait.snapshot(),
+        }
+
+
+_COUNTERS = ("submitted", "sent", "batches", "coalesced", "failed", "dropped", "cancelled")
+
+
+class OutboundDispatcher:
+    """Single outbound path for every message the bot sends to KakaoTalk.
+
+    Messages are queued per priority class and per room, and released by a
+    small pool of sender threads only when both the room's and the global
+    token bucket allow it. Within a class, rooms are served round-robin, and
+    a room never has two sends in flight at once, so per-room order is kept.
+    Consecutive pending texts for the same room and class are merged into a
+    single message (up to ``max_coalesce_chars``) instead of being sent one by
+    one. :meth:`submit` returns a future resolved with the send result.
+    """
+
+    def __init__(
+        self,
+        global_limit: Optional[RateLimit] = None,
+        room_limit: Optional[RateLimit] = None,
+        workers: int = 4,
+        max_pending: int = 10_000,
+        max_coalesce_chars: int = 1000,
+        coalesce_separator: str = "\n\n",
+        logger: Optional[ServiceLogger] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.global_limit = global_limit or RateLimit(capacity=20, per_seconds=10, scope="global")
+        self.room_limit = room_limit or RateLimit(capacity=5, per_seconds=5, scope="room")
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.max_coalesce_chars = max_coalesce_chars
+        self.coalesce_separator = coalesce_separator
+        self.logger = logger or get_service_logger("outbound_dispatcher")
+        self._clock = clock
+        self._buckets = TokenBucketStore(max_entries=100_000, ttl=max(600.0, self.room_limit.per_seconds * 2), clock=clock)
+        levels = sorted(set(PRIORITIES.values()))
+        self._queues: Dict[int, "OrderedDict[str, Deque[OutboundMessage]]"] = {level: OrderedDict() for level in levels}
+        self._busy_rooms: Set[str] = set()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self.stats: Dict[str, OutboundStats] = {name: OutboundStats() for name in PRIORITIES}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        room: str,
+        text: str,
+        send: SendCallable,
+        priority: str = "command",
+        coalesce: bool = True,
+    ) -> concurrent.futures.Future:
+        """Queue ``send(text)`` for ``room``; safe to call from any thread."""
+        level = PRIORITIES.get(priority)
+        if level is None:
+            raise ValueError(f"unknown outbound priority: {priority}")
+        message = OutboundMessage(
+            room=str(room),
+            text=text,
+            send=send,
+            priority=priority,
+            coalesce=coalesce,
+            enqueued_at=self._clock(),
+        )
+        stats = self.stats[priority]
+        with self._cond:
+            stats.submitted += 1
+            if self._pending >= self.max_pending:
+                stats.dropped += 1
+                message.future.set_exception(OutboundQueueFull(f"outbound queue full ({self.max_pending})"))
+                return message.future
+            self._queues[level].setdefault(message.room, deque()).append(message)
+            self._pending += 1
+            self._ensure_started()
+            self._cond.notify()
+        return message.future
+
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop sender threads; messages still queued are failed."""
+        with self._cond:
+            self._running = False
+            leftovers = [message for queue in self._queues.values() for items in queue.values() for message in items]
+            for queue in self._queues.values():
+                queue.clear()
+            self._pending = 0
+            self._cond.notify_all()
+        for message in leftovers:
+            if not message.future.done():
+                message.future.set_exception(RuntimeError("outbound dispatcher shut down"))
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pending": self._pending,
+            "busy_rooms": len(self._busy_rooms),
+            "priorities": {name: stats.snapshot() for name, stats in self.stats.items()},
+        }
+
+    def render_text(self, prefix: str = "iris_outbound") -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = [f"# TYPE {prefix}_pending gauge", f"{prefix}_pending {self._pending}"]
+        items = sorted(self.stats.items())
+        for counter in _COUNTERS:
+            lines.append(f"# TYPE {prefix}_{counter}_total counter")
+            for name, stats in items:
+                lines.append(f'{prefix}_{counter}_total{{priority="{name}"}} {getattr(stats, counter)}')
+        lines.append(f"# TYPE {prefix}_queue_wait_ms summary")
+        for name, stats in items:
+            histogram = stats.wait
+            for q in (0.5, 0.9, 0.99):
+                lines.append(
+                    f'{prefix}_queue_wait_ms{{priority="{name}",quantile="{q:g}"}} {histogram.percentile(q * 100):.3f}'
+                )
+            lines.append(f'{prefix}_queue_wait_ms_sum{{priority="{name}"}} {histogram.total_us / 1000.0:.3f}')
+            lines.append(f'{prefix}_queue_wait_ms_count{{priority="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    # ------------------------------------------------------------------
+    # Sender threads
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._run, name=f"outbound-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                batch: Optional[List[OutboundMessage]] = None
+                while self._running:
+                    batch, wait = self._take_ready()
+                    if batch is not None:
+                        break
+                    self._cond.wait(wait)
+                if batch is None:
+                    return
+            try:
+                self._send(batch)
+            finally:
+                with self._cond:
+                    self._busy_rooms.discard(batch[0].room)
+                    self._cond.notify()
+
+    def _take_ready(self) -> Tuple[Optional[List[OutboundMessage]], Optional[float]]:
+        """Pop the next sendable batch, or return how long to wait. Caller holds the lock."""
+        if not self._pending:
+            return None, None
+        global_key = ("outbound", "global")
+        global_wait = self._buckets.wait_time(global_key, self.global_limit)
+        if global_wait > 0:
+            return None, global_wait
+        shortest: Optional[float] = None
+        for queue in self._queues.values():
+            for room, items in list(queue.items()):
+                if room in self._busy_rooms:
+                    continue
+                room_key = ("outbound", "room", room)
+                room_wait = self._buckets.wait_time(room_key, self.room_limit)
+                if room_wait > 0:
+                    shortest = room_wait if shortest is None else min(shortest, room_wait)
+                    continue
+                batch = self._pop_live_batch(items)
+                if items:
+                    queue.move_to_end(room)
+                else:
+                    del queue[room]
+                if not batch:
+                    continue
+                # 취소된 메시지를 걸러낸 뒤에야 토큰을 쓴다.
+                self._buckets.acquire(global_key, self.global_limit)
+                self._buckets.acquire(room_key, self.room_limit)
+                self._busy_rooms.add(room)
+                return batch, None
+        return None, shortest
+
+    def _pop_live_batch(self, items: Deque[OutboundMessage]) -> List[OutboundMessage]:
+        """Pop the next batch without cancelled messages. Caller holds the lock."""
+        while items:
+            popped = self._pop_batch(items)
+            self._pending -= len(popped)
+            # 대기 중에 취소된 메시지는 보내지 않는다 (이후 cancel() 은 False).
+            batch = [message for message in popped if message.future.set_running_or_notify_cancel()]
+            if len(batch) < len(popped):
+                self.stats[popped[0].priority].cancelled += len(popped) - len(batch)
+            if batch:
+                return batch
+        return []
+
+    def _pop_batch(self, items: Deque[OutboundMessage]) -> List[OutboundMessage]:
+        batch = [items.popleft()]
+        if not batch[0].coalesce:
+            return batch
+        length = len(batch[0].text)
+        while items and items[0].coalesce and items[0].priority == batch[0].priority:
+            extra = len(items[0].text) + len(self.coalesce_separator)
+            if length + extra > self.max_coalesce_chars:
+                break
+            length += extra
+            batch.append(items.popleft())
+        return batch
+
+    def _send(self, batch: List[OutboundMessage]) -> None:
+        head = batch[0]
+        stats = self.stats[head.priority]
+        now = self._clock()
+        for message in batch:
+            stats.wait.record(now - message.enqueued_at)
+        text = head.text if len(batch) == 1 else self.coalesce_separator.join(message.text for message in batch)
+        stats.batches += 1
+        try:
+            result = batch[-1].send(text)
+        except Exception as exc:  # pylint: disable=broad-except
+            stats.failed += len(batch)
+            self.logger.log_error_with_context(
+                error=exc,
+                context={"room_id": head.room, "priority": head.priority, "operation": "outbound_send"},
+            )
+            for message in batch:
+                message.future.set_exception(exc)
+            return
+        stats.sent += len(batch)
+        stats.coalesced += len(batch) - 1
+        for message in batch:
+            message.future.set_result(result)
+
+
+__all__ = ["OutboundDispatcher", "OutboundMessage", "OutboundQueueFull", "PRIORITIES"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+SCOPES = ("user", "room", "global")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket definition: ``capacity`` calls refilled over ``per_seconds``."""
+
+    capacity: float
+    per_seconds: float
+    scope: str = "user"
+
+    def __post_init__(self) -> None:
+        if self.scope not in SCOPES:
+            raise ValueError(f"unknown rate limit scope: {self.scope}")
+        if self.capacity <= 0 or self.per_seconds <= 0:
+            raise ValueError("capacity and per_seconds must be positive")
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+    @classmethod
+    def from_throttle(cls, seconds: float) -> "RateLimit":
+        """Equivalent of the legacy fixed interval throttle (one call per ``seconds``)."""
+        return cls(capacity=1.0, per_seconds=seconds, scope="user")
+
+    @classmethod
+    def parse(cls, spec: str, scope: str = "user") -> "RateLimit":
+        """Parse ``"<capacity>/<seconds>"`` (e.g. ``"20/10"``) into a limit."""
+        capacity_text, _, seconds_text = spec.partition("/")
+        try:
+            return cls(float(capacity_text), float(seconds_text or 1), scope)
+        except ValueError as exc:
+            raise ValueError(f"invalid rate limit spec: {spec!r}") from exc
+
+
+class TokenBucketStore:
+    """Bounded token bucket table with idle TTL eviction.
+
+    Buckets live in an ``OrderedDict`` kept in last-touched order, so idle
+    entries are always at the front: expiry pops from the front until a live
+    bucket is found and the hard ``max_entries`` cap evicts the oldest one.
+    Each bucket is a two-slot list ``[tokens, updated_at]``. ``ttl`` grows to
+    the longest ``per_seconds`` seen, so a bucket is only dropped once it
+    would have refilled completely and expiry never resets a live limit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 50_000,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self._clock = clock
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: Hashable, limit: RateLimit, cost: float = 1.0) -> bool:
+        now = self._clock()
+        with self._lock:
+            if limit.per_seconds > self.ttl:
+                self.ttl = limit.per_seconds
+            self._expire(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [limit.capacity, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_entries:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.refill_rate)
+                bucket[1] = now
+            if bucket[0] < cost:
+                return False
+            bucket[0] -= cost
+            return True
+
+    def wait_time(self, key: Hashable, limit: RateLimit, cost: float = 1.0) -> float:
+        """Seconds until ``cost`` tokens are available in ``key`` (``0.0`` if now), without consuming."""
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return 0.0 if limit.capacity >= cost else float("inf")
+            tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.refill_rate)
+            if tokens >= cost:
+                return 0.0
+            return (cost - tokens) / limit.refill_rate
+
+    def _expire(self, now: float) -> None:
+        deadline = now - self.ttl
+        buckets = self._buckets
+        while buckets:
+            key, bucket = next(iter(buckets.items()))
+            if bucket[1] >= deadline:
+                return
+            del buckets[key]
+            self.expired += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RateLimiter:
+    """Applies per-(command, user), per-(command, room) and global token buckets."""
+
+    def __init__(
+        self,
+        global_limit: Optional[RateLimit] = None,
+        max_entries: int = 50_000,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if global_limit is not None and global_limit.scope != "global":
+            global_limit = RateLimit(global_limit.capacity, global_limit.per_seconds, "global")
+        self.global_limit = global_limit
+        self.store = TokenBucketStore(max_entries=max_entries, ttl=ttl, clock=clock)
+        self.allowed: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+
+    def check(self, command: str, limits: Iterable[RateLimit], user_key: str, room_key: str) -> Optional[str]:
+        """Consume one token from every applicable bucket.
+
+        Returns ``None`` when allowed, otherwise the scope that rejected the call.
+        """
+        for limit in limits:
+            if limit.scope == "user":
+                key = (command, "user", user_key)
+            elif limit.scope == "room":
+                key = (command, "room", room_key)
+            else:
+                key = (command, "global", "")
+            if not self.store.acquire(key, limit):
+                self.rejected[command] = self.rejected.get(command, 0) + 1
+                return limit.scope
+        if self.global_limit is not None and not self.store.acquire(("*", "global", ""), self.global_limit):
+            self.rejected[command] = self.rejected.get(command, 0) + 1
+            return "global"
+        self.allowed[command] = self.allowed.get(command, 0) + 1
+        return None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "buckets": len(self.store),
+            "max_entries": self.store.max_entries,
+            "expired": self.store.expired,
+            "evicted": self.store.evicted,
+            "allowed": dict(self.allowed),
+            "rejected": dict(self.rejected),
+        }
+
+
+__all__ = ["RateLimit", "RateLimiter", "TokenBucketStore"]
@@ -1,22 +1,64 @@
 """방 관리 서비스 - 자동 감지 기반 방 등록 시스템"""
 
+import atexit
 import json
 import sqlite3
+import threading
 import time
+import weakref
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 
-from src.utils.logger import get_service_logger
+from src.services.room_settings import RoomSettingsStore
+from src.utils.logger import ServiceLogger, get_service_logger
+
+# 프로세스 종료 시 모아 둔 last_activity 를 기록할 인스턴스 (stop() 을 부르지 않는 스크립트용)
+_LIVE_MANAGERS: "weakref.WeakSet[RoomManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_managers():
+    for manager in list(_LIVE_MANAGERS):
+        manager.flush_activity()
 
-class RoomManager:
-    """방 관리자 - 자동 감지 및 관리 기능"""
 
-    def __init__(self, db_path: str = None):
+class RoomManager:
+    """방 관리자 - 자동 감지 및 관리 기능
+
+    등록된 방 목록은 시작 시 메모리로 읽어 두고, 메시지마다 호출되는
+    :meth:`auto_register_room` 은 집합 조회만 한다. ``last_activity`` 는
+    메모리에 모았다가 ``flush_interval`` 마다 ``executemany`` 한 번으로
+    기록한다 (:meth:`start` 로 백그라운드 flush 시작). 새 방 등록은 즉시
+    DB 에 반영된다. 남은 활동 기록은 :meth:`stop` (또는 ``with`` 블록 종료)
+    에서, 그것도 없으면 프로세스 종료 시 기록된다.
+
+    방 설정은 :class:`RoomSettingsStore` (``self.settings``) 가 파싱된 상태로
+    캐시하며, 다른 프로세스(대시보드)의 변경도 신호 파일로 전달받아 바뀐
+    방만 다시 읽는다.
+    """
+
+    def __init__(self, db_path: str = None, flush_interval: float = 10.0,
+                 logger: Optional[ServiceLogger] = None, settings: Optional[RoomSettingsStore] = None):
         self.db_path = db_path or "data/rooms.db"
-        self.logger = get_service_logger("room_manager")
+        self.logger = logger or get_service_logger("room_manager")
         self.monitored_rooms: Set[int] = set()
+        self.flush_interval = flush_interval
+        self._rooms: Dict[int, str] = {}
+        self._pending_activity: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
         self._init_database()
+        self._load_registry()
+        self.settings = settings or RoomSettingsStore(self.db_path)
+        _LIVE_MANAGERS.add(self)
+
+    def __enter__(self) -> "RoomManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
 
     def _init_database(self):
         """방 관리 데이터베이스 초기화"""
@@ -46,40 +88,54 @@ class RoomManager:
                 CREATE INDEX IF NOT EXISTS idx_room_activity ON room_registry (last_activity);
             """)
 
+    def _load_registry(self):
+        """등록된 방 목록을 메모리로 읽기"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT id, status FROM room_registry").fetchall()
+        with self._lock:
+            self._rooms = {room_id: status for room_id, status in rows}
+
+    def is_registered(self, room_id: int) -> bool:
+        return room_id in self._rooms
+
     def auto_register_room(self, room_id: int, room_name: str, initial_settings: Dict = None) -> bool:
         """방 자동 등록 (IRIS 이벤트 수신 시)"""
+        if room_id in self._rooms:
+            # 마지막 활동 시간은 모아서 주기적으로 기록
+            with self._lock:
+                self._pending_activity[room_id] = _utc_timestamp()
+            self.monitored_rooms.add(room_id)
+            return True
+
         try:
             with sqlite3.connect(self.db_path) as conn:
-                # 이미 등록된 방인지 확인
-                existing = conn.execute(
-                    "SELECT id FROM room_registry WHERE id = ?", (room_id,)
-                ).fetchone()
+                # 신규 방 등록 (다른 프로세스가 먼저 등록했을 수 있음)
+                cursor = conn.execute("""
+                    INSERT OR IGNORE INTO room_registry (id, name, status)
+                    VALUES (?, ?, 'active')
+                """, (room_id, room_name))
 
-                if existing:
-                    # 마지막 활동 시간 업데이트
+                created = bool(cursor.rowcount)
+                if created:
+                    self.logger.info(f"신규 방 등록: {room_id} ({room_name})")
+                    status = "active"
+                else:
                     conn.execute(
                         "UPDATE room_registry SET last_activity = CURRENT_TIMESTAMP WHERE id = ?",
                         (room_id,)
                     )
-                    self.logger.info(f"방 활동 업데이트: {room_id} ({room_name})")
-                else:
-                    # 신규 방 등록
-                    conn.execute("""
-                        INSERT INTO room_registry (id, name, status)
-                        VALUES (?, ?, 'active')
-                    """, (room_id, room_name))
-
-                    # 초기 설정 저장
-                    if initial_settings:
-                        conn.execute("""
-                            INSERT INTO room_settings (room_id, settings_json)
-                            VALUES (?, ?)
-                        """, (room_id, json.dumps(initial_settings)))
+                    status = conn.execute(
+                        "SELECT status FROM room_registry WHERE id = ?", (room_id,)
+                    ).fetchone()[0]
 
-                    self.logger.info(f"신규 방 등록: {room_id} ({room_name})")
+            # 초기 설정 저장
+            if created and initial_settings:
+                self.settings.update(room_id, initial_settings)
 
-                self.monitored_rooms.add(room_id)
-                return True
+            with self._lock:
+                self._rooms[room_id] = status
+            self.monitored_rooms.add(room_id)
+            return True
 
         except Exception as e:
             self.logger.log_error_with_context(
@@ -88,38 +144,87 @@ class RoomManager:
             )
             return False
 
+    def flush_activity(self) -> int:
+        """모아 둔 last_activity 를 한 번에 기록하고 기록한 방 수를 반환"""
+        with self._lock:
+            pending, self._pending_activity = self._pending_activity, {}
+        if not pending:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "UPDATE room_registry SET last_activity = ? WHERE id = ?",
+                    [(stamp, room_id) for room_id, stamp in pending.items()]
+                )
+        except Exception as e:
+            # 실패한 항목은 다음 주기에 다시 시도 (그 사이 더 최신 값이 있으면 그것을 유지)
+            with self._lock:
+                for room_id, stamp in pending.items():
+                    self._pending_activity.setdefault(room_id, stamp)
+            self.logger.error(f"방 활동 기록 실패: {e}")
+            return 0
+        return len(pending)
+
+    def start(self):
+        """백그라운드 last_activity flush 및 방 설정 변경 감시 시작"""
+        self.settings.start()
+        if self._flusher is not None or self.flush_interval <= 0:
+            return
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="room-activity", daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        """flush 스레드 종료 후 남은 활동 기록"""
+        self.settings.stop()
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+            self._flusher = None
+        self.flush_activity()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush_activity()
+
     def get_active_rooms(self) -> List[Dict]:
         """활성 방 목록 조회"""
+        self.flush_activity()
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
-                    SELECT r.*, s.settings_json
+                    SELECT r.*
                     FROM room_registry r
-                    LEFT JOIN room_settings s ON r.id = s.room_id
                     WHERE r.status = 'active'
                     ORDER BY r.last_activity DESC
                 """)
-                return [dict(row) for row in cursor.fetchall()]
+                rooms = [dict(row) for row in cursor.fetchall()]
+            # 설정은 캐시에서 파싱된 dict 로 붙인다 (settings_json 은 하위 호환용)
+            for room in rooms:
+                settings = self.settings.get(room["id"])
+                room["settings"] = dict(settings)
+                room["settings_json"] = json.dumps(settings, ensure_ascii=False) if settings else None
+            return rooms
         except Exception as e:
             self.logger.error(f"활성 방 조회 실패: {e}")
             return []
 
+    def get_room_settings(self, room_id: int) -> Dict:
+        """방 설정 조회 (없으면 빈 dict, 메모리 캐시)"""
+        return self.settings.get(room_id)
+
     def update_room_settings(self, room_id: int, settings: Dict) -> bool:
         """방 설정 업데이트"""
         try:
+            version = self.settings.update(room_id, settings)
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO room_settings (room_id, settings_json)
-                    VALUES (?, ?)
-                """, (room_id, json.dumps(settings)))
-
                 conn.execute(
                     "UPDATE room_registry SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                     (room_id,)
                 )
 
-                self.logger.info(f"방 설정 업데이트: {room_id}")
+                self.logger.info(f"방 설정 업데이트: {room_id} (version {version})")
                 return True
 
         except Exception as e:
@@ -134,6 +239,9 @@ class RoomManager:
                     "UPDATE room_registry SET status = 'inactive' WHERE id = ?",
                     (room_id,)
                 )
+                with self._lock:
+                    if room_id in self._rooms:
+                        self._rooms[room_id] = "inactive"
 
                 self.monitored_rooms.discard(room_id)
                 self.logger.info(f"방 비활성화: {room_id}")
@@ -204,7 +312,7 @@ class RoomManager:
                     {
                         "id": room["id"],
                         "name": room["name"],
-                        "settings": json.loads(room.get("settings_json", "{}"))
+                        "settings": room["settings"]
                     }
                     for room in rooms
                 ],
@@ -226,6 +334,11 @@ class RoomManager:
             return False
 
 
+def _utc_timestamp() -> str:
+    """SQLite CURRENT_TIMESTAMP 와 같은 형식의 UTC 시각"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
 # 샘플 설정 파일 생성
 def create_sample_room_config():
     """샘플 방 설정 파일 생성"""
@@ -0,0 +1,193 @@
+"""방 설정 캐시 - 파싱된 설정을 버전과 함께 메모리에 보관하고 변경을 전파한다."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import ServiceLogger, get_service_logger
+
+SettingsListener = Callable[[int, Dict[str, Any]], None]
+
+
+class RoomSettingsStore:
+    """``room_settings`` 테이블의 메모리 캐시
+
+    행마다 전역 단조 증가 ``version`` 을 기록하므로, 변경 신호를 받으면
+    ``version > 마지막으로 본 버전`` 인 방만 다시 읽는다. 쓰기 쪽(대시보드 등
+    다른 프로세스 포함)은 :meth:`update` 후 신호 파일(``<db>.settings.signal``)
+    을 갱신하고, 봇 프로세스의 감시 스레드(:meth:`start`)가 mtime 변화를 보고
+    :meth:`refresh` 한다. :meth:`get`/:meth:`feature` 는 dict 조회만 한다.
+
+    감시 스레드 없이 쓰는 인스턴스(대시보드 등)는 조회 시 ``poll_interval``
+    마다 한 번 DB 의 최신 버전을 확인해, 다른 프로세스의 변경을 놓치지 않는다.
+    """
+
+    def __init__(self, db_path: str, poll_interval: float = 1.0, logger: Optional[ServiceLogger] = None):
+        self.db_path = db_path
+        self.signal_path = Path(f"{db_path}.settings.signal")
+        self.poll_interval = poll_interval
+        self.logger = logger or get_service_logger("room_settings")
+        self.version = 0
+        self._loaded = False
+        self._settings: Dict[int, Dict[str, Any]] = {}
+        self._listeners: List[SettingsListener] = []
+        self._lock = threading.Lock()
+        self._signal_mtime = 0
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._init_schema()
+        self.refresh()
+        self._checked_at = time.monotonic()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_schema(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS room_settings (
+                    room_id INTEGER PRIMARY KEY,
+                    settings_json TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(room_settings)")}
+            if "version" not in columns:
+                conn.execute("ALTER TABLE room_settings ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_room_settings_version ON room_settings (version)")
+
+    # ------------------------------------------------------------------
+    # 조회 (hot path)
+    # ------------------------------------------------------------------
+    def get(self, room_id: int) -> Dict[str, Any]:
+        if self._watcher is None:
+            self._refresh_if_stale()
+        return self._settings.get(room_id, {})
+
+    def feature(self, room_id: int, key: str, default: Any = None) -> Any:
+        if self._watcher is None:
+            self._refresh_if_stale()
+        return self._settings.get(room_id, {}).get(key, default)
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        if self._watcher is None:
+            self._refresh_if_stale()
+        return dict(self._settings)
+
+    def _refresh_if_stale(self):
+        """감시 스레드가 없을 때 ``poll_interval`` 마다 DB 버전을 확인해 갱신"""
+        now = time.monotonic()
+        if now - self._checked_at < self.poll_interval:
+            return
+        self._checked_at = now
+        try:
+            with self._connect() as conn:
+                latest = conn.execute("SELECT COALESCE(MAX(version), 0) FROM room_settings").fetchone()[0]
+            if latest > self.version:
+                self.refresh()
+        except sqlite3.Error as e:
+            self.logger.warning(f"방 설정 버전 확인 실패: {e}")
+
+    # ------------------------------------------------------------------
+    # 변경
+    # ------------------------------------------------------------------
+    def subscribe(self, listener: SettingsListener) -> None:
+        """설정이 바뀐 방마다 ``listener(room_id, settings)`` 를 호출한다."""
+        self._listeners.append(listener)
+
+    def update(self, room_id: int, settings: Dict[str, Any]) -> int:
+        """설정을 저장하고 새 버전을 반환한다."""
+        conn = self._connect()
+        try:
+            # 여러 프로세스가 같은 버전을 받지 않도록 쓰기 잠금을 먼저 잡는다.
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM room_settings").fetchone()[0]
+            conn.execute("""
+                INSERT INTO room_settings (room_id, settings_json, version, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(room_id) DO UPDATE SET
+                    settings_json = excluded.settings_json,
+                    version = excluded.version,
+                    updated_at = excluded.updated_at
+            """, (room_id, json.dumps(settings, ensure_ascii=False), version))
+            conn.commit()
+        finally:
+            conn.close()
+        self._notify()
+        self.refresh()
+        return version
+
+    def refresh(self) -> List[int]:
+        """마지막으로 본 버전 이후 바뀐 방만 다시 읽고, 바뀐 방 id 목록을 반환한다."""
+        with self._lock:
+            # 첫 로드(version 0)는 버전 컬럼 도입 이전 행(version = 0)까지 포함한다.
+            condition = "version > ?" if self._loaded else "version >= ?"
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT room_id, settings_json, version FROM room_settings WHERE {condition} ORDER BY version",
+                    (self.version,)
+                ).fetchall()
+            self._loaded = True
+            if not rows:
+                return []
+            settings = dict(self._settings)
+            changed: List[int] = []
+            for room_id, settings_json, version in rows:
+                try:
+                    settings[room_id] = json.loads(settings_json) if settings_json else {}
+                except json.JSONDecodeError:
+                    self.logger.warning(f"방 설정 JSON 파싱 실패: {room_id}")
+                    settings[room_id] = {}
+                changed.append(room_id)
+                self.version = max(self.version, version)
+            self._settings = settings
+        for room_id in changed:
+            for listener in self._listeners:
+                try:
+                    listener(room_id, settings[room_id])
+                except Exception as e:
+                    self.logger.error(f"방 설정 변경 알림 실패: {e}")
+        return changed
+
+    def _notify(self):
+        try:
+            self.signal_path.parent.mkdir(parents=True, exist_ok=True)
+            self.signal_path.touch()
+        except OSError as e:
+            self.logger.warning(f"방 설정 변경 신호 기록 실패: {e}")
+
+    # ------------------------------------------------------------------
+    # 변경 감시
+    # ------------------------------------------------------------------
+    def start(self):
+        if self._watcher is not None or self.poll_interval <= 0:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="room-settings", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                mtime = self.signal_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if mtime == self._signal_mtime:
+                continue
+            self._signal_mtime = mtime
+            try:
+                changed = self.refresh()
+            except Exception as e:
+                self.logger.error(f"방 설정 갱신 실패: {e}")
+                continue
+            if changed:
+                self.logger.info("방 설정 갱신", rooms=",".join(str(room_id) for room_id in changed), version=self.version)
@@ -2,45 +2,196 @@
 
 from __future__ import annotations
 
-import json
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 try:
     from iris import ChatContext
 except ImportError:  # pragma: no cover
     ChatContext = Any  # type: ignore
 
+from src.services.welcome_templates import DEFAULT_TEXT, TemplateRegistry, WelcomeTemplate
+from src.utils.logger import ServiceLogger, get_service_logger
+
+SendFunc = Callable[[str], Any]
+SettingsProvider = Callable[[int], Dict[str, Any]]
+
+
+@dataclass
+class _JoinBurst:
+    """한 방의 coalescing 창 안에서 모인 입장자 목록"""
+
+    template: WelcomeTemplate
+    room_name: str
+    send: SendFunc
+    max_names: int
+    names: List[str] = field(default_factory=list)
+    timer: Optional[threading.Timer] = None
+
 
 class WelcomeHandler:
-    """템플릿 로딩과 자동 응답 메시지를 준비한다."""
+    """템플릿 로딩과 자동 응답 메시지를 준비한다.
 
-    def __init__(self, template_dir: Path) -> None:
-        self.template_dir = Path(template_dir)
-        self.template_dir.mkdir(parents=True, exist_ok=True)
+    :meth:`handle_join` 은 방별 coalescing 창을 지원한다. 조용한 방의 첫 입장은
+    바로 환영하고, 창(``welcome_coalesce_seconds``) 안에 이어진 입장은 모아서
+    창이 끝날 때 한 번에 환영한다. 링크 공유로 입장이 몰려도 창마다 최대 한 건만
+    전송된다. 창 길이와 이름 표시 개수(``welcome_max_names``)는 RoomManager 의
+    방 설정으로 방마다 바꿀 수 있다.
+
+    템플릿은 :class:`TemplateRegistry` 가 미리 읽어 컴파일해 두므로 입장
+    처리 경로에서는 파일 I/O 가 없다. 방 전용 템플릿(``<room_id>.json``),
+    방 설정의 ``welcome_template``, ``default`` 순서로 고른다.
+    """
 
-    def _load_template(self, room_id: int) -> Dict[str, Any]:
-        room_template = self.template_dir / f"{room_id}.json"
-        default_template = self.template_dir / "default.json"
-        target = room_template if room_template.exists() else default_template
+    _FALLBACK = WelcomeTemplate.compile("builtin", {"auto_reply": DEFAULT_TEXT})
 
-        if target.exists():
-            return json.loads(target.read_text(encoding="utf-8"))
+    def __init__(
+        self,
+        template_dir: Path,
+        settings_provider: Optional[SettingsProvider] = None,
+        coalesce_window: float = 10.0,
+        max_names: int = 10,
+        templates: Optional[TemplateRegistry] = None,
+        logger: Optional[ServiceLogger] = None,
+    ) -> None:
+        self.template_dir = Path(template_dir)
+        self.templates = templates or TemplateRegistry(self.template_dir)
+        self.settings_provider = settings_provider
+        self.coalesce_window = coalesce_window
+        self.max_names = max_names
+        self.logger = logger or get_service_logger("welcome_handler")
+        self._bursts: Dict[int, _JoinBurst] = {}
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.coalesced = 0
 
-        # 기본 텍스트 템플릿 초기화
-        default_template.write_text(
-            json.dumps({"auto_reply": "환영합니다! 채팅방 규칙을 확인해주세요."}, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+    def _resolve_template(self, room_id: int, settings: Dict[str, Any]) -> WelcomeTemplate:
+        templates = self.templates
+        return (
+            templates.get(str(room_id))
+            or templates.get(str(settings.get("welcome_template") or "default"))
+            or templates.get("default")
+            or self._FALLBACK
         )
-        return {"auto_reply": "환영합니다! 채팅방 규칙을 확인해주세요."}
 
-    def prepare_welcome_payload(self, chat: ChatContext) -> Dict[str, Any]:
+    def prepare_welcome_payload(self, chat: ChatContext, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """환영 템플릿과 신규 멤버 메타 정보를 결합한다."""
-        template = self._load_template(int(chat.room.id))
+        room_id = int(chat.room.id)
+        if settings is None:
+            settings = self._room_settings(room_id)
+        template = self._resolve_template(room_id, settings)
+        name = getattr(chat.sender, "name", None)
+        room_name = getattr(chat.room, "name", "") or ""
         return {
-            "auto_reply": template.get("auto_reply"),
+            "auto_reply": template.render(user_name=name or "", room_name=room_name) if template.text else None,
+            "template": template.name,
             "member": {
                 "id": int(chat.sender.id),
-                "name": getattr(chat.sender, "name", None),
+                "name": name,
             },
         }
+
+    def handle_join(self, chat: ChatContext, send: SendFunc) -> Dict[str, Any]:
+        """입장 이벤트를 처리한다. 환영 메시지는 즉시 보내거나 창이 끝날 때 묶어서 보낸다.
+
+        반환 payload 의 ``welcome`` 값은 ``sent``/``coalesced``/``disabled``/``none`` 중 하나다.
+        """
+        room_id = int(chat.room.id)
+        settings = self._room_settings(room_id)
+        payload = self.prepare_welcome_payload(chat, settings)
+        if not payload.get("auto_reply"):
+            payload["welcome"] = "none"
+            return payload
+        if settings.get("auto_welcome") is False:
+            payload["welcome"] = "disabled"
+            return payload
+
+        window = float(settings.get("welcome_coalesce_seconds", self.coalesce_window))
+        max_names = int(settings.get("welcome_max_names", self.max_names))
+        name = payload["member"]["name"] or str(payload["member"]["id"])
+        template = self._resolve_template(room_id, settings)
+        room_name = getattr(chat.room, "name", "") or ""
+        with self._lock:
+            burst = self._bursts.get(room_id)
+            if burst is not None:
+                burst.names.append(name)
+                burst.send = send
+                self.coalesced += 1
+                payload["welcome"] = "coalesced"
+                return payload
+            if window > 0:
+                self._bursts[room_id] = burst = _JoinBurst(
+                    template=template, room_name=room_name, send=send, max_names=max_names
+                )
+                self._start_window(room_id, burst, window, max_names)
+        self._send(room_id, send, template, room_name, [name], max_names)
+        payload["welcome"] = "sent"
+        return payload
+
+    def flush(self) -> None:
+        """모든 방의 대기 중인 환영 메시지를 즉시 보낸다 (종료 시 호출)."""
+        with self._lock:
+            bursts = list(self._bursts.items())
+            self._bursts.clear()
+        for room_id, burst in bursts:
+            if burst.timer is not None:
+                burst.timer.cancel()
+            if burst.names:
+                self._send(room_id, burst.send, burst.template, burst.room_name, burst.names, burst.max_names)
+
+    def _start_window(self, room_id: int, burst: _JoinBurst, window: float, max_names: int) -> None:
+        timer = threading.Timer(window, self._close_window, args=(room_id, burst, window, max_names))
+        timer.daemon = True
+        burst.timer = timer
+        timer.start()
+
+    def _close_window(self, room_id: int, burst: _JoinBurst, window: float, max_names: int) -> None:
+        with self._lock:
+            if self._bursts.get(room_id) is not burst:
+                return
+            names, burst.names = burst.names, []
+            if names:
+                # 입장이 계속되는 동안은 창을 이어서 연다.
+                self._start_window(room_id, burst, window, max_names)
+            else:
+                del self._bursts[room_id]
+        if names:
+            self._send(room_id, burst.send, burst.template, burst.room_name, names, max_names)
+
+    def _send(
+        self,
+        room_id: int,
+        send: SendFunc,
+        template: WelcomeTemplate,
+        room_name: str,
+        names: List[str],
+        max_names: int,
+    ) -> None:
+        text = template.render(self.member_text(names, max_names), room_name, len(names))
+        try:
+            send(text)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.log_error_with_context(error=exc, context={"operation": "welcome_send", "room_id": room_id})
+            return
+        self.sent += 1
+        if len(names) > 1:
+            self.logger.info("입장 환영 메시지 묶음 전송", room_id=room_id, members=len(names))
+
+    @staticmethod
+    def member_text(names: List[str], max_names: int = 10) -> str:
+        shown = names[: max(1, max_names)]
+        text = ", ".join(shown)
+        if len(names) > len(shown):
+            text += f" 외 {len(names) - len(shown)}명"
+        return text
+
+    def _room_settings(self, room_id: int) -> Dict[str, Any]:
+        if self.settings_provider is None:
+            return {}
+        try:
+            return self.settings_provider(room_id) or {}
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.log_error_with_context(error=exc, context={"operation": "welcome_settings", "room_id": room_id})
+            return {}
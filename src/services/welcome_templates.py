@@ -0,0 +1,181 @@
+"""환영 메시지 템플릿 레지스트리 - 한 번 읽고 미리 컴파일해 메모리에서 제공한다."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.utils.logger import ServiceLogger, get_service_logger
+
+DEFAULT_TEXT = "환영합니다! 채팅방 규칙을 확인해주세요."
+RELOAD_SIGNAL = ".reload"
+
+# {memberCount} 는 이전 템플릿 호환용 별칭이다 (방 인원수가 아니라 {joinCount}).
+_PLACEHOLDER = re.compile(r"\{(userName|memberName|roomName|joinCount|memberCount)\}")
+_ALIASES = {"memberName": "userName", "memberCount": "joinCount"}
+
+
+@dataclass
+class WelcomeTemplate:
+    """미리 분해된 환영 템플릿
+
+    ``parts`` 는 리터럴 문자열과 치환 키(``("userName",)`` 형태의 tuple)가
+    번갈아 들어 있어 렌더링 시 정규식이나 ``str.format`` 없이 join 만 한다.
+    자동 환영 문구는 기존과 같이 ``auto_reply`` 만 사용한다. ``{joinCount}``
+    (별칭 ``{memberCount}``)는 방 인원수가 아니라 이번 메시지로 함께 환영하는
+    입장자 수다.
+    """
+
+    name: str
+    text: str
+    parts: List[Union[str, Tuple[str]]] = field(default_factory=list)
+    image: Optional[str] = None
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def compile(cls, name: str, data: Dict[str, Any]) -> "WelcomeTemplate":
+        messages = data.get("messages") or {}
+        text = data.get("auto_reply") or ""
+        parts: List[Union[str, Tuple[str]]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(text):
+            if match.start() > position:
+                parts.append(text[position:match.start()])
+            key = match.group(1)
+            parts.append((_ALIASES.get(key, key),))
+            position = match.end()
+        if position < len(text):
+            parts.append(text[position:])
+        return cls(
+            name=name,
+            text=text,
+            parts=parts,
+            image=messages.get("image"),
+            settings=dict(data.get("settings") or {}),
+        )
+
+    def render(self, user_name: str = "", room_name: str = "", join_count: int = 1) -> str:
+        values = {"userName": user_name, "roomName": room_name, "joinCount": str(join_count)}
+        return "".join(part if isinstance(part, str) else values[part[0]] for part in self.parts)
+
+
+class TemplateRegistry:
+    """``template_dir`` 의 ``*.json`` 템플릿을 메모리에 보관한다.
+
+    :meth:`get` 은 dict 조회만 하며 파일 I/O 를 하지 않는다. :meth:`start` 로
+    띄운 감시 스레드가 ``poll_interval`` 마다 파일 mtime 을 확인해 바뀐
+    템플릿만 다시 읽고, 대시보드가 ``.reload`` 신호 파일을 갱신하면
+    (:meth:`request_reload`) 전체를 다시 읽는다.
+    """
+
+    def __init__(self, template_dir: Path, poll_interval: float = 2.0, logger: Optional[ServiceLogger] = None) -> None:
+        self.template_dir = Path(template_dir)
+        self.poll_interval = poll_interval
+        self.logger = logger or get_service_logger("welcome_templates")
+        self._templates: Dict[str, WelcomeTemplate] = {}
+        self._mtimes: Dict[str, int] = {}
+        self._broken: Dict[str, int] = {}
+        self._signal_mtime = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reloads = 0
+        self.template_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_default()
+        self.refresh(force=True)
+
+    @property
+    def signal_path(self) -> Path:
+        return self.template_dir / RELOAD_SIGNAL
+
+    def get(self, name: str) -> Optional[WelcomeTemplate]:
+        return self._templates.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._templates)
+
+    def refresh(self, force: bool = False) -> int:
+        """바뀐 템플릿만 다시 읽는다. 다시 읽은 파일 수를 반환한다."""
+        signal_mtime = self.signal_path.stat().st_mtime_ns if self.signal_path.exists() else 0
+        if signal_mtime != self._signal_mtime:
+            self._signal_mtime = signal_mtime
+            force = True
+        seen: Dict[str, int] = {}
+        for path in self.template_dir.glob("*.json"):
+            try:
+                seen[path.stem] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            changed = [name for name, mtime in seen.items() if force or self._mtimes.get(name) != mtime]
+            removed = [name for name in self._templates if name not in seen]
+            if not changed and not removed:
+                return 0
+            templates = dict(self._templates)
+            for name in removed:
+                templates.pop(name, None)
+                self._mtimes.pop(name, None)
+            reloaded = 0
+            for name in changed:
+                path = self.template_dir / f"{name}.json"
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, json.JSONDecodeError) as exc:
+                    # 편집 중인 파일 등은 이전 버전을 유지하고 다음 주기에 다시 시도한다.
+                    # 경고는 파일 mtime 마다 한 번만 남긴다.
+                    if self._broken.get(name) != seen[name]:
+                        self._broken[name] = seen[name]
+                        self.logger.warning("환영 템플릿을 읽을 수 없습니다.", template=name, error=str(exc))
+                    continue
+                self._broken.pop(name, None)
+                templates[name] = WelcomeTemplate.compile(name, data)
+                self._mtimes[name] = seen[name]
+                reloaded += 1
+            if not reloaded and not removed:
+                return 0
+            # dict 를 통째로 교체해 get() 이 락 없이 읽도록 한다.
+            self._templates = templates
+            self.reloads += 1
+        self.logger.info("환영 템플릿 갱신", reloaded=reloaded, removed=len(removed), total=len(templates))
+        return reloaded
+
+    def request_reload(self) -> None:
+        """다른 프로세스(대시보드)에서도 쓸 수 있는 전체 재로딩 신호"""
+        self.signal_path.touch()
+
+    def start(self) -> None:
+        if self._thread is not None or self.poll_interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="welcome-templates", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as exc:  # pylint: disable=broad-except
+                self.logger.log_error_with_context(error=exc, context={"operation": "template_refresh"})
+
+    def _ensure_default(self) -> None:
+        default_template = self.template_dir / "default.json"
+        if default_template.exists():
+            return
+        # 기본 텍스트 템플릿 초기화 (시작 시 한 번만)
+        default_template.write_text(
+            json.dumps({"auto_reply": DEFAULT_TEXT}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+
+__all__ = ["TemplateRegistry", "WelcomeTemplate", "DEFAULT_TEXT", "RELOAD_SIGNAL"]
@@ -0,0 +1,95 @@
+"""5필드 cron 표현식 파서 (분 시 일 월 요일)"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, tzinfo
+from typing import FrozenSet, Optional
+
+_MAX_YEARS = 5
+
+
+def _parse_field(field: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"invalid cron step: {field}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step != 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron field out of range: {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    """표준 cron 문법(``*``, 목록, 범위, ``/`` 간격)을 지원하는 표현식
+
+    일(day-of-month)과 요일(day-of-week)이 모두 지정되면 cron 과 동일하게
+    둘 중 하나만 일치해도 실행한다. 요일은 0(또는 7)이 일요일이다.
+    """
+
+    __slots__ = ("expression", "minutes", "hours", "days", "months", "weekdays", "_dom_any", "_dow_any")
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        self.weekdays = frozenset(day % 7 for day in _parse_field(fields[4], 0, 7))
+        self._dom_any = fields[2] == "*"
+        self._dow_any = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        dom = moment.day in self.days
+        dow = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._dom_any:
+            return dow
+        if self._dow_any:
+            return dom
+        return dom or dow
+
+    def next_after(self, after: datetime, tz: Optional[tzinfo] = None) -> datetime:
+        """``after`` 이후 첫 실행 시각을 반환한다.
+
+        ``after`` 가 timezone-aware 이면 ``tz``(없으면 시스템 로컬) 벽시계
+        기준으로 계산해 aware datetime 을, naive 이면 naive 를 반환한다.
+        """
+        aware = after.tzinfo is not None
+        local = after.astimezone(tz) if aware else after
+        moment = local.replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment.year + _MAX_YEARS
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            if not aware:
+                return moment
+            return moment.replace(tzinfo=tz) if tz is not None else moment.astimezone()
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+
+__all__ = ["CronExpression"]
@@ -0,0 +1,390 @@
+"""대용량 JSON 로그 검증/압축 보관 도구
+
+회전된 로그 파일(``app.log``, ``app.log.1``, ``*.gz`` ...)을 한 줄씩 스트리밍으로
+읽어 검증하고, 선택적으로 날짜별 gzip 보관 파일로 다시 쓴다. 파일 단위로
+프로세스 풀에서 병렬 처리한다.
+
+보관 파일은 ``<out>/<YYYY-MM-DD>/<원본 파일명>.jsonl.gz`` 이며 ``block_lines``
+줄마다 gzip member 를 새로 시작한다. 옆에 두는 ``.idx`` (JSON) 파일에 block 별
+압축 오프셋과 시각 범위를 기록하므로, 시간 구간 조회는 해당 block 만 풀어 읽는다.
+``<out>/index.json`` 은 모든 보관 파일의 요약이다. 다시 보관해도 기존 보관 파일을
+덮어쓰지 않고 새 줄만 이어 붙인다.
+
+사용 예::
+
+    python -m src.utils.log_archive validate logs/ --workers 4
+    python -m src.utils.log_archive compact logs/ --out archive/logs
+    python -m src.utils.log_archive query archive/logs --start 2025-11-01T10:00 --end 2025-11-01T11:00
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 은 선택 의존성
+    orjson = None
+
+REQUIRED_FIELDS = ("timestamp", "level", "logger", "message")
+INDEX_NAME = "index.json"
+SIDECAR_SUFFIX = ".idx"
+UNDATED = "undated"
+
+_loads: Callable[[bytes], Any] = orjson.loads if orjson is not None else json.loads
+
+
+@dataclass
+class FileStats:
+    """로그 파일 하나의 검증 결과"""
+
+    path: str
+    total_lines: int = 0
+    valid_lines: int = 0
+    invalid_lines: int = 0
+    bytes: int = 0
+    levels: Dict[str, int] = field(default_factory=dict)
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+    archived: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def validity_rate(self) -> float:
+        return (self.valid_lines / self.total_lines * 100) if self.total_lines > 0 else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["validity_rate"] = self.validity_rate
+        return data
+
+
+def _open_binary(path: Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def parse_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """유효한 구조화 로그 줄이면 dict, 아니면 None"""
+    try:
+        entry = _loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or any(key not in entry for key in REQUIRED_FIELDS):
+        return None
+    return entry
+
+
+def _partition(timestamp: Any) -> str:
+    if isinstance(timestamp, str) and len(timestamp) >= 10 and timestamp[4] == "-" and timestamp[7] == "-":
+        return timestamp[:10]
+    return UNDATED
+
+
+class _PartitionWriter:
+    """날짜 파티션 하나의 gzip 보관 파일 - ``block_lines`` 줄마다 gzip member 를 끊는다.
+
+    기존 보관 파일이 있으면 덮어쓰지 않고 gzip member 를 이어 붙이며 ``.idx`` 도
+    합친다. ``.idx`` 에는 마지막으로 보관한 원본 줄 수와 sha1 을 남겨, 같은 원본을
+    다시 보관하면 이미 보관한 앞부분은 건너뛰고 새로 늘어난 줄만 붙인다. 앞부분이
+    다르면 (회전되어 내용이 바뀐 파일) 전부 새 줄로 붙인다.
+    """
+
+    def __init__(self, path: Path, block_lines: int, level: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.sidecar = path.with_name(path.name + SIDECAR_SUFFIX)
+        self.block_lines = block_lines
+        self.level = level
+        previous: Dict[str, Any] = {}
+        if path.exists() and self.sidecar.exists():
+            previous = json.loads(self.sidecar.read_text(encoding="utf-8"))
+        self._file = open(path, "ab")
+        self.blocks: List[Dict[str, Any]] = list(previous.get("blocks", []))
+        self.levels: Dict[str, int] = dict(previous.get("levels", {}))
+        self.lines = int(previous.get("lines", 0))
+        self._buffer: List[bytes] = []
+        self._first: Optional[str] = None
+        self._last: Optional[str] = None
+        self._digest = hashlib.sha1()
+        self._seen = 0
+        self._skip_lines = int(previous.get("source_lines", 0))
+        self._skip_digest = previous.get("source_digest")
+        # 앞부분이 이미 보관된 것인지 확인될 때까지 줄을 임시 파일에 모아 둔다.
+        self._spool: Optional[IO[bytes]] = (
+            tempfile.SpooledTemporaryFile(max_size=8 << 20) if self._skip_lines else None
+        )
+
+    def write(self, raw: bytes, timestamp: str, level: str) -> None:
+        self._digest.update(raw + b"\n")
+        self._seen += 1
+        if self._spool is not None:
+            self._spool.write(raw + b"\n")
+            if self._seen == self._skip_lines:
+                self._resolve_prefix()
+            return
+        self._append(raw, timestamp, level)
+
+    def _resolve_prefix(self) -> None:
+        spool, self._spool = self._spool, None
+        if spool is None:
+            return
+        with spool:
+            if self._seen == self._skip_lines and self._digest.hexdigest() == self._skip_digest:
+                return  # 이미 보관한 줄
+            spool.seek(0)
+            for raw in spool:
+                raw = raw.rstrip(b"\n")
+                entry = parse_line(raw)
+                if entry is not None:
+                    self._append(raw, str(entry["timestamp"]), str(entry["level"]))
+
+    def _append(self, raw: bytes, timestamp: str, level: str) -> None:
+        self._buffer.append(raw)
+        if self._first is None or timestamp < self._first:
+            self._first = timestamp
+        if self._last is None or timestamp > self._last:
+            self._last = timestamp
+        self.levels[level] = self.levels.get(level, 0) + 1
+        if len(self._buffer) >= self.block_lines:
+            self._flush_block()
+
+    def _flush_block(self) -> None:
+        if not self._buffer:
+            return
+        offset = self._file.tell()
+        self._file.write(gzip.compress(b"\n".join(self._buffer) + b"\n", compresslevel=self.level, mtime=0))
+        self.blocks.append({
+            "offset": offset,
+            "length": self._file.tell() - offset,
+            "lines": len(self._buffer),
+            "first": self._first,
+            "last": self._last,
+        })
+        self.lines += len(self._buffer)
+        self._buffer = []
+        self._first = self._last = None
+
+    def close(self) -> Dict[str, Any]:
+        self._resolve_prefix()  # 원본이 이전보다 짧아졌으면 모은 줄을 새 줄로 붙인다.
+        self._flush_block()
+        self._file.close()
+        index = {
+            "file": self.path.name,
+            "lines": self.lines,
+            "levels": self.levels,
+            "first": min((block["first"] for block in self.blocks), default=None),
+            "last": max((block["last"] for block in self.blocks), default=None),
+            "blocks": self.blocks,
+            "source_lines": self._seen,
+            "source_digest": self._digest.hexdigest(),
+        }
+        self.sidecar.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+        return index
+
+
+def scan_file(path: Path, archive_dir: Optional[Path] = None, block_lines: int = 1000,
+              compress_level: int = 6) -> FileStats:
+    """파일을 스트리밍으로 검증한다. ``archive_dir`` 를 주면 유효한 줄을 날짜별로 보관한다."""
+    path = Path(path)
+    stats = FileStats(path=str(path))
+    writers: Dict[str, _PartitionWriter] = {}
+    levels = stats.levels
+    first = last = None
+    name = path.name[:-3] if path.suffix == ".gz" else path.name
+    try:
+        stats.bytes = path.stat().st_size
+        with _open_binary(path) as handle:
+            for raw in handle:
+                stats.total_lines += 1
+                raw = raw.strip()
+                if not raw:
+                    continue
+                entry = parse_line(raw)
+                if entry is None:
+                    stats.invalid_lines += 1
+                    continue
+                stats.valid_lines += 1
+                level = str(entry["level"])
+                levels[level] = levels.get(level, 0) + 1
+                timestamp = str(entry["timestamp"])
+                if first is None or timestamp < first:
+                    first = timestamp
+                if last is None or timestamp > last:
+                    last = timestamp
+                if archive_dir is not None:
+                    day = _partition(entry["timestamp"])
+                    writer = writers.get(day)
+                    if writer is None:
+                        writer = writers[day] = _PartitionWriter(
+                            Path(archive_dir) / day / f"{name}.jsonl.gz", block_lines, compress_level
+                        )
+                    writer.write(raw, timestamp, level)
+    except (OSError, EOFError, zlib.error) as exc:
+        stats.error = str(exc)
+    finally:
+        for writer in writers.values():
+            writer.close()
+            stats.archived.append(str(writer.path))
+    stats.first_timestamp, stats.last_timestamp = first, last
+    return stats
+
+
+def _scan_task(task: Tuple[str, Optional[str], int, int]) -> FileStats:
+    path, archive_dir, block_lines, compress_level = task
+    return scan_file(Path(path), Path(archive_dir) if archive_dir else None, block_lines, compress_level)
+
+
+def collect_log_files(paths: Iterable[Path]) -> List[Path]:
+    """디렉터리는 회전 파일까지 포함한 ``*.log*`` 로 펼친다 (큰 파일부터)."""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                p for p in path.rglob("*.log*")
+                if p.is_file() and not p.name.endswith((SIDECAR_SUFFIX, ".jsonl.gz"))
+            )
+        elif path.is_file():
+            files.append(path)
+    # 큰 파일을 먼저 넣어야 프로세스 풀의 마지막 대기 시간이 줄어든다.
+    return sorted(set(files), key=lambda p: p.stat().st_size, reverse=True)
+
+
+def process_files(paths: Iterable[Path], workers: Optional[int] = None, archive_dir: Optional[Path] = None,
+                  block_lines: int = 1000, compress_level: int = 6) -> List[FileStats]:
+    """파일별 :func:`scan_file` 을 프로세스 풀에서 실행한다 (``workers=1`` 이면 현재 프로세스)."""
+    files = collect_log_files(paths)
+    if archive_dir is not None:
+        names = [p.name[:-3] if p.suffix == ".gz" else p.name for p in files]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            # 보관 파일명은 원본 파일명을 따르므로 같은 이름끼리 덮어쓰게 된다.
+            raise ValueError(f"duplicate log file names: {', '.join(duplicates)}")
+    tasks = [(str(p), str(archive_dir) if archive_dir else None, block_lines, compress_level) for p in files]
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1 or len(tasks) <= 1:
+        results = [_scan_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_task, tasks))
+    if archive_dir is not None:
+        write_archive_index(Path(archive_dir))
+    return results
+
+
+def write_archive_index(archive_dir: Path) -> Dict[str, Any]:
+    """모든 ``.idx`` 를 모아 ``index.json`` 을 다시 만든다 (block 목록은 제외)."""
+    files = []
+    for sidecar in sorted(archive_dir.rglob(f"*{SIDECAR_SUFFIX}")):
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+        files.append({
+            "path": str(sidecar.parent.relative_to(archive_dir) / data["file"]),
+            "lines": data["lines"],
+            "levels": data["levels"],
+            "first": data["first"],
+            "last": data["last"],
+        })
+    index = {"files": files}
+    (archive_dir / INDEX_NAME).write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    return index
+
+
+def _read_block(handle: IO[bytes], offset: int, length: int) -> bytes:
+    handle.seek(offset)
+    return zlib.decompress(handle.read(length), 16 + zlib.MAX_WBITS)
+
+
+def query_archive(archive_dir: Path, start: Optional[str] = None, end: Optional[str] = None,
+                  level: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """``start <= timestamp < end`` 인 보관 로그를 읽는다 (ISO 문자열 비교).
+
+    ``index.json`` 으로 파일을, ``.idx`` 로 block 을 골라 겹치는 block 만 푼다.
+    """
+    archive_dir = Path(archive_dir)
+    index = json.loads((archive_dir / INDEX_NAME).read_text(encoding="utf-8"))
+
+    def overlaps(first: Optional[str], last: Optional[str]) -> bool:
+        if first is None or last is None:
+            return False
+        return (start is None or last >= start) and (end is None or first < end)
+
+    for item in index["files"]:
+        if not overlaps(item["first"], item["last"]):
+            continue
+        path = archive_dir / item["path"]
+        sidecar = json.loads(path.with_name(path.name + SIDECAR_SUFFIX).read_text(encoding="utf-8"))
+        with open(path, "rb") as handle:
+            for block in sidecar["blocks"]:
+                if not overlaps(block["first"], block["last"]):
+                    continue
+                for raw in _read_block(handle, block["offset"], block["length"]).splitlines():
+                    entry = _loads(raw)
+                    timestamp = str(entry["timestamp"])
+                    if start is not None and timestamp < start:
+                        continue
+                    if end is not None and timestamp >= end:
+                        continue
+                    if level and entry["level"] != level:
+                        continue
+                    yield entry
+
+
+def _print_stats(results: List[FileStats], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps([stats.to_dict() for stats in results], ensure_ascii=False, indent=2))
+        return
+    for stats in sorted(results, key=lambda s: s.path):
+        levels = " ".join(f"{name}={count}" for name, count in sorted(stats.levels.items()))
+        print(
+            f"{stats.path}: {stats.valid_lines}/{stats.total_lines} valid, {stats.invalid_lines} invalid, "
+            f"{stats.first_timestamp or '-'} ~ {stats.last_timestamp or '-'} [{levels}]"
+            + (f" ERROR: {stats.error}" if stats.error else "")
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JSON 로그 검증/압축 보관 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("validate", "로그 파일 검증"), ("compact", "날짜별 gzip 보관 파일로 다시 쓰기")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("paths", nargs="+", type=Path, help="로그 파일 또는 디렉터리")
+        cmd.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+        cmd.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+        if name == "compact":
+            cmd.add_argument("--out", type=Path, required=True, help="보관 디렉터리")
+            cmd.add_argument("--block-lines", type=int, default=1000, help="gzip block 당 줄 수")
+    query = sub.add_parser("query", help="보관 로그 시간 구간 조회")
+    query.add_argument("archive", type=Path)
+    query.add_argument("--start", default=None, help="시작 시각 (ISO, 포함)")
+    query.add_argument("--end", default=None, help="끝 시각 (ISO, 제외)")
+    query.add_argument("--level", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "query":
+        for entry in query_archive(args.archive, args.start, args.end, args.level):
+            print(json.dumps(entry, ensure_ascii=False))
+        return 0
+
+    archive_dir = args.out if args.command == "compact" else None
+    results = process_files(
+        args.paths,
+        workers=args.workers,
+        archive_dir=archive_dir,
+        block_lines=getattr(args, "block_lines", 1000),
+    )
+    _print_stats(results, args.json)
+    return 1 if any(stats.invalid_lines or stats.error for stats in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,441 @@
 """구조화된 로깅 시스템"""
 
+import atexit
+import contextvars
+import functools
+import importlib
+import inspect
 import json
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.utils.metrics import LatencyHistogram
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 은 선택 의존성
+    orjson = None
+
+
+# 포매터 기본 옵션 (configure_log_format 으로 변경)
+_FORMAT_OPTIONS: Dict[str, bool] = {
+    "include_location": True,
+    "include_thread": True,
+    "use_orjson": True,
+}
+
+
+def configure_log_format(include_location: bool = True, include_thread: bool = True, use_orjson: bool = True):
+    """이후 생성되는 StructuredFormatter 의 기본 필드/인코더 설정
+
+    ``include_location=False`` 면 module/function/line 을 기록하지 않고,
+    레코드 생성 시 호출 위치 탐색(findCaller)도 끈다. ``include_thread=False``
+    면 thread/process 필드와 그 수집을 끈다.
+    """
+    _FORMAT_OPTIONS.update(
+        include_location=include_location,
+        include_thread=include_thread,
+        use_orjson=use_orjson,
+    )
+    # logging 모듈 전역 스위치 - 비활성 필드는 LogRecord 생성 비용 자체를 없앤다.
+    logging._srcfile = os.path.normcase(logging.addLevelName.__code__.co_filename) if include_location else None
+    logging.logThreads = include_thread
+    logging.logProcesses = include_thread
+
+
+def _json_default(value: Any) -> str:
+    return str(value)
 
 
 class StructuredFormatter(logging.Formatter):
-    """구조화된 JSON 로그 포매터"""
+    """구조화된 JSON 로그 포매터
+
+    타임스탬프의 초 단위 앞부분을 캐시하고, orjson 이 있으면 사용한다.
+    위치(module/function/line)와 thread/process 필드는 선택적으로 뺄 수 있다.
+    """
+
+    def __init__(
+        self,
+        include_location: Optional[bool] = None,
+        include_thread: Optional[bool] = None,
+        use_orjson: Optional[bool] = None,
+        static_fields: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__()
+        options = _FORMAT_OPTIONS
+        self.include_location = options["include_location"] if include_location is None else include_location
+        self.include_thread = options["include_thread"] if include_thread is None else include_thread
+        use_orjson = options["use_orjson"] if use_orjson is None else use_orjson
+        self._orjson = orjson if use_orjson else None
+        self.static_fields = dict(static_fields or {})
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        """``datetime.isoformat`` 과 같은 로컬 시각 문자열 (초 단위 부분은 캐시)"""
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_prefix = datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+            self._cached_second = second
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}"
 
     def format(self, record: logging.LogRecord) -> str:
         """로그 레코드를 JSON 형식으로 포맷팅"""
         # 기본 로그 정보
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno,
-            "thread": record.thread,
-            "process": record.process
         }
-
-        # 예외 정보 추가
+        if self.include_location:
+            log_data["module"] = record.module
+            log_data["function"] = record.funcName
+            log_data["line"] = record.lineno
+        if self.include_thread:
+            log_data["thread"] = record.thread
+            log_data["process"] = record.process
+        if self.static_fields:
+            log_data.update(self.static_fields)
+
+        # 예외 정보 추가 (핸들러가 여러 개여도 한 번만 포맷)
         if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_data["exception"] = record.exc_text
 
         # 추가 필드가 있는 경우
-        if hasattr(record, 'extra_fields'):
-            log_data.update(record.extra_fields)
+        extra_fields = record.__dict__.get('extra_fields')
+        if extra_fields:
+            log_data.update(extra_fields)
 
         # 서비스 관련 필드가 있는 경우
-        if hasattr(record, 'service_fields'):
-            log_data.update(record.service_fields)
+        service_fields = record.__dict__.get('service_fields')
+        if service_fields:
+            log_data.update(service_fields)
+
+        if self._orjson is not None:
+            try:
+                return self._orjson.dumps(log_data, default=_json_default, option=self._orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            except TypeError:
+                pass  # 64비트 초과 정수 등은 표준 json 으로
+        return json.dumps(log_data, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+class _AsyncQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 큐에 넣기만 하는 핸들러 - 실제 핸들러(targets)는 리스너 스레드에서 실행"""
+
+    def __init__(self, backend: "AsyncLogBackend", targets: List[logging.Handler]):
+        super().__init__(backend.queue)
+        self.backend = backend
+        self.targets = targets
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 안에서만 전달하므로 포맷팅/복사하지 않는다.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # 전파(propagate)로 같은 레코드가 여러 로거의 큐 핸들러를 거칠 수 있어
+        # 레코드를 고치지 않고 (대상 핸들러, 레코드) 쌍으로 넣는다.
+        self.backend.put(record, self.targets)
+
+
+class _RoutingQueueListener(logging.handlers.QueueListener):
+    """레코드에 붙은 대상 핸들러로 전달하는 리스너"""
+
+    def enqueue_sentinel(self) -> None:
+        # 큐가 가득 차 있어도 종료 신호는 반드시 넣는다 (리스너가 비우는 중).
+        self.queue.put(self._sentinel)
+
+    def handle(self, item: Any) -> None:
+        targets, record = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    handler.handleError(record)
+
 
-        return json.dumps(log_data, ensure_ascii=False, separators=(',', ':'))
+class AsyncLogBackend:
+    """QueueHandler/QueueListener 기반 비동기 로깅 백엔드
+
+    호출 스레드는 레코드를 bounded 큐에 넣기만 하고, 포맷팅과 디스크 쓰기는
+    단일 리스너 스레드가 한다. 큐가 가득 차면 ERROR 미만 레코드는 버리고
+    ``dropped`` 를 센다. ERROR 이상은 ``error_timeout`` 초까지 기다린다.
+    """
+
+    def __init__(self, queue_size: int = 10_000, error_timeout: float = 1.0):
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self.error_timeout = error_timeout
+        self.listener = _RoutingQueueListener(self.queue)
+        self.enqueued = 0
+        self.dropped = 0
+        self._installed: List[logging.Logger] = []
+        self._lock = threading.Lock()
+
+    def put(self, record: logging.LogRecord, targets: List[logging.Handler]) -> None:
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put((targets, record), timeout=self.error_timeout)
+            else:
+                self.queue.put_nowait((targets, record))
+            self.enqueued += 1
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def install(self, logger: logging.Logger) -> None:
+        """로거의 기존 핸들러를 리스너로 옮기고 큐 핸들러 하나로 교체"""
+        targets = [handler for handler in logger.handlers if not isinstance(handler, _AsyncQueueHandler)]
+        if not targets:
+            return
+        queued = [handler for handler in logger.handlers if isinstance(handler, _AsyncQueueHandler)]
+        for handler in queued:
+            targets = handler.targets + targets
+        logger.handlers = [_AsyncQueueHandler(self, targets)]
+        if logger not in self._installed:
+            self._installed.append(logger)
+
+    def uninstall(self) -> None:
+        for logger in self._installed:
+            handlers: List[logging.Handler] = []
+            for handler in logger.handlers:
+                handlers.extend(handler.targets if isinstance(handler, _AsyncQueueHandler) else [handler])
+            logger.handlers = handlers
+        self._installed.clear()
+
+    def start(self) -> None:
+        self.listener.start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐에 쌓인 레코드가 모두 기록될 때까지 기다린다."""
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self) -> None:
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "async",
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+        }
+
+
+_async_backend: Optional[AsyncLogBackend] = None
+
+
+def enable_async_logging(queue_size: int = 10_000, error_timeout: float = 1.0) -> AsyncLogBackend:
+    """비동기 로깅 활성화 - 이미 만들어진 로거에도 적용된다."""
+    global _async_backend
+    if _async_backend is not None:
+        return _async_backend
+    backend = AsyncLogBackend(queue_size=queue_size, error_timeout=error_timeout)
+    backend.install(logging.getLogger())
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger):
+            backend.install(logger)
+    backend.start()
+    _async_backend = backend
+    atexit.register(disable_async_logging)
+    return backend
+
+
+def disable_async_logging() -> None:
+    """남은 레코드를 모두 기록하고 동기 로깅으로 되돌린다."""
+    global _async_backend
+    backend, _async_backend = _async_backend, None
+    if backend is None:
+        return
+    backend.stop()
+    backend.uninstall()
+
+
+def flush_logging(timeout: float = 5.0) -> bool:
+    """비동기 로깅 큐 비우기 (동기 모드면 즉시 True)"""
+    if _async_backend is None:
+        return True
+    return _async_backend.flush(timeout)
+
+
+def logging_stats() -> Dict[str, Any]:
+    if _async_backend is None:
+        return {"mode": "sync"}
+    return _async_backend.stats()
+
+
+_LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_ENTRY_OVERHEAD = 96  # dict/키 문자열 등 레코드당 대략적인 고정 비용 (bytes)
+
+
+class RingBufferHandler(logging.Handler):
+    """최근 로그를 메모리에 구조화된 dict 로 보관하는 핸들러
+
+    ``capacity`` 건과 ``max_bytes`` (메시지/필드 길이 기준 추정치) 중 먼저
+    닿는 쪽에서 오래된 항목부터 버린다. 레벨별 누적 카운터와 분 단위 버킷을
+    따로 유지하므로, 버퍼에서 밀려난 로그도 :meth:`counts` 의 집계에는
+    남는다. 대시보드는 파일을 읽는 대신 :meth:`query` 결과를 JSON 으로 받는다.
+    """
+
+    def __init__(self, capacity: int = 5000, max_bytes: int = 4 * 1024 * 1024,
+                 level: int = logging.INFO, bucket_seconds: int = 60, retention_seconds: int = 86400):
+        super().__init__(level)
+        self.capacity = max(1, int(capacity))
+        self.max_bytes = max(1, int(max_bytes))
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.retention_seconds = retention_seconds
+        self.entries: "deque[Dict[str, Any]]" = deque()
+        self.bytes = 0
+        self.evicted = 0
+        self.totals: Dict[str, int] = {name: 0 for name in _LEVEL_NAMES}
+        self._buckets: "deque[List[Any]]" = deque()  # [bucket_start, {level: count}]
+        self._formatter = StructuredFormatter(include_location=False, include_thread=False)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry: Dict[str, Any] = {}
+            size = _ENTRY_OVERHEAD
+            for key in ("extra_fields", "service_fields"):
+                fields = record.__dict__.get(key)
+                if fields:
+                    entry.update(fields)
+                    size += sum(len(str(value)) for value in fields.values())
+            message = record.getMessage()
+            level = record.levelname
+            entry.update(
+                ts=record.created,
+                timestamp=self._formatter._timestamp(record.created),
+                level=level,
+                logger=record.name,
+                message=message,
+            )
+            size += len(message)
+            if record.exc_info:
+                if not record.exc_text:
+                    record.exc_text = self._formatter.formatException(record.exc_info)
+                entry["exception"] = record.exc_text
+                size += len(record.exc_text)
+            entry["_size"] = size
+        except Exception:
+            self.handleError(record)
+            return
+
+        # Handler.handle() 가 self.lock 을 잡은 상태로 호출한다.
+        self.entries.append(entry)
+        self.bytes += size
+        while len(self.entries) > self.capacity or (self.bytes > self.max_bytes and len(self.entries) > 1):
+            self.bytes -= self.entries.popleft()["_size"]
+            self.evicted += 1
+
+        self.totals[level] = self.totals.get(level, 0) + 1
+        start = int(record.created) // self.bucket_seconds * self.bucket_seconds
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == start:
+            counts = buckets[-1][1]
+        else:
+            counts = {}
+            buckets.append([start, counts])
+            while buckets[0][0] < start - self.retention_seconds:
+                buckets.popleft()
+        counts[level] = counts.get(level, 0) + 1
+
+    def query(self, level: Optional[str] = None, logger: Optional[str] = None, contains: Optional[str] = None,
+              since: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """조건에 맞는 최근 로그 ``limit`` 건 (오래된 것부터)
+
+        ``level`` 은 최소 레벨, ``logger`` 는 로거 이름 접두사, ``contains`` 는
+        메시지의 대소문자 무시 부분 문자열, ``since`` 는 epoch 초다.
+        """
+        min_level = logging.getLevelName(level.upper()) if level else 0
+        if not isinstance(min_level, int):
+            raise ValueError(f"unknown log level: {level}")
+        needle = contains.lower() if contains else None
+        with self.lock:
+            snapshot = list(self.entries)
+        out: List[Dict[str, Any]] = []
+        for entry in reversed(snapshot):
+            if since is not None and entry["ts"] < since:
+                break
+            if min_level and logging.getLevelName(entry["level"]) < min_level:
+                continue
+            if logger and not entry["logger"].startswith(logger):
+                continue
+            if needle and needle not in entry["message"].lower():
+                continue
+            out.append({key: value for key, value in entry.items() if key != "_size"})
+            if len(out) >= limit:
+                break
+        out.reverse()
+        return out
+
+    def counts(self, window: Optional[float] = None, now: Optional[float] = None) -> Dict[str, int]:
+        """레벨별 로그 건수 - ``window`` 초 이내 (없으면 시작 이후 전체)"""
+        with self.lock:
+            if window is None:
+                return dict(self.totals)
+            cutoff = (time.time() if now is None else now) - window
+            result = {name: 0 for name in _LEVEL_NAMES}
+            for start, counts in reversed(self._buckets):
+                if start + self.bucket_seconds <= cutoff:
+                    break
+                for name, count in counts.items():
+                    result[name] = result.get(name, 0) + count
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "capacity": self.capacity,
+            "max_bytes": self.max_bytes,
+            "evicted": self.evicted,
+            "totals": dict(self.totals),
+        }
+
+
+_ring_buffer: Optional[RingBufferHandler] = None
+
+
+def enable_ring_buffer(capacity: int = 5000, max_bytes: int = 4 * 1024 * 1024,
+                       level: int = logging.INFO) -> RingBufferHandler:
+    """루트 로거에 메모리 링 버퍼를 붙인다 (이미 있으면 그대로 반환)."""
+    global _ring_buffer
+    if _ring_buffer is None:
+        _ring_buffer = RingBufferHandler(capacity=capacity, max_bytes=max_bytes, level=level)
+    root_logger = logging.getLogger()
+    attached = any(
+        handler is _ring_buffer or (isinstance(handler, _AsyncQueueHandler) and _ring_buffer in handler.targets)
+        for handler in root_logger.handlers
+    )
+    if not attached:
+        root_logger.addHandler(_ring_buffer)
+        if _async_backend is not None:
+            _async_backend.install(root_logger)
+    return _ring_buffer
+
+
+def get_ring_buffer() -> Optional[RingBufferHandler]:
+    return _ring_buffer
 
 
 class StructuredLogger:
@@ -72,6 +466,9 @@ class StructuredLogger:
         # 기존 핸들러 제거
         self.logger.handlers.clear()
 
+        # 디렉터리 생성 (파일 핸들러보다 먼저)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
         # 콘솔 핸들러 (간단한 포맷)
         console_handler = logging.StreamHandler(sys.stdout)
         console_formatter = logging.Formatter(
@@ -105,8 +502,8 @@ class StructuredLogger:
         error_handler.setLevel(logging.ERROR)
         self.logger.addHandler(error_handler)
 
-        # 디렉터리 생성
-        self.log_dir.mkdir(exist_ok=True)
+        if _async_backend is not None:
+            _async_backend.install(self.logger)
 
     def _log_with_extra(self, level: int, message: str, **kwargs):
         """추가 필드와 함께 로그 기록"""
@@ -134,18 +531,169 @@ class StructuredLogger:
         self._log_with_extra(logging.CRITICAL, message, **kwargs)
 
 
+class LogPolicy:
+    """샘플링/반복 억제/서비스별 레벨 정책 (runtime.json 의 ``logging`` 섹션)
+
+    - ``levels``: ``{"command_router": "WARNING"}`` 처럼 서비스별 최소 레벨
+    - ``sampling``: 이벤트 타입(log_event) 또는 메시지별 기록 비율(0~1).
+      카운터 기반이라 ``0.1`` 이면 정확히 10건 중 1건을 남긴다.
+    - ``rate_limit``: ``{"max_per_interval": 20, "interval": 60}`` - 같은
+      (레벨, 메시지)를 구간마다 최대 N건만 남기고, 다음 구간 첫 기록 전에
+      생략 건수 요약을 남긴다. ERROR 이상은 억제하지 않는다.
+    - ``timing``: :meth:`OperationTimings.configure` 로 전달 (실행 시간 집계)
+    """
+
+    def __init__(self):
+        self.levels: Dict[str, int] = {}
+        self.sampling: Dict[str, float] = {}
+        self.max_per_interval = 0
+        self.interval = 60.0
+        self.active = False
+        self.path: Optional[Path] = None
+        self._mtime = 0
+        self._sample_counts: Dict[str, int] = {}
+        self._windows: Dict[Any, List[float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def configure(self, config: Dict[str, Any]):
+        """정책을 교체하고 이미 만들어진 서비스 로거의 레벨도 갱신"""
+        levels = {
+            name: logging.getLevelName(str(level).upper())
+            for name, level in (config.get("levels") or {}).items()
+        }
+        rate_limit = config.get("rate_limit") or {}
+        with self._lock:
+            self.sampling = {key: max(0.0, min(1.0, float(rate))) for key, rate in (config.get("sampling") or {}).items()}
+            self.max_per_interval = int(rate_limit.get("max_per_interval", 0))
+            self.interval = float(rate_limit.get("interval", 60.0))
+            self._sample_counts.clear()
+            self._windows.clear()
+            self.active = bool(self.sampling) or self.max_per_interval > 0
+            previous, self.levels = self.levels, {name: level for name, level in levels.items() if isinstance(level, int)}
+        for name in set(previous) | set(self.levels):
+            self.apply_level(name, logging.getLogger(f"service.{name}"))
+        timings.configure(config.get("timing") or {})
+
+    def apply_level(self, service_name: str, logger: logging.Logger):
+        logger.setLevel(self.levels.get(service_name, logging.DEBUG))
+
+    def sample(self, key: str) -> Optional[float]:
+        """기록하면 샘플 비율, 건너뛰면 None"""
+        rate = self.sampling.get(key)
+        if rate is None or rate >= 1.0:
+            return 1.0
+        with self._lock:
+            count = self._sample_counts.get(key, 0) + 1
+            self._sample_counts[key] = count
+        if int(count * rate) != int((count - 1) * rate):
+            return rate
+        return None
+
+    def admit(self, level: int, message: str) -> Any:
+        """반복 억제 - 기록 가능하면 True, 아니면 False, 직전 구간 생략분이 있으면 그 건수(int)"""
+        if self.max_per_interval <= 0 or level >= logging.ERROR:
+            return True
+        now = time.monotonic()
+        key = (level, message)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = int(window[2]) if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 10_000:
+                    self._windows = {k: w for k, w in self._windows.items() if now - w[0] < self.interval}
+                return suppressed or True
+            if window[1] < self.max_per_interval:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+    # runtime.json 감시 -------------------------------------------------
+    def load(self, path: Path) -> bool:
+        """runtime.json 의 ``logging`` 섹션을 읽어 적용 (파일이 바뀌었을 때만)"""
+        self.path = Path(path)
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            config = json.loads(self.path.read_text(encoding="utf-8")).get("logging") or {}
+        except (OSError, ValueError) as e:
+            logging.getLogger(__name__).warning(f"runtime.json 로깅 설정을 읽을 수 없습니다: {e}")
+            return False
+        self.configure(config)
+        return True
+
+    def watch(self, path: Path, interval: float = 5.0):
+        """``interval`` 초마다 runtime.json 변경을 확인해 재시작 없이 적용"""
+        self.load(path)
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval):
+                self.load(self.path)
+
+        self._watcher = threading.Thread(target=_run, name="log-policy", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+log_policy = LogPolicy()
+
+
 class ServiceLogger:
-    """서비스별 로거 - 특정 서비스에 특화된 로깅"""
+    """서비스별 로거 - 특정 서비스에 특화된 로깅
+
+    레벨이 꺼져 있으면 extra dict 를 만들기 전에 반환하고, :data:`log_policy`
+    가 켜져 있으면 샘플링/반복 억제를 적용한다.
+    """
 
     def __init__(self, service_name: str, log_dir: str = "logs"):
         self.logger = StructuredLogger(f"service.{service_name}", log_dir, service_name)
         self.service_name = service_name
+        self._logger = self.logger.logger
+        log_policy.apply_level(service_name, self._logger)
+
+    def is_enabled(self, level: int) -> bool:
+        """비싼 로그 인자를 만들기 전에 확인하는 용도"""
+        return self._logger.isEnabledFor(level)
 
     def _log_with_extra(self, level: int, message: str, **kwargs):
-        """추가 필드와 함께 로그 기록"""
+        """추가 필드와 함께 로그 기록 (레벨 확인은 여기서 한 번만 한다)"""
+        if not self._logger.isEnabledFor(level):
+            return
+        if log_policy.active and not self._admit(level, message, message, kwargs):
+            return
         extra = {'extra_fields': kwargs} if kwargs else {}
         self.logger.log(level, message, extra=extra)
 
+    def _admit(self, level: int, message: str, sample_key: str, kwargs: Dict[str, Any]) -> bool:
+        """runtime.json 정책(샘플링, 반복 억제)을 통과하면 True"""
+        rate = log_policy.sample(sample_key)
+        if rate is None:
+            return False
+        if rate < 1.0:
+            kwargs["sample_rate"] = rate
+        admitted = log_policy.admit(level, message)
+        if admitted is False:
+            return False
+        if admitted is not True:
+            self.logger.log(level, f"반복 로그 생략: {message}", extra={'extra_fields': {"suppressed": admitted}})
+        return True
+
     def debug(self, message: str, **kwargs):
         """DEBUG 레벨 로그"""
         self._log_with_extra(logging.DEBUG, message, **kwargs)
@@ -168,6 +716,10 @@ class ServiceLogger:
 
     def log_event(self, event_type: str, room_id: str = None, user_id: str = None, **kwargs):
         """이벤트 로그 기록"""
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        if log_policy.active and not self._admit(logging.INFO, f"Event: {event_type}", event_type, kwargs):
+            return
         event_data = {
             "event_type": event_type,
             "service": self.service_name
@@ -183,6 +735,8 @@ class ServiceLogger:
 
     def log_performance(self, operation: str, duration_ms: float, **kwargs):
         """성능 로그 기록"""
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         perf_data = {
             "operation": operation,
             "duration_ms": duration_ms,
@@ -217,8 +771,14 @@ def get_service_logger(service_name: str) -> ServiceLogger:
 
 
 # 전역 로거 설정
-def setup_global_logging(log_level: str = "INFO", log_dir: str = "logs"):
-    """전역 로깅 시스템 설정"""
+def setup_global_logging(log_level: str = "INFO", log_dir: str = "logs", async_mode: bool = False,
+                         queue_size: int = 10_000, include_location: bool = True,
+                         ring_buffer_size: int = 5000):
+    """전역 로깅 시스템 설정 (``async_mode`` 면 큐 기반 비동기 로깅)
+
+    ``ring_buffer_size`` 가 0 보다 크면 최근 로그를 메모리 링 버퍼에도 보관한다.
+    """
+    configure_log_format(include_location=include_location)
     log_dir = Path(log_dir)
     log_dir.mkdir(exist_ok=True)
 
@@ -248,44 +808,256 @@ def setup_global_logging(log_level: str = "INFO", log_dir: str = "logs"):
     file_handler.setFormatter(StructuredFormatter())
     root_logger.addHandler(file_handler)
 
+    if ring_buffer_size > 0:
+        enable_ring_buffer(capacity=ring_buffer_size)
+
+    if async_mode:
+        enable_async_logging(queue_size=queue_size)
+    elif _async_backend is not None:
+        _async_backend.install(root_logger)
+
+
+# 실행 시간 집계
+class OperationTimings:
+    """연산별 실행 시간 히스토그램 (:func:`timed` / :func:`log_execution_time` 이 기록)
+
+    호출마다 로그를 남기는 대신 :class:`LatencyHistogram` 에 모으고,
+    :meth:`start` 로 띄운 스레드가 ``summary_interval`` 초마다 연산별 요약
+    (count/mean/p50/p90/p99/max/errors)을 한 줄씩 남긴 뒤 구간을 비운다.
+    :meth:`instrument` 는 ``"패키지.모듈:클래스.메서드"`` 를 실행 중에 감싸며,
+    runtime.json 의 ``logging.timing`` 섹션으로도 켜고 끌 수 있다.
+    """
+
+    def __init__(self, summary_interval: float = 60.0):
+        self.enabled = True
+        self.summary_interval = summary_interval
+        self.logger: Optional["ServiceLogger"] = None
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._instrumented: Dict[str, Tuple[Any, str, Any]] = {}
+        self._configured: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, operation: str, seconds: float, error: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                histogram = self._histograms[operation] = LatencyHistogram()
+            histogram.record(seconds)
+            if error:
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """현재 구간의 연산별 요약"""
+        with self._lock:
+            return {
+                operation: dict(histogram.snapshot(), errors=self._errors.get(operation, 0))
+                for operation, histogram in self._histograms.items()
+            }
 
-# 로그 데코레이터
-def log_execution_time(logger: ServiceLogger = None):
-    """함수 실행 시간 로깅 데코레이터"""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            function_name = f"{func.__module__}.{func.__name__}"
-
+    def emit_summary(self, logger: Optional["ServiceLogger"] = None) -> int:
+        """구간 요약을 기록하고 히스토그램을 비운다. 기록한 연산 수를 반환한다."""
+        summary = self.snapshot()
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
+        logger = logger or self.logger or get_service_logger("timing")
+        for operation, data in sorted(summary.items()):
+            logger.info("실행 시간 요약", operation=operation, window_seconds=self.summary_interval, **data)
+        return len(summary)
+
+    # 요약 스레드 -------------------------------------------------------
+    def start(self, interval: Optional[float] = None, logger: Optional["ServiceLogger"] = None):
+        if interval is not None:
+            self.summary_interval = interval
+        if logger is not None:
+            self.logger = logger
+        if self._thread is not None or self.summary_interval <= 0:
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(self.summary_interval):
+                try:
+                    self.emit_summary()
+                except Exception as e:
+                    logging.getLogger(__name__).warning(f"실행 시간 요약 실패: {e}")
+
+        self._thread = threading.Thread(target=_run, name="timing-summary", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """요약 스레드를 멈추고 남은 구간을 마지막으로 기록한다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+            self.emit_summary()
+
+    # 실행 중 계측 ------------------------------------------------------
+    def instrument(self, target: str, operation: Optional[str] = None) -> bool:
+        """``"모듈:속성.경로"`` 의 함수/메서드를 타이머로 감싼다 (이미 감쌌으면 False).
+
+        클래스 속성을 교체하므로 이후 조회되는 메서드에 적용된다. 이미 다른 곳에
+        바운드 메서드로 등록된 핸들러는 다시 등록해야 반영된다.
+        """
+        if target in self._instrumented:
+            return False
+        module_name, _, path = target.partition(":")
+        if not path:
+            raise ValueError(f"instrument target must be 'module:attr': {target}")
+        owner: Any = importlib.import_module(module_name)
+        *parents, name = path.split(".")
+        for part in parents:
+            owner = getattr(owner, part)
+        original = inspect.getattr_static(owner, name)
+        func = original.__func__ if isinstance(original, (staticmethod, classmethod)) else original
+        wrapped = timed(operation or f"{module_name}.{path}")(func)
+        if isinstance(original, (staticmethod, classmethod)):
+            wrapped = type(original)(wrapped)
+        setattr(owner, name, wrapped)
+        self._instrumented[target] = (owner, name, original)
+        return True
+
+    def uninstrument(self, target: str) -> bool:
+        entry = self._instrumented.pop(target, None)
+        if entry is None:
+            return False
+        owner, name, original = entry
+        setattr(owner, name, original)
+        return True
+
+    def configure(self, config: Dict[str, Any]):
+        """runtime.json ``logging.timing`` 적용 - enabled / summary_interval / instrument 목록
+
+        ``enabled`` 나 ``summary_interval`` 이 바뀌면 요약 스레드도 그에 맞춰
+        띄우거나 멈춘다 (시작 시 꺼져 있다가 나중에 켜는 경우 포함).
+        """
+        enabled = bool(config.get("enabled", True))
+        interval = float(config.get("summary_interval", self.summary_interval))
+        changed = enabled != self.enabled or interval != self.summary_interval
+        self.enabled = enabled
+        self.summary_interval = interval
+        if changed:
+            if enabled and interval > 0:
+                self.start()
+            else:
+                self.stop()
+        wanted = set(config.get("instrument") or [])
+        # 코드에서 직접 instrument() 한 대상은 건드리지 않는다.
+        for target in self._configured - wanted:
+            self.uninstrument(target)
+        self._configured &= wanted
+        for target in wanted - self._configured:
             try:
-                result = func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
-
-                if logger:
-                    logger.log_performance(
-                        operation=function_name,
-                        duration_ms=duration_ms,
-                        status="success"
-                    )
+                if self.instrument(target):
+                    self._configured.add(target)
+            except (ImportError, AttributeError, ValueError) as e:
+                logging.getLogger(__name__).warning(f"실행 시간 계측 대상을 찾을 수 없습니다: {target} ({e})")
+
+
+timings = OperationTimings()
+
+
+# ``with timed(...)`` 의 시작 시각 스택. 같은 timer 객체를 여러 스레드/태스크가
+# 동시에 써도 섞이지 않도록 인스턴스가 아니라 실행 컨텍스트마다 둔다.
+_TIMER_STARTS: contextvars.ContextVar[Tuple[float, ...]] = contextvars.ContextVar("timer_starts", default=())
+
+
+class _Timer:
+    """:func:`timed` 의 구현 - 데코레이터와 (async) 컨텍스트 매니저 겸용"""
+
+    def __init__(self, operation: Optional[str], logger: Optional["ServiceLogger"]):
+        self.operation = operation
+        self.logger = logger
+
+    def _finish(self, operation: str, started: float, error: Optional[BaseException] = None,
+                args: tuple = (), kwargs: Optional[dict] = None):
+        duration = time.perf_counter() - started
+        timings.record(operation, duration, error is not None)
+        if self.logger is None:
+            return
+        duration_ms = duration * 1000
+        if error is None:
+            self.logger.log_performance(operation=operation, duration_ms=duration_ms, status="success")
+        elif isinstance(error, Exception):
+            self.logger.log_error_with_context(
+                error=error,
+                context={
+                    "function": operation,
+                    "duration_ms": duration_ms,
+                    "args": str(args)[:200],
+                    "kwargs": str(kwargs)[:200]
+                }
+            )
+
+    def __enter__(self):
+        _TIMER_STARTS.set(_TIMER_STARTS.get() + (time.perf_counter(),))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        starts = _TIMER_STARTS.get()
+        _TIMER_STARTS.set(starts[:-1])
+        self._finish(self.operation or "block", starts[-1], exc)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, func):
+        operation = self.operation or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as e:
+                    self._finish(operation, started, e, args, kwargs)
+                    raise
+                self._finish(operation, started)
                 return result
+            return async_wrapper
 
-            except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
-
-                if logger:
-                    logger.log_error_with_context(
-                        error=e,
-                        context={
-                            "function": function_name,
-                            "duration_ms": duration_ms,
-                            "args": str(args)[:200],
-                            "kwargs": str(kwargs)[:200]
-                        }
-                    )
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                self._finish(operation, started, e, args, kwargs)
                 raise
-
+            self._finish(operation, started)
+            return result
         return wrapper
-    return decorator
+
+
+def timed(operation: Optional[str] = None, logger: Optional["ServiceLogger"] = None) -> _Timer:
+    """실행 시간을 :data:`timings` 히스토그램에 기록한다.
+
+    동기/async 함수 데코레이터(``@timed()``)와 컨텍스트 매니저
+    (``with timed("db.query"):`` / ``async with``) 모두로 쓸 수 있다.
+    ``logger`` 를 주면 호출마다 성능/오류 로그도 남긴다.
+    """
+    return _Timer(operation, logger)
+
+
+# 로그 데코레이터
+def log_execution_time(logger: ServiceLogger = None, operation: Optional[str] = None):
+    """함수 실행 시간 로깅 데코레이터 (동기/async 모두 지원)
+
+    실행 시간은 항상 :data:`timings` 에 집계된다. ``logger`` 를 주면 기존처럼
+    호출마다 성능 로그를, 예외 시 컨텍스트 오류 로그를 남긴다.
+    """
+    return timed(operation, logger)
 
 
 # 로그 검증기
@@ -304,37 +1076,25 @@ class LogValidator:
 
     @staticmethod
     def validate_log_file(file_path: Path) -> Dict[str, Any]:
-        """로그 파일 검증"""
+        """로그 파일 검증 (스트리밍 - 여러 파일/압축 보관은 ``src.utils.log_archive``)"""
+        from src.utils.log_archive import scan_file
+
         if not file_path.exists():
             return {"valid": False, "error": "File does not exist"}
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            total_lines = len(lines)
-            valid_lines = 0
-            invalid_lines = 0
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                if LogValidator.validate_json_log(line):
-                    valid_lines += 1
-                else:
-                    invalid_lines += 1
-
-            return {
-                "valid": invalid_lines == 0,
-                "total_lines": total_lines,
-                "valid_lines": valid_lines,
-                "invalid_lines": invalid_lines,
-                "validity_rate": (valid_lines / total_lines * 100) if total_lines > 0 else 0
-            }
-
-        except Exception as e:
-            return {"valid": False, "error": str(e)}
+        stats = scan_file(file_path)
+        if stats.error:
+            return {"valid": False, "error": stats.error}
+        return {
+            "valid": stats.invalid_lines == 0,
+            "total_lines": stats.total_lines,
+            "valid_lines": stats.valid_lines,
+            "invalid_lines": stats.invalid_lines,
+            "validity_rate": stats.validity_rate,
+            "levels": stats.levels,
+            "first_timestamp": stats.first_timestamp,
+            "last_timestamp": stats.last_timestamp,
+        }
 
 
 if __name__ == "__main__":
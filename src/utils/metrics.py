@@ -0,0 +1,179 @@
+"""경량 지표 유틸리티"""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+_SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+def _bucket_index(value: int) -> int:
+    """Log-linear bucket index: 8 sub-buckets per power of two (<= 12.5% error)."""
+    if value < 2 * _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift + 1) * _SUB_BUCKETS + (value >> shift) - _SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> int:
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index % _SUB_BUCKETS + _SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR 스타일 지연 시간 히스토그램 (마이크로초 단위, 고정 크기 배열)
+
+    실행기/전송 스레드 여러 개가 함께 기록하므로 갱신과 조회는 락으로 보호한다.
+    """
+
+    __slots__ = ("counts", "count", "total_us", "max_us", "_last", "_lock")
+
+    def __init__(self, max_seconds: float = 120.0) -> None:
+        self._lock = threading.Lock()
+        self._last = _bucket_index(int(max_seconds * 1_000_000))
+        self.counts: List[int] = [0] * (self._last + 1)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        """지연 시간(초)을 기록한다."""
+        value = int(seconds * 1_000_000)
+        # _bucket_index 를 인라인해 호출 비용을 줄인다 (hot path).
+        if value < 16:
+            if value < 0:
+                value = 0
+            index = value
+        else:
+            shift = value.bit_length() - 4
+            index = ((shift + 1) << 3) + (value >> shift) - 8
+            if index > self._last:
+                index = self._last
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_us += value
+            if value > self.max_us:
+                self.max_us = value
+
+    def percentile(self, q: float) -> float:
+        """백분위 지연 시간을 밀리초로 반환한다 (버킷 상한 기준)."""
+        with self._lock:
+            return self._percentile(q)
+
+    def _percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(self.count * q / 100.0)))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(_bucket_upper(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        # 두 락을 동시에 잡지 않도록 상대 값을 먼저 복사한다.
+        with other._lock:
+            counts = other.counts[: len(self.counts)]
+            count, total_us, max_us = other.count, other.total_us, other.max_us
+        with self._lock:
+            for index, bucket in enumerate(counts):
+                self.counts[index] += bucket
+            self.count += count
+            self.total_us += total_us
+            self.max_us = max(self.max_us, max_us)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (self._last + 1)
+            self.count = 0
+            self.total_us = 0
+            self.max_us = 0
+
+    def snapshot(self, percentiles: Optional[List[float]] = None) -> Dict[str, float]:
+        """요약 통계를 dict 로 반환한다."""
+        with self._lock:
+            data: Dict[str, float] = {
+                "count": self.count,
+                "mean_ms": (self.total_us / self.count / 1000.0) if self.count else 0.0,
+                "max_ms": self.max_us / 1000.0,
+            }
+            for q in percentiles or (50, 90, 99):
+                data[f"p{q:g}_ms"] = self._percentile(q)
+        return data
+
+
+RouteFunc = Callable[[Dict[str, List[str]]], Any]
+
+
+class MetricsServer:
+    """``/metrics`` 등 읽기 전용 엔드포인트를 제공하는 백그라운드 HTTP 서버
+
+    라우트 함수는 쿼리 파라미터 dict 를 받아 문자열(text/plain) 또는
+    JSON 직렬화 가능한 객체(application/json)를 반환한다.
+    """
+
+    def __init__(self, routes: Dict[str, RouteFunc], host: str = "127.0.0.1", port: int = 9108) -> None:
+        self.routes = dict(routes)
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> int:
+        """서버를 데몬 스레드에서 시작하고 실제 포트를 반환한다."""
+        routes = self.routes
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                parsed = urlparse(self.path)
+                route = routes.get(parsed.path.rstrip("/") or "/")
+                if route is None:
+                    self._send(404, "application/json", b'{"error":"not_found"}')
+                    return
+                try:
+                    body = route(parse_qs(parsed.query))
+                except Exception as exc:  # pylint: disable=broad-except
+                    payload = json.dumps({"error": repr(exc)}, ensure_ascii=False)
+                    self._send(500, "application/json", payload.encode("utf-8"))
+                    return
+                if isinstance(body, str):
+                    self._send(200, "text/plain; version=0.0.4; charset=utf-8", body.encode("utf-8"))
+                else:
+                    self._send(200, "application/json; charset=utf-8", json.dumps(body, ensure_ascii=False).encode("utf-8"))
+
+            def _send(self, code: int, content_type: str, body: bytes) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+__all__ = ["LatencyHistogram", "MetricsServer"]
@@ -0,0 +1,207 @@
+"""운영 중 켤 수 있는 샘플링 프로파일러와 이벤트 루프 지연 모니터"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.logger import ServiceLogger, get_service_logger
+from src.utils.metrics import LatencyHistogram
+
+MAX_PROFILE_SECONDS = 300.0
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 떠서 collapsed-stack 파일로 남긴다.
+
+    별도 데몬 스레드가 ``interval`` 초마다 :func:`sys._current_frames` 를 읽을
+    뿐 대상 스레드를 멈추거나 계측 코드를 넣지 않으므로, 샘플링 중에도 부하가
+    작고 (100Hz 기준 수 % 이하) 프로파일링이 끝나면 비용이 0 이다. 결과는
+    ``스레드;모듈:함수:줄;... 횟수`` 형식이라 flamegraph.pl / speedscope 에 바로
+    넣을 수 있다. 동시에 한 번만 실행된다.
+    """
+
+    def __init__(self, output_dir: Path, interval: float = 0.01, max_depth: int = 64,
+                 logger: Optional[ServiceLogger] = None):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.max_depth = max_depth
+        self.logger = logger or get_service_logger("profiler")
+        self.last_output: Optional[Path] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, duration: float, on_done: Optional[Callable[[Path], Any]] = None) -> Optional[Path]:
+        """``duration`` 초 동안 백그라운드에서 샘플링한다. 이미 실행 중이면 None."""
+        duration = max(0.1, min(float(duration), MAX_PROFILE_SECONDS))
+        with self._lock:
+            if self._thread is not None:
+                return None
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self._output_path()
+            self._thread = threading.Thread(
+                target=self._run, args=(duration, path, on_done), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        self.logger.info("샘플링 프로파일 시작", duration=duration, interval=self.interval, output=str(path))
+        return path
+
+    def _output_path(self) -> Path:
+        """밀리초까지 넣은 결과 파일 경로 (같은 밀리초에 겹치면 번호를 붙인다)"""
+        now = time.time()
+        stem = f"profile-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}"
+        path = self.output_dir / f"{stem}.collapsed"
+        counter = 1
+        while path.exists():
+            path = self.output_dir / f"{stem}-{counter}.collapsed"
+            counter += 1
+        return path
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self, duration: float, path: Path, on_done: Optional[Callable[[Path], Any]]) -> None:
+        try:
+            started = time.monotonic()
+            stacks, samples = self.sample(duration)
+            self.write(stacks, path)
+            self.last_output = path
+            self.logger.info(
+                "샘플링 프로파일 완료",
+                output=str(path),
+                samples=samples,
+                stacks=len(stacks),
+                elapsed=round(time.monotonic() - started, 3),
+            )
+            if on_done is not None:
+                on_done(path)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.log_error_with_context(error=exc, context={"operation": "profile", "output": str(path)})
+        finally:
+            with self._lock:
+                self._thread = None
+
+    def sample(self, duration: float) -> "tuple[collections.Counter, int]":
+        """현재 스레드에서 ``duration`` 초 동안 샘플링해 (스택별 횟수, 샘플 수)를 반환한다."""
+        stacks: collections.Counter = collections.Counter()
+        own = threading.get_ident()
+        deadline = time.monotonic() + duration
+        samples = 0
+        labels: Dict[Any, str] = {}
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None and len(parts) < self.max_depth:
+                    # 같은 (코드, 줄) 은 문자열을 다시 만들지 않는다.
+                    key = (frame.f_code, frame.f_lineno)
+                    label = labels.get(key)
+                    if label is None:
+                        label = labels[key] = _frame_label(frame)
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(parts))] += 1
+            samples += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(self.interval, remaining))
+        return stacks, samples
+
+    @staticmethod
+    def write(stacks: "collections.Counter", path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class EventLoopLagMonitor:
+    """이벤트 루프가 ``interval`` 마다 깨어나는 시각의 지연을 잰다.
+
+    루프를 막는 동기 호출이 있으면 sleep 이 늦게 끝나므로 그 초과 시간이
+    곧 지연이다. 히스토그램에 누적하고 ``warn_threshold`` 초를 넘으면 경고를
+    남긴다 (``warn_every`` 초에 한 번).
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.25, warn_every: float = 60.0,
+                 logger: Optional[ServiceLogger] = None):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.warn_every = warn_every
+        self.logger = logger or get_service_logger("event_loop")
+        self.histogram = LatencyHistogram()
+        self.last_lag = 0.0
+        self.slow = 0
+        self._last_warning = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        """실행 중인 루프에 감시 태스크를 띄운다."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="event-loop-lag")
+        return self._task
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - started - self.interval))
+
+    def record(self, lag: float) -> None:
+        self.last_lag = lag
+        self.histogram.record(lag)
+        if lag < self.warn_threshold:
+            return
+        self.slow += 1
+        now = time.monotonic()
+        if now - self._last_warning >= self.warn_every:
+            self._last_warning = now
+            self.logger.warning("이벤트 루프 지연", lag_ms=round(lag * 1000, 1), slow=self.slow)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(self.histogram.snapshot(), last_ms=self.last_lag * 1000, slow=self.slow)
+
+    def render_text(self, prefix: str = "iris_event_loop") -> str:
+        """Prometheus text exposition format."""
+        histogram = self.histogram
+        lines = [f"# TYPE {prefix}_lag_ms summary"]
+        for q in (0.5, 0.9, 0.99):
+            lines.append(f'{prefix}_lag_ms{{quantile="{q:g}"}} {histogram.percentile(q * 100):.3f}')
+        lines.append(f"{prefix}_lag_ms_sum {histogram.total_us / 1000.0:.3f}")
+        lines.append(f"{prefix}_lag_ms_count {histogram.count}")
+        lines.append(f"# TYPE {prefix}_slow_total counter")
+        lines.append(f"{prefix}_slow_total {self.slow}")
+        return "\n".join(lines) + "\n"
+
+
+__all__ = ["EventLoopLagMonitor", "SamplingProfiler", "MAX_PROFILE_SECONDS"]
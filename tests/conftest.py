@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from src.utils.logger import ServiceLogger
+
+
+@pytest.fixture()
+def service_logger(tmp_path: Path) -> Callable[[str], ServiceLogger]:
+    """서비스 로그를 저장소의 ``logs/`` 대신 ``tmp_path`` 아래에 남기는 로거 팩토리"""
+    log_dir = str(tmp_path / "logs")
+    return lambda name: ServiceLogger(name, log_dir=log_dir)
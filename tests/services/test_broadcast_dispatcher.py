@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from src.services.broadcast_dispatcher import BroadcastDispatcher
+from src.services.broadcast_scheduler import BroadcastScheduler
+from src.services.outbound_dispatcher import OutboundDispatcher
+from src.services.rate_limiter import RateLimit
+
+
+class FlakySender:
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = set(failing)
+        self.sent: List[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, channel: str, payload: Dict[str, Any]) -> str:
+        if channel in self.failing:
+            self.failing.discard(channel)
+            raise RuntimeError(f"send failed: {channel}")
+        with self._lock:
+            self.sent.append(channel)
+        return "ok"
+
+
+@pytest.fixture()
+def scheduler(tmp_path: Path, service_logger) -> BroadcastScheduler:
+    return BroadcastScheduler(tmp_path / "queue.sqlite", retry_backoff=0, logger=service_logger("broadcast_scheduler"))
+
+
+@pytest.fixture()
+def make_dispatcher(scheduler: BroadcastScheduler, service_logger):
+    def make(send, **kwargs) -> BroadcastDispatcher:
+        kwargs.setdefault("room_interval", 0)
+        return BroadcastDispatcher(
+            scheduler, send, worker_id="worker", logger=service_logger("broadcast_dispatcher"), **kwargs
+        )
+
+    return make
+
+
+def _run_once(dispatcher: BroadcastDispatcher, scheduler: BroadcastScheduler) -> bool:
+    async def scenario() -> bool:
+        tasks = scheduler.claim("worker")
+        assert len(tasks) == 1
+        return await dispatcher.dispatch(tasks[0])
+
+    return asyncio.run(scenario())
+
+
+def test_retry_only_resends_failed_channels(scheduler: BroadcastScheduler, make_dispatcher) -> None:
+    channels = [f"room{i}" for i in range(10)]
+    task_id = scheduler.enqueue(channels, {"message": "hi"})
+    sender = FlakySender({"room3", "room7"})
+    dispatcher = make_dispatcher(sender, concurrency=4)
+
+    assert _run_once(dispatcher, scheduler) is False
+    status = scheduler.delivery_status(task_id)
+    assert status["room3"]["status"] == "FAILED"
+    assert status["room0"]["status"] == "SENT"
+    assert sorted(sender.sent) == sorted(set(channels) - {"room3", "room7"})
+
+    sender.sent.clear()
+    assert _run_once(dispatcher, scheduler) is True
+    assert sorted(sender.sent) == ["room3", "room7"]
+    assert scheduler.summary() == {"DONE": 1}
+    dispatcher.close()
+
+
+def test_fan_out_runs_channels_in_parallel(scheduler: BroadcastScheduler, make_dispatcher) -> None:
+    scheduler.enqueue([f"room{i}" for i in range(20)], {"message": "hi"})
+
+    def slow_send(channel: str, payload: Dict[str, Any]) -> None:
+        threading.Event().wait(0.05)
+
+    dispatcher = make_dispatcher(slow_send, concurrency=10)
+    loop_time: List[float] = []
+
+    async def scenario() -> bool:
+        task = scheduler.claim("worker")[0]
+        started = asyncio.get_running_loop().time()
+        result = await dispatcher.dispatch(task)
+        loop_time.append(asyncio.get_running_loop().time() - started)
+        return result
+
+    assert asyncio.run(scenario()) is True
+    # 20 x 50ms 직렬이면 1초, 동시 10개면 약 0.1초
+    assert loop_time[0] < 0.5
+    dispatcher.close()
+
+
+def test_sends_through_shared_outbound_dispatcher(
+    scheduler: BroadcastScheduler, make_dispatcher, service_logger
+) -> None:
+    task_id = scheduler.enqueue(["a", "b", "c"], {"message": "hi"})
+    sender = FlakySender({"b"})
+    outbound = OutboundDispatcher(
+        global_limit=RateLimit(100, 1, "global"),
+        room_limit=RateLimit(100, 1, "room"),
+        logger=service_logger("outbound_dispatcher"),
+    )
+    dispatcher = make_dispatcher(sender, outbound=outbound)
+    try:
+        assert _run_once(dispatcher, scheduler) is False
+    finally:
+        dispatcher.close()
+        outbound.shutdown()
+    assert sorted(sender.sent) == ["a", "c"]
+    assert scheduler.delivery_status(task_id)["b"]["status"] == "FAILED"
+    stats = outbound.stats["broadcast"]
+    assert (stats.sent, stats.failed, stats.coalesced) == (2, 1, 0)
+
+
+def test_lease_loss_keeps_channels_already_sent(
+    scheduler: BroadcastScheduler, make_dispatcher, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    channels = ["room0", "room1", "room2", "room3"]
+    task_id = scheduler.enqueue(channels, {"message": "hi"})
+    sent: List[str] = []
+
+    def send(channel: str, payload: Dict[str, Any]) -> None:
+        if channel == "room1":
+            threading.Event().wait(0.3)  # 점유를 잃을 때 전송 중
+        sent.append(channel)
+
+    monkeypatch.setattr(scheduler, "renew_lease", lambda *args, **kwargs: False)
+    dispatcher = make_dispatcher(send, concurrency=1, lease_seconds=0.2)
+    assert _run_once(dispatcher, scheduler) is False
+    dispatcher._executor.shutdown(wait=True)
+
+    assert sent == ["room0", "room1"]
+    status = scheduler.delivery_status(task_id)
+    assert [status[channel]["status"] for channel in channels] == ["SENT", "SENT", "PENDING", "PENDING"]
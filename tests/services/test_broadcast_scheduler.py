@@ -1,6 +1,11 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -9,8 +14,8 @@ from src.services.broadcast_scheduler import BroadcastScheduler
 
 
 @pytest.fixture()
-def scheduler(tmp_path: Path) -> BroadcastScheduler:
-    return BroadcastScheduler(tmp_path / "queue.sqlite")
+def scheduler(tmp_path: Path, service_logger) -> BroadcastScheduler:
+    return BroadcastScheduler(tmp_path / "queue.sqlite", logger=service_logger("broadcast_scheduler"))
 
 
 def test_enqueue_and_fetch(scheduler: BroadcastScheduler) -> None:
@@ -37,4 +42,271 @@ def test_mark_retry(scheduler: BroadcastScheduler) -> None:
     assert tasks[0].attempts == 1
     scheduler.mark_retry(task_id, "timeout", max_attempts=2)
     summary = scheduler.summary()
-    assert summary.get("FAILED") == 1
+    assert summary.get("FAILED") == 1
+
+
+def test_enqueue_wakes_waiting_worker(scheduler: BroadcastScheduler) -> None:
+    async def scenario() -> tuple[bool, float]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        waiter = asyncio.create_task(scheduler.wait_for_work(timeout=5.0))
+        await asyncio.sleep(0.05)
+        await loop.run_in_executor(None, scheduler.enqueue, ["room"], {"message": "now"})
+        woke = await waiter
+        return woke, loop.time() - started
+
+    woke, elapsed = asyncio.run(scenario())
+    assert woke is True
+    assert elapsed < 1.0
+
+
+def test_enqueue_from_other_process_is_seen_via_signal_file(tmp_path: Path, service_logger) -> None:
+    worker = BroadcastScheduler(tmp_path / "queue.sqlite", logger=service_logger("broadcast_scheduler"))
+    dashboard = BroadcastScheduler(tmp_path / "queue.sqlite", logger=service_logger("broadcast_scheduler"))
+
+    async def scenario() -> bool:
+        waiter = asyncio.create_task(worker.wait_for_work(timeout=5.0, check_interval=0.05))
+        await asyncio.sleep(0.1)
+        dashboard.enqueue(["room"], {"message": "from dashboard"})
+        return await waiter
+
+    assert asyncio.run(scenario()) is True
+    assert len(worker.fetch_pending()) == 1
+
+
+def test_signal_is_seen_even_when_mtime_does_not_change(tmp_path: Path, service_logger) -> None:
+    worker = BroadcastScheduler(tmp_path / "queue.sqlite", logger=service_logger("broadcast_scheduler"))
+    dashboard = BroadcastScheduler(tmp_path / "queue.sqlite", logger=service_logger("broadcast_scheduler"))
+    dashboard.notify()
+    stat = dashboard.signal_path.stat()
+
+    async def scenario() -> bool:
+        assert await worker.wait_for_work(timeout=0.5, check_interval=0.02) is True
+        waiter = asyncio.create_task(worker.wait_for_work(timeout=2.0, check_interval=0.02))
+        await asyncio.sleep(0.05)
+        dashboard.notify()
+        # mtime 해상도가 거친 파일시스템처럼 mtime 을 되돌린다
+        os.utime(dashboard.signal_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        return await waiter
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_wait_for_work_times_out_without_signal(scheduler: BroadcastScheduler) -> None:
+    assert asyncio.run(scheduler.wait_for_work(timeout=0.1, check_interval=0.02)) is False
+
+
+def test_claim_leases_tasks_exclusively(scheduler: BroadcastScheduler) -> None:
+    first = scheduler.enqueue(["room"], {"message": "a"})
+    second = scheduler.enqueue(["room"], {"message": "b"})
+
+    claimed = scheduler.claim("worker-1", limit=1)
+    assert [task.id for task in claimed] == [first]
+    assert claimed[0].status == "RUNNING"
+    assert claimed[0].lease_owner == "worker-1"
+
+    assert [task.id for task in scheduler.claim("worker-2")] == [second]
+    assert scheduler.claim("worker-3") == []
+
+    assert scheduler.mark_success(first, worker_id="worker-2") is False
+    assert scheduler.mark_success(first, worker_id="worker-1") is True
+    assert scheduler.renew_lease(second, "worker-2") is True
+    assert scheduler.renew_lease(second, "worker-1") is False
+
+
+def test_expired_lease_is_reclaimed(scheduler: BroadcastScheduler) -> None:
+    task_id = scheduler.enqueue(["room"], {"message": "crash"})
+    assert scheduler.claim("crashed", lease_seconds=-1)
+
+    reclaimed = scheduler.claim("survivor")
+    assert [task.id for task in reclaimed] == [task_id]
+    assert scheduler.mark_success(task_id, worker_id="crashed") is False
+    assert scheduler.mark_success(task_id, worker_id="survivor") is True
+
+    other = scheduler.enqueue(["room"], {"message": "crash again"})
+    scheduler.claim("crashed", lease_seconds=-1)
+    assert scheduler.reclaim_expired() == 1
+    assert [task.id for task in scheduler.fetch_pending()] == [other]
+
+
+def test_expired_lease_counts_as_attempt_and_fails_at_max(scheduler: BroadcastScheduler) -> None:
+    task_id = scheduler.enqueue(["room"], {"message": "poison"})
+    assert scheduler.claim("w1", lease_seconds=-1, max_attempts=3)[0].attempts == 0
+    assert scheduler.claim("w2", lease_seconds=-1, max_attempts=3)[0].attempts == 1
+    assert scheduler.reclaim_expired(max_attempts=3) == 1
+    assert scheduler.claim("w3", lease_seconds=-1, max_attempts=3)[0].attempts == 2
+
+    # 세 번째로 죽은 점유는 다시 나눠 주지 않고 최종 실패로 처리한다.
+    assert scheduler.claim("w4", max_attempts=3) == []
+    assert scheduler.summary() == {"FAILED": 1}
+    with sqlite3.connect(scheduler.db_path) as conn:
+        row = conn.execute("SELECT attempts, last_error FROM broadcasts WHERE id = ?", (task_id,)).fetchone()
+    assert row == (3, "LEASE_EXPIRED")
+
+
+def test_concurrent_workers_send_each_task_once(tmp_path: Path, service_logger) -> None:
+    db_path = tmp_path / "queue.sqlite"
+    producer = BroadcastScheduler(db_path, logger=service_logger("broadcast_scheduler"))
+    expected = {producer.enqueue([f"room{i}"], {"message": i}) for i in range(200)}
+    sent: list[int] = []
+    sent_lock = threading.Lock()
+
+    def worker(worker_id: str) -> None:
+        scheduler = BroadcastScheduler(db_path, logger=service_logger("broadcast_scheduler"))
+        while True:
+            tasks = scheduler.claim(worker_id, limit=5)
+            if not tasks:
+                return
+            for task in tasks:
+                with sent_lock:
+                    sent.append(task.id)
+                assert scheduler.mark_success(task.id, worker_id=worker_id)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(sent) == sorted(expected)
+    assert producer.summary() == {"DONE": 200}
+
+
+def test_future_tasks_wait_until_due_and_priority_orders(scheduler: BroadcastScheduler) -> None:
+    now = datetime.utcnow()
+    later = scheduler.enqueue(["room"], {"message": "later"}, scheduled_at=now + timedelta(hours=1))
+    low = scheduler.enqueue(["room"], {"message": "low"}, scheduled_at=now - timedelta(seconds=5))
+    high = scheduler.enqueue(["room"], {"message": "high"}, priority=10)
+
+    assert [task.id for task in scheduler.claim("w")] == [high, low]
+    assert 50 < scheduler.seconds_until_next_due() <= 60  # 점유 만료 시각
+    scheduler.mark_success(high, worker_id="w")
+    scheduler.mark_success(low, worker_id="w")
+    wait = scheduler.seconds_until_next_due()
+    assert wait is not None and 3500 < wait <= 3600
+    assert later not in [task.id for task in scheduler.claim("w")]
+
+
+def test_retry_backs_off_exponentially(tmp_path: Path, service_logger) -> None:
+    scheduler = BroadcastScheduler(
+        tmp_path / "queue.sqlite", retry_backoff=10.0, logger=service_logger("broadcast_scheduler")
+    )
+    task_id = scheduler.enqueue(["room"], {"message": "retry"})
+    scheduler.claim("w")
+    scheduler.mark_retry(task_id, "timeout", max_attempts=5, worker_id="w")
+    first = scheduler.fetch_pending()[0].scheduled_at
+    assert scheduler.claim("w") == []
+
+    scheduler.mark_retry(task_id, "timeout", max_attempts=5)
+    second = scheduler.fetch_pending()[0].scheduled_at
+    assert 9 < (first - datetime.utcnow()).total_seconds() <= 10
+    assert 19 < (second - datetime.utcnow()).total_seconds() <= 20
+
+
+def test_recurring_task_schedules_next_occurrence(scheduler: BroadcastScheduler) -> None:
+    task_id = scheduler.enqueue(
+        ["room"],
+        {"message": "daily"},
+        scheduled_at=datetime.utcnow() - timedelta(minutes=1),
+        recurrence="*/30 * * * *",
+    )
+    assert [task.id for task in scheduler.claim("w")] == [task_id]
+    assert scheduler.mark_success(task_id, worker_id="w")
+
+    upcoming = scheduler.fetch_pending()
+    assert len(upcoming) == 1
+    assert upcoming[0].recurrence == "*/30 * * * *"
+    assert upcoming[0].scheduled_at.minute in (0, 30)
+    assert upcoming[0].scheduled_at > datetime.utcnow()
+
+
+def test_recurring_task_continues_after_final_failure(tmp_path: Path, service_logger) -> None:
+    scheduler = BroadcastScheduler(
+        tmp_path / "queue.sqlite", retry_backoff=0, logger=service_logger("broadcast_scheduler")
+    )
+    due = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(minutes=1)
+    task_id = scheduler.enqueue(["room"], {"message": "hourly"}, scheduled_at=due, recurrence="*/30 * * * *")
+    assert scheduler.claim("w") and scheduler.mark_retry(task_id, "boom", max_attempts=2, worker_id="w")
+    assert scheduler.claim("w") and scheduler.mark_retry(task_id, "boom", max_attempts=2, worker_id="w")
+
+    conn = sqlite3.connect(scheduler.db_path)
+    try:
+        status, due_at = conn.execute("SELECT status, due_at FROM broadcasts WHERE id = ?", (task_id,)).fetchone()
+    finally:
+        conn.close()
+    assert status == "FAILED"
+    assert due_at == due.isoformat()  # 재시도로 scheduled_at 이 바뀌어도 원래 예정 시각은 유지
+
+    upcoming = scheduler.fetch_pending()
+    assert len(upcoming) == 1 and upcoming[0].recurrence == "*/30 * * * *"
+    assert upcoming[0].scheduled_at.minute in (0, 30)
+    assert datetime.utcnow() < upcoming[0].scheduled_at <= due + timedelta(minutes=31)
+
+
+def test_invalid_recurrence_is_rejected(scheduler: BroadcastScheduler) -> None:
+    with pytest.raises(ValueError):
+        scheduler.enqueue(["room"], {"message": "bad"}, recurrence="every day")
+
+
+def test_summary_counters_track_status_changes(scheduler: BroadcastScheduler) -> None:
+    first = scheduler.enqueue(["a"], {"message": "one"})
+    scheduler.enqueue(["b"], {"message": "two"})
+    assert scheduler.summary() == {"PENDING": 2}
+
+    scheduler.claim("w", limit=1)
+    assert scheduler.summary() == {"PENDING": 1, "RUNNING": 1}
+    scheduler.mark_success(first, worker_id="w")
+    assert scheduler.summary() == {"PENDING": 1, "DONE": 1}
+
+
+def test_status_counters_are_seeded_once_when_processes_start_together(
+    scheduler: BroadcastScheduler, service_logger
+) -> None:
+    for index in range(3):
+        scheduler.enqueue([f"room{index}"], {"message": "old"})
+    # 카운터 도입 이전 DB 를 흉내 낸다.
+    with sqlite3.connect(scheduler.db_path) as conn:
+        conn.executescript(
+            "DROP TRIGGER trg_broadcasts_count_insert;"
+            "DROP TRIGGER trg_broadcasts_count_delete;"
+            "DROP TRIGGER trg_broadcasts_count_update;"
+            "DROP TABLE broadcast_status_counts;"
+        )
+
+    errors: list[BaseException] = []
+
+    def open_scheduler() -> None:
+        try:
+            BroadcastScheduler(scheduler.db_path, logger=service_logger("broadcast_scheduler"))
+        except BaseException as exc:  # pragma: no cover - 실패 시 원인 보고용
+            errors.append(exc)
+
+    threads = [threading.Thread(target=open_scheduler) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert scheduler.summary() == {"PENDING": 3}
+
+
+def test_archive_moves_old_completed_tasks(scheduler: BroadcastScheduler) -> None:
+    done = scheduler.enqueue(["a"], {"message": "done"})
+    failed = scheduler.enqueue(["b"], {"message": "failed"})
+    pending = scheduler.enqueue(["c"], {"message": "pending"})
+    scheduler.claim("w", limit=2)
+    scheduler.record_deliveries(done, [("a", None)])
+    scheduler.mark_success(done, worker_id="w")
+    scheduler.mark_retry(failed, "boom", max_attempts=1, worker_id="w")
+
+    assert scheduler.archive_completed(older_than_days=1) == 0
+    assert scheduler.archive_completed(older_than_days=-1, batch_size=1) == 2
+
+    assert scheduler.summary() == {"PENDING": 1}
+    assert [task.id for task in scheduler.fetch_pending()] == [pending]
+    assert scheduler.delivery_status(done) == {}
+    with scheduler._connect() as conn:  # pylint: disable=protected-access
+        archived = conn.execute("SELECT id, status FROM broadcasts_archive ORDER BY id").fetchall()
+        deliveries = conn.execute("SELECT task_id, channel FROM broadcast_deliveries_archive").fetchall()
+    assert archived == [(done, "DONE"), (failed, "FAILED")]
+    assert sorted(deliveries) == [(done, "a"), (failed, "b")]
@@ -1,11 +1,20 @@
 ﻿from __future__ import annotations
 
+import asyncio
+import threading
 from pathlib import Path
 from typing import Any
 
 import pytest
 
-from src.services.command_router import CommandRouter, attach_commands, command
+from src.services.command_router import (
+    CommandNotice,
+    CommandRouter,
+    RateLimit,
+    RateLimiter,
+    attach_commands,
+    command,
+)
 
 
 class DummyContext:
@@ -24,8 +33,8 @@ class SampleCommands:
         return "shh"
 
 
-def test_attach_and_dispatch() -> None:
-    router = CommandRouter(prefix="!")
+def test_attach_and_dispatch(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
     sample = SampleCommands()
     attach_commands(router, sample)
 
@@ -39,4 +48,269 @@ def test_attach_and_dispatch() -> None:
     assert router.dispatch("!secret", DummyContext("u2", roles=["admin"])) == "shh"
 
     # 스로틀링 테스트: 즉시 재실행하면 None
-    assert router.dispatch("!secret", DummyContext("u2", roles=["admin"])) is None
+    assert router.dispatch("!secret", DummyContext("u2", roles=["admin"])) is None
+
+
+def test_aliases_and_multi_word_longest_prefix(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    router.register("코인", lambda ctx, args: ("coin", args), aliases=["c", "비트"])
+    router.register("텍스트", lambda ctx, args: ("text", args))
+    router.register("텍스트 추가", lambda ctx, args: ("text-add", args))
+
+    assert router.dispatch("!코인 BTC", DummyContext("u1")) == ("coin", ["BTC"])
+    assert router.dispatch("!C eth", DummyContext("u1")) == ("coin", ["eth"])
+    assert router.dispatch("!비트", DummyContext("u1")) == ("coin", [])
+    assert router.dispatch("!텍스트 추가 hello world", DummyContext("u1")) == ("text-add", ["hello", "world"])
+    assert router.dispatch("!텍스트 hello", DummyContext("u1")) == ("text", ["hello"])
+    assert [meta.name for meta in router.available_commands()] == ["코인", "텍스트", "텍스트 추가"]
+
+
+def test_non_command_and_unknown_text_are_rejected(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    router.register("ping", lambda ctx, args: "pong")
+
+    assert router.match("안녕하세요 ping") is None
+    assert router.match("!pong") is None
+    assert router.match("!") is None
+    assert router.dispatch("!pong", DummyContext("u1")) is None
+
+
+def test_per_user_rate_limit_is_bounded(service_logger) -> None:
+    router = CommandRouter(
+        prefix="!", rate_limiter=RateLimiter(max_entries=10), logger=service_logger("command_router")
+    )
+    router.register("코인", lambda ctx, args: "ok", rate_limits=[RateLimit(capacity=1, per_seconds=60)])
+
+    for user in range(50):
+        assert router.dispatch("!코인", DummyContext(f"u{user}")) == "ok"
+    assert router.dispatch("!코인", DummyContext("u49")) is None
+
+    stats = router.rate_limit_stats()
+    assert stats["buckets"] == 10
+    assert stats["rejected"] == {"코인": 1}
+
+
+def test_dispatch_async_runs_coroutine_and_sync_handlers(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+
+    async def coin(ctx: DummyContext, args: list[str]) -> str:
+        await asyncio.sleep(0)
+        return "coin:" + ",".join(args)
+
+    router.register("코인", coin)
+    router.register("sync", lambda ctx, args: threading.current_thread().name)
+    replies: list[Any] = []
+
+    async def scenario() -> None:
+        assert await router.dispatch_async("!코인 BTC", DummyContext("u1"), reply=replies.append) == "coin:BTC"
+        worker = await router.dispatch_async("!sync", DummyContext("u1"))
+        assert worker.startswith("command")
+
+    asyncio.run(scenario())
+    router.shutdown()
+    assert replies == ["coin:BTC"]
+    assert router.latency_stats()["코인"]["count"] == 1
+
+
+def test_dispatch_async_timeout_concurrency_and_placeholder(service_logger) -> None:
+    router = CommandRouter(prefix="!", placeholder_delay=0.01, logger=service_logger("command_router"))
+    async def slow(ctx: DummyContext, args: list[str]) -> str:
+        await asyncio.sleep(0.2)
+        return "late"
+
+    async def stuck(ctx: DummyContext, args: list[str]) -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    router.register("slow", slow, max_concurrency=1, placeholder=True)
+    router.register("stuck", stuck, timeout=0.05)
+    replies: list[Any] = []
+    notices: list[Any] = []
+
+    async def scenario() -> None:
+        first = asyncio.create_task(router.dispatch_async("!slow", DummyContext("u1"), reply=replies.append))
+        await asyncio.sleep(0)
+        assert await router.dispatch_async("!slow", DummyContext("u2"), reply=notices.append) is None
+        assert await first == "late"
+        assert await router.dispatch_async("!stuck", DummyContext("u1"), reply=notices.append) is None
+
+    asyncio.run(scenario())
+    router.shutdown()
+    assert replies == [router.placeholder_text, "late"]
+    assert notices == [router.busy_text, router.timeout_text]
+    assert all(isinstance(notice, CommandNotice) for notice in notices)
+    assert router.latency_stats()["stuck"]["count"] == 1
+
+
+def test_placeholder_is_delivered_before_result(service_logger) -> None:
+    router = CommandRouter(prefix="!", placeholder_delay=0.01, logger=service_logger("command_router"))
+    replies: list[Any] = []
+
+    async def quick(ctx: DummyContext, args: list[str]) -> str:
+        await asyncio.sleep(0.03)
+        return "result"
+
+    def reply(value: Any) -> None:
+        if isinstance(value, CommandNotice):
+            threading.Event().wait(0.1)  # 결과보다 늦게 끝나는 느린 전송
+        replies.append(value)
+
+    router.register("quick", quick, placeholder=True)
+    assert asyncio.run(router.dispatch_async("!quick", DummyContext("u1"), reply=reply)) == "result"
+    router.shutdown()
+    assert replies == [router.placeholder_text, "result"]
+    assert isinstance(replies[0], CommandNotice)
+
+
+def test_timed_out_sync_handler_keeps_its_slot_until_it_returns(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    release = threading.Event()
+
+    def blocking(ctx: DummyContext, args: list[str]) -> str:
+        release.wait(5)
+        return "done"
+
+    router.register("blocking", blocking, timeout=0.05, max_concurrency=1)
+
+    async def scenario() -> None:
+        assert await router.dispatch_async("!blocking", DummyContext("u1")) is None
+        # 시간 초과 후에도 실행기 스레드는 아직 돌고 있으므로 자리를 내주지 않는다.
+        assert await router.dispatch_async("!blocking", DummyContext("u2")) is None
+        release.set()
+        await asyncio.sleep(0.05)
+        release.clear()
+        assert await router.dispatch_async("!blocking", DummyContext("u3")) is None
+
+    asyncio.run(scenario())
+    release.set()
+    router.shutdown()
+    stats = router.metrics.snapshot()["commands"]["blocking"]
+    assert (stats["timeouts"], stats["busy"]) == (2, 1)
+
+
+def test_cached_command_coalesces_concurrent_calls(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    calls: list[list[str]] = []
+
+    async def coin(ctx: DummyContext, args: list[str]) -> str:
+        calls.append(args)
+        await asyncio.sleep(0.05)
+        return "BTC 100"
+
+    router.register("코인", coin, cache_ttl=60.0)
+
+    async def scenario() -> list[Any]:
+        return await asyncio.gather(
+            *(router.dispatch_async("!코인", DummyContext(f"u{i}")) for i in range(30))
+        )
+
+    assert asyncio.run(scenario()) == ["BTC 100"] * 30
+    assert router.dispatch("!코인", DummyContext("late")) == "BTC 100"
+    assert len(calls) == 1
+
+    stats = router.cache_stats()["commands"]["코인"]
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 29
+    assert stats["hits"] == 1
+    router.shutdown()
+
+
+def test_cancelled_waiter_does_not_break_cache_leader(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+
+    async def slow(ctx: DummyContext, args: list[str]) -> str:
+        await asyncio.sleep(0.1)
+        return "done"
+
+    router.register("slow", slow, cache_ttl=60.0)
+
+    async def scenario() -> tuple[Any, Any]:
+        leader = asyncio.ensure_future(router.dispatch_async("!slow", DummyContext("u1")))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(router.dispatch_async("!slow", DummyContext("u2")))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        late = asyncio.ensure_future(router.dispatch_async("!slow", DummyContext("u3")))
+        return await leader, await late
+
+    assert asyncio.run(scenario()) == ("done", "done")
+    assert router.cache_stats()["commands"]["slow"]["misses"] == 1
+    router.shutdown()
+
+
+def test_sync_dispatch_does_not_block_on_in_flight_leader(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    release = threading.Event()
+    calls: list[str] = []
+
+    def price(ctx: DummyContext, args: list[str]) -> str:
+        calls.append(ctx.user_id)
+        if ctx.user_id == "leader":
+            release.wait(5)
+        return f"price:{ctx.user_id}"
+
+    router.register("price", price, cache_ttl=60.0)
+
+    async def scenario() -> Any:
+        leader = asyncio.ensure_future(router.dispatch_async("!price", DummyContext("leader")))
+        await asyncio.sleep(0.02)
+        assert router.dispatch("!price", DummyContext("sync")) == "price:sync"
+        release.set()
+        return await leader
+
+    assert asyncio.run(scenario()) == "price:leader"
+    assert router.dispatch("!price", DummyContext("late")) == "price:leader"
+    assert calls == ["leader", "sync"]
+    router.shutdown()
+
+
+def test_cache_per_room_and_args(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    calls: list[str] = []
+
+    def rooms(ctx: Any, args: list[str]) -> str:
+        calls.append(ctx.room_id)
+        return f"{ctx.room_id}:{args}"
+
+    router.register("rooms", rooms, cache_ttl=60.0, cache_per_room=True)
+    ctx_a = DummyContext("u1")
+    ctx_a.room_id = "a"
+    ctx_b = DummyContext("u1")
+    ctx_b.room_id = "b"
+
+    assert router.dispatch("!rooms", ctx_a) == "a:[]"
+    assert router.dispatch("!rooms", ctx_a) == "a:[]"
+    assert router.dispatch("!rooms", ctx_b) == "b:[]"
+    assert router.dispatch("!rooms x", ctx_b) == "b:['x']"
+    assert calls == ["a", "b", "b"]
+
+
+def test_metrics_count_calls_errors_and_rejections(service_logger) -> None:
+    router = CommandRouter(prefix="!", logger=service_logger("command_router"))
+    attach_commands(router, SampleCommands())
+
+    def broken(ctx: DummyContext, args: list[str]) -> str:
+        raise RuntimeError("boom")
+
+    router.register("broken", broken)
+    router.dispatch("!ping", DummyContext("u1"))
+    router.dispatch("!secret", DummyContext("u1"))
+    router.dispatch("!secret", DummyContext("u2", roles=["admin"]))
+    router.dispatch("!secret", DummyContext("u2", roles=["admin"]))
+    router.dispatch("!nope", DummyContext("u1"))
+    with pytest.raises(RuntimeError):
+        router.dispatch("!broken", DummyContext("u1"))
+
+    snapshot = router.metrics.snapshot()
+    assert snapshot["unknown"] == 1
+    assert snapshot["commands"]["ping"]["calls"] == 1
+    assert snapshot["commands"]["secret"]["denied"] == 1
+    assert snapshot["commands"]["secret"]["throttled"] == 1
+    assert snapshot["commands"]["broken"]["errors"] == 1
+
+    text = router.metrics_text()
+    assert 'iris_command_calls_total{command="ping"} 1' in text
+    assert 'iris_command_errors_total{command="broken"} 1' in text
+    assert "ping: 1회" in router.metrics.render_summary()
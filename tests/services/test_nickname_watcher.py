@@ -1,15 +1,18 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 from src.services.automation.nickname_watcher import (
     NicknameChange,
     NicknameWatcher,
     NicknameWatcherConfig,
 )
-from src.utils.logger import get_service_logger
+from src.services.outbound_dispatcher import OutboundDispatcher
+from src.services.rate_limiter import RateLimit
+from src.utils.logger import ServiceLogger
 
 
 class DummyResponse:
@@ -29,11 +32,14 @@ class DummySession:
     def __init__(self, query_rows: List[Dict[str, Any]]) -> None:
         self.query_rows = query_rows
         self.reply_payloads: List[Dict[str, Any]] = []
+        self.query_payloads: List[Dict[str, Any]] = []
         self.calls: List[str] = []
 
     def post(self, url: str, headers: Dict[str, Any] = None, json: Dict[str, Any] = None, timeout: float = 0) -> DummyResponse:
         self.calls.append(url)
         if url.endswith("/query"):
+            assert json is not None
+            self.query_payloads.append(json)
             return DummyResponse({"data": self.query_rows})
         if url.endswith("/reply"):
             assert json is not None
@@ -46,11 +52,11 @@ def write_state(path: Path, data: Dict[str, Any]) -> None:
     path.write_text(json.dumps(data), encoding="utf-8")
 
 
-def read_state(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text("utf-8"))
+def reload(config: NicknameWatcherConfig, service_logger: Callable[[str], ServiceLogger]) -> NicknameWatcher:
+    return NicknameWatcher(config, session=DummySession([]), logger=service_logger("nickname_watcher_test"))
 
 
-def test_run_once_detects_change_and_notifies(tmp_path: Path) -> None:
+def test_run_once_detects_change_and_notifies(tmp_path: Path, service_logger) -> None:
     state_file = tmp_path / "state.json"
     write_state(state_file, {"42": {"nickname": "old", "room_id": "123"}})
 
@@ -64,7 +70,7 @@ def test_run_once_detects_change_and_notifies(tmp_path: Path) -> None:
         interval=0.1,
         state_file=state_file,
     )
-    watcher = NicknameWatcher(config, session=session, logger=get_service_logger("nickname_watcher_test"))
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
 
     changes = watcher.run_once()
 
@@ -76,11 +82,10 @@ def test_run_once_detects_change_and_notifies(tmp_path: Path) -> None:
     payload = session.reply_payloads[0]
     assert payload["room"] == "123"
     assert "old -> new" in payload["data"]
-    saved = read_state(state_file)
-    assert saved["42"]["nickname"] == "new"
+    assert reload(config, service_logger).nickname("42") == "new"
 
 
-def test_run_once_skips_rooms_not_in_filter(tmp_path: Path) -> None:
+def test_run_once_skips_rooms_not_in_filter(tmp_path: Path, service_logger) -> None:
     state_file = tmp_path / "state.json"
     write_state(state_file, {"42": {"nickname": "old", "room_id": "999"}})
 
@@ -93,15 +98,17 @@ def test_run_once_skips_rooms_not_in_filter(tmp_path: Path) -> None:
         interval=0.1,
         state_file=state_file,
     )
-    watcher = NicknameWatcher(config, session=session, logger=get_service_logger("nickname_watcher_test"))
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
 
     changes = watcher.run_once()
 
     assert len(changes) == 1  # 감지는 되지만 알림은 전송되지 않는다
     assert session.reply_payloads == []
+    query = session.query_payloads[0]
+    assert query["query"].endswith(" where involved_chat_id in (?)") and query["bind"] == ["123"]
 
 
-def test_run_once_handles_first_snapshot(tmp_path: Path) -> None:
+def test_run_once_handles_first_snapshot(tmp_path: Path, service_logger) -> None:
     state_file = tmp_path / "state.json"
     session = DummySession([
         {"user_id": "42", "nickname": "init", "involved_chat_id": "123"},
@@ -112,10 +119,216 @@ def test_run_once_handles_first_snapshot(tmp_path: Path) -> None:
         interval=0.1,
         state_file=state_file,
     )
-    watcher = NicknameWatcher(config, session=session, logger=get_service_logger("nickname_watcher_test"))
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
 
     changes = watcher.run_once()
 
     assert changes == []
-    saved = read_state(state_file)
-    assert saved["42"]["nickname"] == "init"
+    assert reload(config, service_logger).nickname("42") == "init"
+
+
+def test_unchanged_polls_do_not_write_and_log_is_compacted(tmp_path: Path, service_logger) -> None:
+    state_file = tmp_path / "state.json"
+    rows = [{"user_id": str(uid), "nickname": f"n{uid}", "involved_chat_id": "123"} for uid in range(5)]
+    session = DummySession(rows)
+    config = NicknameWatcherConfig(
+        base_url="http://example.com",
+        state_file=state_file,
+        compact_after=3,
+    )
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
+
+    watcher.run_once()  # 첫 스냅샷은 바로 압축 저장
+    assert json.loads(state_file.read_text("utf-8"))["version"] == 2
+    assert not watcher.log_file.exists()
+    mtime = state_file.stat().st_mtime_ns
+
+    watcher.run_once()
+    assert state_file.stat().st_mtime_ns == mtime and not watcher.log_file.exists()
+
+    rows[0]["nickname"] = "renamed"
+    del rows[4]
+    watcher.run_once()
+    assert len(watcher.log_file.read_text("utf-8").splitlines()) == 1
+    assert state_file.stat().st_mtime_ns == mtime
+    restored = reload(config, service_logger)
+    assert restored.nickname("0") == "renamed" and restored.nickname("4") is None
+
+    rows[1]["nickname"] = "again"
+    watcher.run_once()  # 로그 항목이 compact_after 에 닿으면 스냅샷으로 합친다
+    assert not watcher.log_file.exists()
+    assert json.loads(state_file.read_text("utf-8"))["rooms"]["123"]["1"] == "again"
+
+
+def test_watermark_column_fetches_only_new_rows(tmp_path: Path, service_logger) -> None:
+    session = DummySession([
+        {"user_id": "1", "nickname": "a", "involved_chat_id": "123", "_id": "9"},
+        {"user_id": "2", "nickname": "b", "involved_chat_id": "123", "_id": "10"},
+    ])
+    config = NicknameWatcherConfig(
+        base_url="http://example.com",
+        state_file=tmp_path / "state.json",
+        watermark_column="_id",
+    )
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
+
+    watcher.run_once()
+    assert "where" not in session.query_payloads[0]["query"]
+
+    session.query_rows = [{"user_id": "1", "nickname": "a2", "involved_chat_id": "123", "_id": "11"}]
+    changes = watcher.run_once()
+    incremental = session.query_payloads[1]
+    assert incremental["query"].endswith(" where _id > ? order by _id") and incremental["bind"] == [10]
+    assert [(c.old_nickname, c.new_nickname) for c in changes] == [("a", "a2")]
+    assert watcher.nickname("2") == "b"  # 증분 조회에 없던 멤버는 유지
+    assert reload(config, service_logger).nickname("1") == "a2"
+
+
+def test_conditions_wrap_queries_that_already_order_or_limit(tmp_path: Path, service_logger) -> None:
+    session = DummySession([{"user_id": "1", "nickname": "a", "involved_chat_id": "123", "_id": 5}])
+    config = NicknameWatcherConfig(
+        base_url="http://example.com",
+        rooms=["123"],
+        state_file=tmp_path / "state.json",
+        watermark_column="_id",
+        query_payload={
+            "query": "select enc,nickname,user_id,involved_chat_id,_id from db2.open_chat_member ORDER BY _id DESC LIMIT 500;",
+            "bind": [],
+        },
+    )
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
+
+    watcher.run_once()
+    watcher.run_once()
+    first, incremental = session.query_payloads
+    assert first["query"] == (
+        "select * from (select enc,nickname,user_id,involved_chat_id,_id from db2.open_chat_member"
+        " ORDER BY _id DESC LIMIT 500) where involved_chat_id in (?)"
+    )
+    assert incremental["query"].endswith(") where involved_chat_id in (?) and _id > ? order by _id")
+    assert incremental["bind"] == ["123", 5]
+
+
+def test_same_user_in_several_rooms_is_tracked_per_room(tmp_path: Path, service_logger) -> None:
+    session = DummySession([
+        {"user_id": "7", "nickname": "alice", "involved_chat_id": "1"},
+        {"user_id": "7", "nickname": "앨리스", "involved_chat_id": "2"},
+        {"user_id": "8", "nickname": "bob", "involved_chat_id": "2"},
+    ])
+    config = NicknameWatcherConfig(
+        base_url="http://example.com",
+        rooms=["1", "2"],
+        state_file=tmp_path / "state.json",
+    )
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
+
+    assert watcher.run_once() == []  # 방마다 다른 닉네임은 변경이 아니다
+    assert watcher.run_once() == []
+    assert session.query_payloads[0]["bind"] == ["1", "2"]
+    assert watcher.member_count() == 3
+
+    session.query_rows = [
+        {"user_id": "7", "nickname": "alice", "involved_chat_id": "1"},
+        {"user_id": "7", "nickname": "앨리스2", "involved_chat_id": "2"},
+    ]
+    changes = watcher.run_once()
+    assert [(c.room_id, c.old_nickname, c.new_nickname) for c in changes] == [("2", "앨리스", "앨리스2")]
+    assert [payload["room"] for payload in session.reply_payloads] == ["2"]
+
+    restored = reload(config, service_logger)
+    assert restored.nickname("7", "1") == "alice" and restored.nickname("7", "2") == "앨리스2"
+    assert restored.nickname("8") is None  # 방을 나간 멤버는 제거
+
+
+class FlakySession(DummySession):
+    """첫 조회와 첫 알림 전송이 실패하는 세션"""
+
+    def __init__(self, query_rows: List[Dict[str, Any]]) -> None:
+        super().__init__(query_rows)
+        self.failures = {"/query": 1, "/reply": 1}
+
+    def post(self, url: str, headers: Dict[str, Any] = None, json: Dict[str, Any] = None, timeout: float = 0) -> DummyResponse:
+        for suffix, remaining in self.failures.items():
+            if url.endswith(suffix) and remaining:
+                self.failures[suffix] -= 1
+                return DummyResponse({}, status_code=503)
+        return super().post(url, headers=headers, json=json, timeout=timeout)
+
+
+def test_run_async_backs_off_retries_and_wakes_on_poke(tmp_path: Path, service_logger) -> None:
+    session = FlakySession([
+        {"user_id": "1", "nickname": "a", "involved_chat_id": "10"},
+        {"user_id": "2", "nickname": "b", "involved_chat_id": "20"},
+    ])
+    config = NicknameWatcherConfig(
+        base_url="http://example.com",
+        state_file=tmp_path / "state.json",
+        interval=0.02,
+        min_interval=0.01,
+        max_interval=0.2,
+        backoff_factor=2.0,
+        retry_base_delay=0.01,
+    )
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"))
+
+    async def scenario() -> None:
+        task = asyncio.create_task(watcher.run_async())
+        await asyncio.sleep(0.5)
+        # 변화가 없으면 간격이 max_interval 까지 늘어난다.
+        idle_polls = len(session.query_payloads)
+        assert 3 <= idle_polls <= 12
+
+        session.query_rows = [
+            {"user_id": "1", "nickname": "a2", "involved_chat_id": "10"},
+            {"user_id": "2", "nickname": "b2", "involved_chat_id": "20"},
+        ]
+        watcher.poke()
+        for _ in range(100):
+            if len(session.reply_payloads) == 2:
+                break
+            await asyncio.sleep(0.01)
+        watcher.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(scenario())
+    assert session.failures == {"/query": 0, "/reply": 0}  # 실패 후 재시도로 복구
+    assert sorted(payload["room"] for payload in session.reply_payloads) == ["10", "20"]
+    assert reload(config, service_logger).nickname("1") == "a2"
+
+
+def test_run_async_retries_failed_notifications_through_outbound(tmp_path: Path, service_logger) -> None:
+    session = FlakySession([{"user_id": "1", "nickname": "a", "involved_chat_id": "10"}])
+    session.failures["/query"] = 0
+    config = NicknameWatcherConfig(
+        base_url="http://example.com",
+        state_file=tmp_path / "state.json",
+        min_interval=0.01,
+        retry_base_delay=0.01,
+        notify_retries=2,
+    )
+    outbound = OutboundDispatcher(
+        global_limit=RateLimit(100, 1, "global"),
+        room_limit=RateLimit(100, 1, "room"),
+        logger=service_logger("outbound_dispatcher"),
+    )
+    watcher = NicknameWatcher(config, session=session, logger=service_logger("nickname_watcher_test"), outbound=outbound)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(watcher.run_async())
+        await asyncio.sleep(0.05)
+        session.query_rows = [{"user_id": "1", "nickname": "a2", "involved_chat_id": "10"}]
+        watcher.poke()
+        for _ in range(100):
+            if session.reply_payloads:
+                break
+            await asyncio.sleep(0.01)
+        watcher.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        outbound.shutdown()
+    assert [payload["room"] for payload in session.reply_payloads] == ["10"]
+    stats = outbound.stats["notification"]
+    assert (stats.submitted, stats.failed, stats.sent) == (2, 1, 1)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.services.outbound_dispatcher import OutboundDispatcher, OutboundQueueFull
+from src.services.rate_limiter import RateLimit
+
+
+def _unlimited(**kwargs) -> OutboundDispatcher:
+    return OutboundDispatcher(
+        global_limit=RateLimit(1000, 1, "global"),
+        room_limit=RateLimit(1000, 1, "room"),
+        **kwargs,
+    )
+
+
+def _blocker(outbound: OutboundDispatcher, gate: threading.Event):
+    started = threading.Event()
+
+    def send(_: str) -> None:
+        started.set()
+        gate.wait(5)
+
+    future = outbound.submit("blocker", "block", send)
+    assert started.wait(5)
+    return future
+
+
+def test_higher_priority_classes_are_sent_first(service_logger) -> None:
+    outbound = _unlimited(workers=1, logger=service_logger("outbound_dispatcher"))
+    gate = threading.Event()
+    sent: list[str] = []
+    try:
+        _blocker(outbound, gate)
+        futures = [
+            outbound.submit("r1", "broadcast", sent.append, priority="broadcast"),
+            outbound.submit("r2", "welcome", sent.append, priority="welcome"),
+            outbound.submit("r3", "command", sent.append, priority="command"),
+        ]
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        outbound.shutdown()
+    assert sent == ["command", "welcome", "broadcast"]
+
+
+def test_pending_replies_to_same_room_are_coalesced(service_logger) -> None:
+    outbound = _unlimited(workers=1, logger=service_logger("outbound_dispatcher"))
+    gate = threading.Event()
+    sent: list[str] = []
+
+    def send(text: str) -> str:
+        sent.append(text)
+        return "ok"
+
+    try:
+        _blocker(outbound, gate)
+        futures = [outbound.submit("room", f"line {index}", send) for index in range(3)]
+        gate.set()
+        assert [future.result(timeout=5) for future in futures] == ["ok", "ok", "ok"]
+    finally:
+        outbound.shutdown()
+    assert sent == ["line 0\n\nline 1\n\nline 2"]
+    stats = outbound.snapshot()["priorities"]["command"]
+    assert (stats["sent"], stats["batches"], stats["coalesced"]) == (4, 2, 2)
+    assert stats["queue_wait"]["count"] == 4
+
+
+def test_room_bucket_paces_sends_and_errors_reach_future(service_logger) -> None:
+    outbound = OutboundDispatcher(
+        global_limit=RateLimit(100, 1, "global"),
+        room_limit=RateLimit(1, 0.2, "room"),
+        logger=service_logger("outbound_dispatcher"),
+    )
+    stamps: list[float] = []
+
+    def fail(_: str) -> None:
+        raise RuntimeError("kakao throttled")
+
+    try:
+        first = outbound.submit("room", "a", lambda _: stamps.append(time.monotonic()), coalesce=False)
+        second = outbound.submit("room", "b", lambda _: stamps.append(time.monotonic()), coalesce=False)
+        third = outbound.submit("other", "c", fail)
+        first.result(timeout=5)
+        second.result(timeout=5)
+        with pytest.raises(RuntimeError):
+            third.result(timeout=5)
+    finally:
+        outbound.shutdown()
+    assert stamps[1] - stamps[0] >= 0.15
+    assert outbound.stats["command"].failed == 1
+    assert 'iris_outbound_queue_wait_ms_count{priority="command"} 3' in outbound.render_text()
+
+
+def test_full_queue_rejects_new_messages(service_logger) -> None:
+    outbound = _unlimited(workers=1, max_pending=1, logger=service_logger("outbound_dispatcher"))
+    gate = threading.Event()
+    try:
+        _blocker(outbound, gate)
+        outbound.submit("room", "queued", lambda _: None)
+        rejected = outbound.submit("room", "overflow", lambda _: None)
+        with pytest.raises(OutboundQueueFull):
+            rejected.result(timeout=1)
+        with pytest.raises(ValueError):
+            outbound.submit("room", "x", lambda _: None, priority="urgent")
+        gate.set()
+    finally:
+        outbound.shutdown()
+    assert outbound.stats["command"].dropped == 1
+
+
+def test_cancelled_message_is_not_sent(service_logger) -> None:
+    outbound = _unlimited(workers=1, logger=service_logger("outbound_dispatcher"))
+    gate = threading.Event()
+    sent: list[str] = []
+    try:
+        _blocker(outbound, gate)
+        cancelled = outbound.submit("room", "cancelled", sent.append, coalesce=False)
+        kept = outbound.submit("room", "kept", sent.append, coalesce=False)
+        assert cancelled.cancel()
+        gate.set()
+        kept.result(timeout=5)
+    finally:
+        outbound.shutdown()
+    assert sent == ["kept"]
+    assert outbound.stats["command"].cancelled == 1
+
+
+def test_cancelled_message_does_not_use_room_token(service_logger) -> None:
+    outbound = OutboundDispatcher(
+        global_limit=RateLimit(1000, 1, "global"),
+        room_limit=RateLimit(1, 60, "room"),
+        workers=1,
+        logger=service_logger("outbound_dispatcher"),
+    )
+    gate = threading.Event()
+    try:
+        _blocker(outbound, gate)
+        cancelled = outbound.submit("room", "cancelled", lambda _: None, coalesce=False)
+        kept = outbound.submit("room", "kept", lambda _: "ok", coalesce=False)
+        assert cancelled.cancel()
+        gate.set()
+        # 취소된 메시지가 방 토큰을 먼저 썼다면 60초를 기다려야 한다.
+        assert kept.result(timeout=2) == "ok"
+    finally:
+        outbound.shutdown()
+
+
+def test_welcome_and_notification_are_not_coalesced_together(service_logger) -> None:
+    outbound = _unlimited(workers=1, logger=service_logger("outbound_dispatcher"))
+    gate = threading.Event()
+    sent: list[tuple[str, str]] = []
+    try:
+        _blocker(outbound, gate)
+        futures = [
+            outbound.submit("room", "welcome", lambda text: sent.append(("welcome", text)), priority="welcome"),
+            outbound.submit("room", "nick", lambda text: sent.append(("notification", text)), priority="notification"),
+        ]
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        outbound.shutdown()
+    assert sent == [("welcome", "welcome"), ("notification", "nick")]
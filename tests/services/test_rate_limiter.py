@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+from src.services.rate_limiter import RateLimit, RateLimiter, TokenBucketStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_over_time() -> None:
+    clock = FakeClock()
+    store = TokenBucketStore(clock=clock)
+    limit = RateLimit(capacity=2, per_seconds=10)
+
+    assert store.acquire("k", limit)
+    assert store.acquire("k", limit)
+    assert not store.acquire("k", limit)
+    clock.now = 5.0
+    assert store.acquire("k", limit)
+    assert not store.acquire("k", limit)
+
+
+def test_store_stays_bounded_with_many_senders() -> None:
+    clock = FakeClock()
+    store = TokenBucketStore(max_entries=100, ttl=60.0, clock=clock)
+    limit = RateLimit(capacity=1, per_seconds=1)
+
+    for user in range(10_000):
+        store.acquire(("cmd", "user", str(user)), limit)
+    assert len(store) == 100
+    assert store.evicted == 9_900
+
+    clock.now = 120.0
+    store.acquire(("cmd", "user", "fresh"), limit)
+    assert len(store) == 1
+    assert store.expired == 100
+
+
+def test_long_window_is_not_reset_by_idle_expiry() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(ttl=600.0, clock=clock)
+    hourly = [RateLimit.from_throttle(3600)]
+
+    assert limiter.check("report", hourly, "u1", "r1") is None
+    clock.now = 1800.0
+    assert limiter.check("other", [RateLimit(1, 1)], "u2", "r1") is None  # 만료 정리 유도
+    assert limiter.check("report", hourly, "u1", "r1") == "user"
+    clock.now = 3601.0
+    assert limiter.check("report", hourly, "u1", "r1") is None
+
+
+def test_rate_limiter_room_and_global_scopes() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(global_limit=RateLimit(capacity=3, per_seconds=60, scope="global"), clock=clock)
+    room_limit = [RateLimit(capacity=1, per_seconds=60, scope="room")]
+
+    assert limiter.check("coin", room_limit, "u1", "r1") is None
+    assert limiter.check("coin", room_limit, "u2", "r1") == "room"
+    assert limiter.check("coin", room_limit, "u1", "r2") is None
+    assert limiter.check("help", [], "u1", "r3") is None
+    assert limiter.check("help", [], "u1", "r3") == "global"
+
+    stats = limiter.stats()
+    assert stats["allowed"] == {"coin": 2, "help": 1}
+    assert stats["rejected"] == {"coin": 1, "help": 1}
+
+
+def test_wait_time_reports_refill_delay_without_consuming() -> None:
+    clock = FakeClock()
+    store = TokenBucketStore(clock=clock)
+    limit = RateLimit.parse("2/10", scope="room")
+
+    assert limit == RateLimit(2, 10, "room")
+    assert store.wait_time("k", limit) == 0.0
+    assert store.acquire("k", limit)
+    assert store.acquire("k", limit)
+    assert store.wait_time("k", limit) == pytest.approx(5.0)
+    clock.now = 4.0
+    assert store.wait_time("k", limit) == pytest.approx(1.0)
+    clock.now = 5.0
+    assert store.wait_time("k", limit) == 0.0
+    assert store.acquire("k", limit)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.room_manager import RoomManager
+from src.services.room_settings import RoomSettingsStore
+
+
+@pytest.fixture()
+def make_manager(service_logger):
+    def make(db_path, **kwargs) -> RoomManager:
+        settings = RoomSettingsStore(str(db_path), logger=service_logger("room_settings"))
+        return RoomManager(str(db_path), logger=service_logger("room_manager"), settings=settings, **kwargs)
+
+    return make
+
+
+def _activity(db_path: Path, room_id: int) -> str:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT last_activity FROM room_registry WHERE id = ?", (room_id,)).fetchone()[0]
+
+
+def test_new_rooms_are_durable_and_activity_is_batched(
+    tmp_path: Path, make_manager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "rooms.db"
+    manager = make_manager(str(db_path), flush_interval=0)
+    assert manager.auto_register_room(1, "first", {"auto_welcome": True})
+    assert manager.get_room_settings(1) == {"auto_welcome": True}
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE room_registry SET last_activity = '2000-01-01 00:00:00'")
+
+    statements: list[str] = []
+    original_connect = sqlite3.connect
+
+    def tracing_connect(*args, **kwargs):
+        conn = original_connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracing_connect)
+    for _ in range(1000):
+        assert manager.auto_register_room(1, "first")
+    monkeypatch.undo()
+    assert statements == []
+    assert _activity(db_path, 1) == "2000-01-01 00:00:00"
+
+    assert manager.flush_activity() == 1
+    assert manager.flush_activity() == 0
+    assert _activity(db_path, 1) > "2000-01-01 00:00:00"
+
+
+def test_registry_is_loaded_at_startup_and_tracks_deactivation(tmp_path: Path, make_manager) -> None:
+    db_path = str(tmp_path / "rooms.db")
+    make_manager(db_path).auto_register_room(7, "seven")
+
+    manager = make_manager(db_path, flush_interval=0.05)
+    assert manager.is_registered(7)
+    assert not manager.is_registered(8)
+    manager.start()
+    manager.auto_register_room(7, "seven")
+    manager.deactivate_room(7)
+    manager.stop()
+    assert manager.get_active_rooms() == []
+    assert manager.get_room_stats()["inactive_rooms"] == 1
+
+
+def test_settings_changes_from_other_process_reload_only_changed_room(tmp_path: Path, make_manager) -> None:
+    db_path = str(tmp_path / "rooms.db")
+    bot = make_manager(db_path)
+    bot.auto_register_room(1, "one", {"auto_welcome": True})
+    bot.auto_register_room(2, "two", {"auto_welcome": False})
+    changes: list[tuple[int, dict]] = []
+    bot.settings.subscribe(lambda room_id, settings: changes.append((room_id, settings)))
+    version = bot.settings.version
+
+    dashboard = make_manager(db_path)
+    assert dashboard.get_room_settings(2) == {"auto_welcome": False}
+    assert dashboard.update_room_settings(2, {"auto_welcome": True, "welcome_max_names": 3})
+
+    # 신호 파일을 본 감시 스레드가 하는 일과 같다.
+    assert bot.settings.refresh() == [2]
+    assert bot.settings.version == version + 1
+    assert changes == [(2, {"auto_welcome": True, "welcome_max_names": 3})]
+    assert bot.settings.feature(2, "welcome_max_names") == 3
+    assert bot.settings.feature(1, "auto_welcome") is True
+    assert bot.settings.refresh() == []
+
+    rooms = {room["id"]: room for room in bot.get_active_rooms()}
+    assert rooms[2]["settings"] == {"auto_welcome": True, "welcome_max_names": 3}
+
+
+def test_settings_watcher_picks_up_signal(tmp_path: Path, make_manager) -> None:
+    db_path = str(tmp_path / "rooms.db")
+    bot = make_manager(db_path)
+    bot.settings.poll_interval = 0.02
+    bot.start()
+    try:
+        make_manager(db_path).update_room_settings(5, {"commands_enabled": False})
+        deadline = time.monotonic() + 2
+        while bot.get_room_settings(5) == {} and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        bot.stop()
+    assert bot.get_room_settings(5) == {"commands_enabled": False}
+
+
+def test_reader_without_watcher_sees_changes_from_other_process(tmp_path: Path, make_manager) -> None:
+    db_path = str(tmp_path / "rooms.db")
+    dashboard = make_manager(db_path)
+    dashboard.settings.poll_interval = 0.05
+    assert dashboard.get_room_settings(4) == {}
+
+    make_manager(db_path).update_room_settings(4, {"auto_welcome": False})
+    # poll_interval 이 지나면 조회 시 DB 버전을 확인해 다시 읽는다.
+    time.sleep(0.06)
+    assert dashboard.get_room_settings(4) == {"auto_welcome": False}
+
+
+def test_pending_activity_is_flushed_when_script_exits_without_stop(tmp_path: Path, make_manager) -> None:
+    db_path = tmp_path / "rooms.db"
+    make_manager(str(db_path)).auto_register_room(1, "first")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE room_registry SET last_activity = '2000-01-01 00:00:00'")
+
+    # scripts/register_rooms.py 처럼 start()/stop() 없이 쓰고 끝나는 프로세스
+    script = textwrap.dedent(f"""
+        from src.services.room_manager import RoomManager
+        from src.services.room_settings import RoomSettingsStore
+        from src.utils.logger import ServiceLogger
+
+        log_dir = {str(tmp_path / "logs")!r}
+        settings = RoomSettingsStore({str(db_path)!r}, logger=ServiceLogger("room_settings", log_dir=log_dir))
+        manager = RoomManager(
+            {str(db_path)!r}, logger=ServiceLogger("room_manager", log_dir=log_dir), settings=settings
+        )
+        manager.auto_register_room(1, "first")
+    """)
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=Path(__file__).resolve().parents[2])
+    assert _activity(db_path, 1) > "2000-01-01 00:00:00"
+
+
+def test_context_manager_flushes_pending_activity(tmp_path: Path, make_manager) -> None:
+    db_path = str(tmp_path / "rooms.db")
+    with make_manager(db_path) as manager:
+        manager.auto_register_room(3, "three")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE room_registry SET last_activity = '2000-01-01 00:00:00'")
+        manager.auto_register_room(3, "three")
+    assert _activity(Path(db_path), 3) > "2000-01-01 00:00:00"
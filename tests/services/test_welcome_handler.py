@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from src.services.welcome_handler import WelcomeHandler
+from src.services.welcome_templates import TemplateRegistry
+
+
+def _chat(room_id: int, user_id: int, name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        room=SimpleNamespace(id=room_id, name="room"),
+        sender=SimpleNamespace(id=user_id, name=name),
+    )
+
+
+def _registry(tmp_path: Path, service_logger) -> TemplateRegistry:
+    return TemplateRegistry(tmp_path, poll_interval=0, logger=service_logger("welcome_templates"))
+
+
+def _handler(
+    tmp_path: Path, service_logger, settings: Dict[int, Dict[str, Any]], window: float = 0.2
+) -> WelcomeHandler:
+    (tmp_path / "default.json").write_text(
+        json.dumps({"auto_reply": "{userName}님 환영합니다!"}, ensure_ascii=False), encoding="utf-8"
+    )
+    return WelcomeHandler(
+        tmp_path,
+        settings_provider=lambda room_id: settings.get(room_id, {}),
+        coalesce_window=window,
+        templates=_registry(tmp_path, service_logger),
+        logger=service_logger("welcome_handler"),
+    )
+
+
+def test_join_burst_is_coalesced_into_one_welcome(tmp_path: Path, service_logger) -> None:
+    handler = _handler(tmp_path, service_logger, {1: {"welcome_max_names": 3}})
+    sent: list[str] = []
+
+    results = [handler.handle_join(_chat(1, index, f"user{index}"), sent.append)["welcome"] for index in range(30)]
+    assert results[0] == "sent"
+    assert set(results[1:]) == {"coalesced"}
+    assert sent == ["user0님 환영합니다!"]
+
+    deadline = time.monotonic() + 2
+    while len(sent) < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert sent[1] == "user1, user2, user3 외 26명님 환영합니다!"
+    time.sleep(0.5)
+    assert len(sent) == 2
+    assert handler.coalesced == 29
+
+    # 창이 닫힌 뒤의 첫 입장은 다시 바로 환영한다.
+    assert handler.handle_join(_chat(1, 99, "late"), sent.append)["welcome"] == "sent"
+    handler.flush()
+
+
+def test_room_settings_control_window_and_auto_welcome(tmp_path: Path, service_logger) -> None:
+    settings = {2: {"welcome_coalesce_seconds": 0}, 3: {"auto_welcome": False}}
+    handler = _handler(tmp_path, service_logger, settings, window=30)
+    sent: list[str] = []
+
+    for index in range(3):
+        assert handler.handle_join(_chat(2, index, f"u{index}"), sent.append)["welcome"] == "sent"
+    assert handler.handle_join(_chat(3, 1, "muted"), sent.append)["welcome"] == "disabled"
+    assert len(sent) == 3
+
+    handler.handle_join(_chat(4, 1, "a"), sent.append)
+    handler.handle_join(_chat(4, 2, "b"), sent.append)
+    handler.flush()
+    assert sent[-2:] == ["a님 환영합니다!", "b님 환영합니다!"]
+
+
+def test_templates_are_compiled_once_and_reloaded_on_change(tmp_path: Path, service_logger) -> None:
+    path = tmp_path / "default.json"
+    path.write_text(
+        json.dumps({"auto_reply": "{roomName}에 오신 {userName}님 ({joinCount}명) 환영!"}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    registry = _registry(tmp_path, service_logger)
+    handler = WelcomeHandler(
+        tmp_path, templates=registry, coalesce_window=0, logger=service_logger("welcome_handler")
+    )
+    sent: list[str] = []
+
+    handler.handle_join(_chat(1, 1, "kim"), sent.append)
+    assert sent == ["room에 오신 kim님 (1명) 환영!"]
+
+    path.write_text(json.dumps({"auto_reply": "hi {memberName}"}), encoding="utf-8")
+    # 파일을 바꿔도 refresh 전까지는 메모리의 템플릿을 그대로 쓴다.
+    handler.handle_join(_chat(1, 2, "lee"), sent.append)
+    assert sent[-1] == "room에 오신 lee님 (1명) 환영!"
+
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert registry.refresh() == 1
+    assert registry.refresh() == 0
+    registry.request_reload()
+    assert registry.refresh() == 1
+    handler.handle_join(_chat(1, 3, "park"), sent.append)
+    assert sent[-1] == "hi park"
+
+
+def test_room_setting_selects_named_template(tmp_path: Path, service_logger) -> None:
+    handler = _handler(tmp_path, service_logger, {5: {"welcome_template": "qa"}}, window=0)
+    (tmp_path / "qa.json").write_text(json.dumps({"auto_reply": "Q&A {userName}"}), encoding="utf-8")
+    handler.templates.refresh()
+    sent: list[str] = []
+
+    handler.handle_join(_chat(5, 1, "a"), sent.append)
+    handler.handle_join(_chat(6, 1, "b"), sent.append)
+    assert sent == ["Q&A a", "b님 환영합니다!"]
+
+
+def test_messages_text_template_does_not_auto_reply(tmp_path: Path, service_logger) -> None:
+    (tmp_path / "default.json").write_text(json.dumps({"messages": {"text": "{userName}님 환영"}}), encoding="utf-8")
+    handler = WelcomeHandler(
+        tmp_path, templates=_registry(tmp_path, service_logger), coalesce_window=0,
+        logger=service_logger("welcome_handler"),
+    )
+    sent: list[str] = []
+    assert handler.handle_join(_chat(1, 1, "kim"), sent.append)["welcome"] == "none"
+    assert sent == []
+
+
+def test_flush_uses_room_max_names_and_member_count_alias(tmp_path: Path, service_logger) -> None:
+    handler = _handler(tmp_path, service_logger, {1: {"welcome_max_names": 1}}, window=30)
+    (tmp_path / "default.json").write_text(json.dumps({"auto_reply": "{userName} ({memberCount})"}), encoding="utf-8")
+    handler.templates.refresh(force=True)
+    sent: list[str] = []
+
+    for index in range(4):
+        handler.handle_join(_chat(1, index, f"u{index}"), sent.append)
+    handler.flush()
+    assert sent == ["u0 (1)", "u1 외 2명 (3)"]
+
+
+def test_broken_template_warns_once_per_change(tmp_path: Path, service_logger, monkeypatch) -> None:
+    registry = _registry(tmp_path, service_logger)
+    warnings: list[str] = []
+    monkeypatch.setattr(registry.logger, "warning", lambda message, **kwargs: warnings.append(kwargs["template"]))
+    path = tmp_path / "broken.json"
+    path.write_text("{", encoding="utf-8")
+
+    for _ in range(5):
+        assert registry.refresh() == 0
+    assert warnings == ["broken"]
+
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert registry.refresh() == 0
+    assert warnings == ["broken", "broken"]
+    assert registry.get("broken") is None
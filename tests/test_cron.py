@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.utils.cron import CronExpression
+
+
+def test_next_after_handles_steps_ranges_and_rollover() -> None:
+    assert CronExpression("*/15 * * * *").next_after(datetime(2025, 1, 1, 10, 7)) == datetime(2025, 1, 1, 10, 15)
+    assert CronExpression("0 9 * * 1-5").next_after(datetime(2025, 1, 3, 9, 0)) == datetime(2025, 1, 6, 9, 0)
+    assert CronExpression("30 23 31 12 *").next_after(datetime(2025, 12, 31, 23, 30)) == datetime(2026, 12, 31, 23, 30)
+
+
+def test_day_of_month_or_weekday_semantics() -> None:
+    # 1일 또는 일요일 (2025-01-05 는 일요일)
+    expression = CronExpression("0 0 1 * 0")
+    assert expression.next_after(datetime(2025, 1, 1, 0, 0)) == datetime(2025, 1, 5, 0, 0)
+
+
+def test_aware_datetimes_use_given_timezone() -> None:
+    from zoneinfo import ZoneInfo
+
+    seoul = ZoneInfo("Asia/Seoul")
+    after = datetime(2025, 1, 1, 0, 30, tzinfo=timezone.utc)  # 09:30 KST
+    result = CronExpression("0 10 * * *").next_after(after, seoul)
+    assert result.astimezone(timezone.utc) == datetime(2025, 1, 1, 1, 0, tzinfo=timezone.utc)
+
+
+def test_invalid_expressions() -> None:
+    with pytest.raises(ValueError):
+        CronExpression("* * *")
+    with pytest.raises(ValueError):
+        CronExpression("61 * * * *")
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.log_archive import INDEX_NAME, main, process_files, query_archive
+from src.utils.logger import LogValidator
+
+
+def _line(timestamp: str, level: str = "INFO", message: str = "m") -> str:
+    return json.dumps({"timestamp": timestamp, "level": level, "logger": "t", "message": message})
+
+
+@pytest.fixture()
+def log_dir(tmp_path: Path) -> Path:
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    (logs / "app.log").write_text(
+        "\n".join(
+            [
+                _line("2025-11-01T23:59:58.000001"),
+                "not json",
+                _line("2025-11-01T23:59:59.000001", "ERROR", "boom"),
+                "",
+                _line("2025-11-02T00:00:01.000001"),
+                json.dumps({"message": "missing fields"}),
+                _line("2025-11-02T00:00:02.000001", "WARNING"),
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    with gzip.open(logs / "app.log.1.gz", "wt", encoding="utf-8") as f:
+        for second in range(10):
+            f.write(_line(f"2025-10-31T12:00:{second:02d}.000000", message=f"old {second}") + "\n")
+    return logs
+
+
+def test_process_files_reports_per_file_stats_in_parallel(log_dir: Path) -> None:
+    results = {Path(stats.path).name: stats for stats in process_files([log_dir], workers=2)}
+
+    current = results["app.log"]
+    assert (current.total_lines, current.valid_lines, current.invalid_lines) == (7, 4, 2)
+    assert current.levels == {"INFO": 2, "ERROR": 1, "WARNING": 1}
+    assert current.first_timestamp == "2025-11-01T23:59:58.000001"
+    assert current.last_timestamp == "2025-11-02T00:00:02.000001"
+    assert results["app.log.1.gz"].valid_lines == 10 and results["app.log.1.gz"].invalid_lines == 0
+
+    report = LogValidator.validate_log_file(log_dir / "app.log")
+    assert report["valid"] is False and report["valid_lines"] == 4 and report["levels"]["ERROR"] == 1
+
+
+def test_compact_writes_date_partitions_and_block_index(log_dir: Path, tmp_path: Path) -> None:
+    archive = tmp_path / "archive"
+    process_files([log_dir], workers=1, archive_dir=archive, block_lines=3)
+
+    assert sorted(p.name for p in archive.iterdir()) == ["2025-10-31", "2025-11-01", "2025-11-02", INDEX_NAME]
+    index = json.loads((archive / INDEX_NAME).read_text(encoding="utf-8"))
+    assert sum(item["lines"] for item in index["files"]) == 14
+    # gzip member 를 이어 붙인 파일이라 일반 gzip 으로도 전부 읽힌다.
+    with gzip.open(archive / "2025-10-31" / "app.log.1.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 10
+    sidecar = json.loads((archive / "2025-10-31" / "app.log.1.jsonl.gz.idx").read_text(encoding="utf-8"))
+    assert [block["lines"] for block in sidecar["blocks"]] == [3, 3, 3, 1]
+
+    window = list(query_archive(archive, "2025-10-31T12:00:04", "2025-10-31T12:00:07"))
+    assert [entry["message"] for entry in window] == ["old 4", "old 5", "old 6"]
+    assert [entry["message"] for entry in query_archive(archive, level="ERROR")] == ["boom"]
+    assert len(list(query_archive(archive, "2025-11-01T23:59:59", "2025-11-02T00:00:02"))) == 2
+
+    # 같은 원본을 다시 보관해도 중복되지 않는다 (보관 파일은 입력으로 다시 잡지 않음)
+    assert main(["compact", str(log_dir), "--out", str(archive), "--workers", "1"]) == 1
+    index = json.loads((archive / INDEX_NAME).read_text(encoding="utf-8"))
+    assert sum(item["lines"] for item in index["files"]) == 14
+
+
+def test_compact_twice_appends_instead_of_overwriting(log_dir: Path, tmp_path: Path) -> None:
+    archive = tmp_path / "archive"
+    current = log_dir / "app.log"
+    process_files([current], workers=1, archive_dir=archive, block_lines=2)
+
+    # 같은 파일에 줄이 늘어난 뒤 다시 보관하면 새 줄만 붙는다.
+    with open(current, "a", encoding="utf-8") as f:
+        f.write(_line("2025-11-02T00:00:03.000001", message="grown") + "\n")
+    process_files([current], workers=1, archive_dir=archive, block_lines=2)
+    day = [entry["message"] for entry in query_archive(archive, "2025-11-02", "2025-11-03")]
+    assert day == ["m", "m", "grown"]
+
+    # 회전되어 같은 이름에 다른 내용이 들어와도 기존 보관 줄은 남는다.
+    current.write_text(_line("2025-11-02T08:00:00.000001", message="rotated") + "\n", encoding="utf-8")
+    process_files([current], workers=1, archive_dir=archive, block_lines=2)
+    day = [entry["message"] for entry in query_archive(archive, "2025-11-02", "2025-11-03")]
+    assert day == ["m", "m", "grown", "rotated"]
+    assert len(list(query_archive(archive, "2025-11-01", "2025-11-02"))) == 2
+
+    with gzip.open(archive / "2025-11-02" / "app.log.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 4
+    index = json.loads((archive / INDEX_NAME).read_text(encoding="utf-8"))
+    assert sum(item["lines"] for item in index["files"]) == 6
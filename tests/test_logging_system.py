@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import time
+from datetime import datetime
 from pathlib import Path
 
 import pytest
 
 from src.utils.logger import (
+    AsyncLogBackend,
     LogValidator,
+    OperationTimings,
+    RingBufferHandler,
     ServiceLogger,
+    StructuredFormatter,
+    disable_async_logging,
+    enable_async_logging,
+    flush_logging,
+    get_ring_buffer,
     log_execution_time,
+    log_policy,
+    logging_stats,
     setup_global_logging,
+    timed,
+    timings,
 )
 
 
@@ -87,3 +102,229 @@ def test_error_logging_writes_context(temp_log_dir: Path) -> None:
         entries = [json.loads(line.strip()) for line in f if line.strip()]
 
     assert any(entry.get("error_message") == "테스트 에러" for entry in entries)
+
+
+def test_async_logging_writes_from_listener_thread(temp_log_dir: Path) -> None:
+    enable_async_logging(queue_size=1000)
+    try:
+        logger = ServiceLogger("async_test", log_dir=str(temp_log_dir))
+        for index in range(100):
+            logger.info("async message", index=index)
+        logger.error("async error")
+        assert flush_logging(timeout=5)
+        assert logging_stats()["enqueued"] >= 101
+    finally:
+        disable_async_logging()
+
+    entries = [json.loads(line) for line in (temp_log_dir / "async_test.log").read_text(encoding="utf-8").splitlines()]
+    assert [entry["index"] for entry in entries if "index" in entry] == list(range(100))
+    assert (temp_log_dir / "async_test_error.log").read_text(encoding="utf-8").count("async error") == 1
+    assert logging_stats() == {"mode": "sync"}
+
+
+def test_async_backend_drops_low_priority_records_when_full() -> None:
+    backend = AsyncLogBackend(queue_size=2, error_timeout=0.01)
+    for _ in range(5):
+        backend.put(logging.LogRecord("t", logging.INFO, __file__, 1, "m", None, None), [])
+    backend.put(logging.LogRecord("t", logging.ERROR, __file__, 1, "e", None, None), [])
+    assert backend.stats()["enqueued"] == 2
+    assert backend.dropped == 4
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_structured_formatter_fast_path_matches_reference_fields(use_orjson: bool) -> None:
+    record = logging.LogRecord("service.fmt", logging.INFO, __file__, 42, "값 %s", ("ok",), None, func="fn")
+    record.created = 1_700_000_000.123456
+    record.extra_fields = {"path": Path("a/b"), "count": 3}
+
+    entry = json.loads(StructuredFormatter(use_orjson=use_orjson).format(record))
+    assert entry["timestamp"] == datetime.fromtimestamp(record.created).isoformat()
+    assert entry["message"] == "값 ok"
+    assert (entry["function"], entry["line"]) == ("fn", 42)
+    assert entry["path"] == str(Path("a/b")) and entry["count"] == 3
+
+    lean = json.loads(
+        StructuredFormatter(include_location=False, include_thread=False, use_orjson=use_orjson).format(record)
+    )
+    assert set(lean) == {"timestamp", "level", "logger", "message", "path", "count"}
+
+
+def test_log_policy_sampling_rate_limit_and_levels(temp_log_dir: Path) -> None:
+    runtime = temp_log_dir / "runtime.json"
+    runtime.write_text(
+        json.dumps(
+            {
+                "logging": {
+                    "levels": {"policy_quiet": "WARNING"},
+                    "sampling": {"member_joined": 0.25},
+                    "rate_limit": {"max_per_interval": 3, "interval": 60},
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    try:
+        assert log_policy.load(runtime)
+        assert not log_policy.load(runtime)
+        logger = ServiceLogger("policy_test", log_dir=str(temp_log_dir))
+        quiet = ServiceLogger("policy_quiet", log_dir=str(temp_log_dir))
+
+        for _ in range(20):
+            logger.log_event("member_joined", room_id="1")
+        for _ in range(10):
+            logger.log_event("broadcast_sent", room_id="1")
+        for _ in range(10):
+            logger.info("반복 메시지")
+            logger.error("반복 오류")
+        assert not quiet.is_enabled(logging.INFO)
+        quiet.info("보이지 않음")
+
+        entries = [json.loads(line) for line in (temp_log_dir / "policy_test.log").read_text(encoding="utf-8").splitlines()]
+        joined = [entry for entry in entries if entry.get("event_type") == "member_joined"]
+        # 샘플링(20 -> 5) 뒤에도 반복 억제(구간당 3건)를 거친다.
+        assert len(joined) == 3 and all(entry["sample_rate"] == 0.25 for entry in joined)
+        assert sum(entry.get("event_type") == "broadcast_sent" for entry in entries) == 3
+        assert sum(entry["message"] == "반복 메시지" for entry in entries) == 3
+        assert sum(entry["message"] == "반복 오류" for entry in entries) == 10
+        assert not (temp_log_dir / "policy_quiet.log").read_text(encoding="utf-8")
+
+        # 다음 구간 첫 기록 전에 생략 건수 요약
+        log_policy.interval = 0.0
+        logger.info("반복 메시지")
+        entries = [json.loads(line) for line in (temp_log_dir / "policy_test.log").read_text(encoding="utf-8").splitlines()]
+        assert entries[-2]["suppressed"] == 7
+    finally:
+        log_policy.configure({})
+    assert quiet.is_enabled(logging.INFO)
+
+
+def test_ring_buffer_bounds_filters_and_counts() -> None:
+    ring = RingBufferHandler(capacity=5, max_bytes=10_000, level=logging.DEBUG)
+    logger = logging.getLogger("ring.test")
+    logger.propagate = False
+    logger.addHandler(ring)
+    try:
+        for index in range(8):
+            logger.info("메시지 %d", index, extra={"extra_fields": {"index": index}})
+        logger.error("Disk FULL")
+        assert len(ring.entries) == 5 and ring.evicted == 4
+        assert [entry["index"] for entry in ring.query(level="INFO")[:-1]] == [4, 5, 6, 7]
+
+        errors = ring.query(level="error")
+        assert [entry["message"] for entry in errors] == ["Disk FULL"]
+        assert "_size" not in errors[0] and errors[0]["logger"] == "ring.test"
+        assert [entry["message"] for entry in ring.query(contains="disk full")] == ["Disk FULL"]
+        assert ring.query(logger="other") == []
+        assert len(ring.query(limit=2)) == 2
+
+        # 버퍼에서 밀려난 로그도 카운터에는 남는다.
+        assert ring.counts()["INFO"] == 8
+        assert ring.counts(window=3600) == {"DEBUG": 0, "INFO": 8, "WARNING": 0, "ERROR": 1, "CRITICAL": 0}
+        assert ring.counts(window=3600, now=time.time() + 7200)["ERROR"] == 0
+
+        small = RingBufferHandler(capacity=100, max_bytes=400)
+        logger.addHandler(small)
+        for _ in range(10):
+            logger.warning("x" * 100)
+        assert small.bytes <= 400 and 1 <= len(small.entries) < 10
+    finally:
+        logger.handlers.clear()
+        logger.propagate = True
+
+
+def test_setup_global_logging_attaches_ring_buffer(temp_log_dir: Path) -> None:
+    setup_global_logging("INFO", str(temp_log_dir))
+    logger = ServiceLogger("ring_service", log_dir=str(temp_log_dir))
+    logger.warning("링 버퍼 확인", room_id="42")
+    ring = get_ring_buffer()
+    assert ring is not None
+    entry = ring.query(logger="service.ring_service")[-1]
+    assert entry["message"] == "링 버퍼 확인" and entry["room_id"] == "42"
+    setup_global_logging("INFO", str(temp_log_dir))
+    assert sum(handler is ring for handler in logging.getLogger().handlers) == 1
+
+
+class _Greeter:
+    def hello(self) -> str:
+        return "hi"
+
+
+def test_timed_aggregates_sync_async_and_runtime_instrumentation(temp_log_dir: Path) -> None:
+    timings.emit_summary(ServiceLogger("timing_reset", log_dir=str(temp_log_dir)))
+
+    @timed("test.async_op")
+    async def async_op(delay: float) -> str:
+        await asyncio.sleep(delay)
+        return "ok"
+
+    @timed()
+    def failing() -> None:
+        raise ValueError("boom")
+
+    assert asyncio.run(async_op(0.02)) == "ok"
+    with pytest.raises(ValueError):
+        failing()
+    with timed("test.block"):
+        pass
+
+    snapshot = timings.snapshot()
+    # 코루틴 생성이 아니라 await 완료까지를 잰다.
+    assert snapshot["test.async_op"]["count"] == 1 and snapshot["test.async_op"]["max_ms"] >= 15
+    assert snapshot[f"{__name__}.{failing.__qualname__}"]["errors"] == 1
+    assert snapshot["test.block"]["count"] == 1
+
+    log_policy.configure({"timing": {"instrument": [f"{__name__}:_Greeter.hello", "missing.module:f"]}})
+    try:
+        assert _Greeter().hello() == "hi"
+        assert timings.snapshot()[f"{__name__}._Greeter.hello"]["count"] == 1
+    finally:
+        log_policy.configure({})
+    assert not hasattr(_Greeter.__dict__["hello"], "__wrapped__")
+
+    summary_logger = ServiceLogger("timing_summary", log_dir=str(temp_log_dir))
+    assert timings.emit_summary(summary_logger) == 4
+    assert timings.snapshot() == {}
+    entries = [json.loads(line) for line in (temp_log_dir / "timing_summary.log").read_text(encoding="utf-8").splitlines()]
+    by_operation = {entry["operation"]: entry for entry in entries}
+    assert by_operation["test.async_op"]["p99_ms"] >= 15 and by_operation["test.block"]["count"] == 1
+
+
+def test_timing_config_starts_and_stops_summary_thread(temp_log_dir: Path) -> None:
+    local = OperationTimings(summary_interval=0)
+    local.logger = ServiceLogger("timing_thread", log_dir=str(temp_log_dir))
+    local.configure({"enabled": False})
+    assert local._thread is None
+
+    # 꺼진 채 시작했다가 runtime.json 에서 켜면 요약 스레드가 떠야 한다.
+    local.configure({"enabled": True, "summary_interval": 0.05})
+    try:
+        assert local._thread is not None and local._thread.is_alive()
+        local.record("test.op", 0.01)
+        deadline = time.monotonic() + 2
+        while local.snapshot() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert local.snapshot() == {}
+    finally:
+        local.configure({"enabled": False})
+    assert local._thread is None
+
+
+def test_shared_timer_keeps_concurrent_starts_apart() -> None:
+    timer = timed("test.shared_block")
+
+    async def first() -> None:
+        async with timer:
+            await asyncio.sleep(0.1)
+
+    async def second() -> None:
+        await asyncio.sleep(0.05)
+        async with timer:  # first 보다 늦게 들어와 늦게 나간다
+            await asyncio.sleep(0.3)
+
+    async def scenario() -> None:
+        await asyncio.gather(first(), second())
+
+    asyncio.run(scenario())
+    stats = timings.snapshot()["test.shared_block"]
+    # 시작 시각이 섞이면 second 가 first 의 시작 시각으로 ~350ms 로 기록된다.
+    assert stats["count"] == 2 and 290 <= stats["max_ms"] < 340
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.request
+
+from src.utils.metrics import LatencyHistogram, MetricsServer
+
+
+def test_latency_histogram_percentiles_are_close() -> None:
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000.0)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 1000
+    assert abs(snapshot["p50_ms"] - 500) / 500 < 0.13
+    assert abs(snapshot["p99_ms"] - 990) / 990 < 0.13
+    assert snapshot["max_ms"] == 1000
+
+
+def test_latency_histogram_is_consistent_across_threads() -> None:
+    histogram = LatencyHistogram()
+
+    def worker() -> None:
+        for index in range(20_000):
+            histogram.record((index % 50) / 1000.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert histogram.count == 160_000
+    assert sum(histogram.counts) == 160_000
+    assert histogram.snapshot()["max_ms"] == 49
+
+
+def test_metrics_server_serves_text_and_json() -> None:
+    server = MetricsServer(
+        {"/metrics": lambda _: "up 1\n", "/stats": lambda query: {"room": query.get("room", [""])[0]}},
+        port=0,
+    )
+    port = server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.read().decode("utf-8") == "up 1\n"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats?room=42") as response:
+            assert json.loads(response.read()) == {"room": "42"}
+    finally:
+        server.stop()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+from src.utils.profiler import EventLoopLagMonitor, SamplingProfiler
+
+
+def _busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_writes_collapsed_stacks_for_other_threads(tmp_path: Path, service_logger) -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy-worker", daemon=True)
+    worker.start()
+    profiler = SamplingProfiler(tmp_path / "profiles", interval=0.002, logger=service_logger("profiler"))
+    done = []
+    try:
+        path = profiler.start(0.3, on_done=done.append)
+        assert path is not None
+        assert profiler.start(1) is None  # 동시에 한 번만
+        profiler.join(timeout=5)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert done == [path] and not profiler.running
+    lines = path.read_text(encoding="utf-8").splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and any(f"{__name__}:_busy_worker:" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert not any("sampling-profiler" in line for line in lines)
+
+
+def test_back_to_back_profiles_get_distinct_files(tmp_path: Path, service_logger) -> None:
+    profiler = SamplingProfiler(tmp_path / "profiles", interval=0.01, logger=service_logger("profiler"))
+    paths = []
+    for _ in range(3):
+        paths.append(profiler.start(0.1))
+        profiler.join(timeout=5)
+    assert len(set(paths)) == 3
+    assert all(path.exists() for path in paths)
+
+
+def test_event_loop_lag_monitor_detects_blocking_calls(service_logger) -> None:
+    monitor = EventLoopLagMonitor(interval=0.01, warn_threshold=0.05, logger=service_logger("event_loop"))
+
+    async def scenario() -> None:
+        monitor.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.12)  # 루프를 막는 동기 호출
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+    snapshot = monitor.snapshot()
+    assert snapshot["count"] >= 3
+    assert snapshot["max_ms"] >= 80 and monitor.slow >= 1
+    assert 'iris_event_loop_lag_ms{quantile="0.99"}' in monitor.render_text()